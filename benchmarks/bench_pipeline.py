@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Mesure hors ligne des étapes de `sync_videos` sur des playlists synthétiques.
+
+Pour chaque taille demandée (1 000, 10 000 et 100 000 items par défaut), une
+playlist est générée par `benchmarks/synthetic.py` puis traitée par les
+fonctions de `main.py`, les appels HTTP étant servis en mémoire :
+
+    - fetch : `fetch_all_playlist_items` (pages `playlistItems`) ;
+    - details : `fetch_videos_details` (lots `videos.list`) ;
+    - transform : avatars (`fetch_channel_avatars`) et `transform_videos` ;
+    - write_category : `write_category` sur un classeur Google Sheets en mémoire ;
+    - json_export : `data/videos.json` et fichiers de l'application web
+      (`write_public_data`), écrits dans un dossier temporaire.
+
+Pour chaque étape sont relevés la durée, le pic de mémoire allouée
+(`tracemalloc`, dont le suivi ralentit aussi l'exécution), le nombre d'appels
+par point d'accès et les octets échangés. Les résultats sont enregistrés en
+JSON ; `--compare` affiche les écarts avec un fichier précédent.
+
+Usage :
+    python benchmarks/bench_pipeline.py [--sizes 1000,10000,100000]
+        [--output benchmarks/results/pipeline.json] [--compare ancien.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client  # noqa: E402
+import main  # noqa: E402
+from benchmarks.synthetic import SyntheticSession, SyntheticSheetsService, SyntheticYouTube  # noqa: E402
+from dataset_writer import write_json_rows  # noqa: E402
+from public_data import iter_public_rows, write_public_data  # noqa: E402
+from row_transform import transform_videos  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+STAGES = ["fetch", "details", "transform", "write_category", "json_export"]
+
+PLAYLIST_ID = "PLbenchmark"
+SPREADSHEET_ID = "benchmark"
+
+
+class StageRecorder:
+    """Exécute les étapes une à une et relève leurs mesures."""
+
+    def __init__(self, session: SyntheticSession, sheets: SyntheticSheetsService):
+        self.session = session
+        self.sheets = sheets
+        self.stages: dict[str, dict] = {}
+
+    def run(self, name: str, function, *args):
+        self.session.reset()
+        self.sheets.reset()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = function(*args)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        calls = {**self.session.calls, **{f"sheets.{method}": count for method, count in self.sheets.calls.items()}}
+        self.stages[name] = {
+            "seconds": round(seconds, 6),
+            "peakBytes": max(peak, 0),
+            "httpCalls": calls,
+            "requests": sum(calls.values()),
+            "payloadBytes": self.session.payload_bytes + self.sheets.bytes_sent + self.sheets.bytes_received,
+        }
+        return result
+
+
+def run_pipeline(size: int, work_dir: str) -> dict:
+    """Mesure les étapes pour une playlist de `size` items ; renvoie `{size, stages}`."""
+    session = SyntheticSession(SyntheticYouTube({PLAYLIST_ID: size}))
+    sheets = SyntheticSheetsService()
+    recorder = StageRecorder(session, sheets)
+    previous_session = http_client.set_session(session)
+    avatars_backup = dict(main.channel_avatar_cache)
+    main.channel_avatar_cache.clear()
+    try:
+        items = recorder.run(
+            "fetch",
+            main.fetch_all_playlist_items,
+            PLAYLIST_ID,
+            "benchmark-key",
+            5,
+            os.path.join(work_dir, "videos.json"),
+        )
+        video_ids = list(dict.fromkeys(item["contentDetails"]["videoId"] for item in items))
+        details = recorder.run("details", main.fetch_videos_details, video_ids, "benchmark-key")
+
+        def transform() -> tuple[list[list], list[str]]:
+            channels = [info.get("snippet", {}).get("channelId", "") for info in details.values()]
+            avatars = main.fetch_channel_avatars(channels, "benchmark-key")
+            columns = transform_videos(
+                ((PLAYLIST_ID, item) for item in items),
+                details,
+                lambda channel_id: avatars.get(channel_id, main.DEFAULT_AVATAR_URL),
+            )
+            return columns.rows(main.HEADERS), columns.categories
+
+        rows, categories = recorder.run("transform", transform)
+        recorder.run("write_category", main.write_category, sheets, SPREADSHEET_ID, "AllVideos", rows)
+
+        def export() -> int:
+            videos_by_category: dict[str, list[list]] = {}
+            for row, category in zip(rows, categories):
+                videos_by_category.setdefault(category, []).append(row)
+            write_json_rows(os.path.join(work_dir, "videos.json"), itertools.chain([main.HEADERS], rows))
+            return write_public_data(
+                iter_public_rows(main.HEADERS, videos_by_category), os.path.join(work_dir, "public")
+            )
+
+        recorder.run("json_export", export)
+    finally:
+        http_client.set_session(previous_session)
+        main.channel_avatar_cache.clear()
+        main.channel_avatar_cache.update(avatars_backup)
+    return {"size": size, "rows": len(rows), "stages": recorder.stages}
+
+
+def run_benchmark(sizes: list[int]) -> dict:
+    """Mesure toutes les tailles, chacune dans son propre dossier temporaire."""
+    results = []
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as work_dir:
+                results.append(run_pipeline(size, work_dir))
+    finally:
+        if started:
+            tracemalloc.stop()
+    return {
+        "generatedAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def format_report(report: dict, previous: dict | None = None) -> str:
+    """Tableau texte des mesures, avec le rapport au fichier `previous` s'il est fourni."""
+    before = {
+        (result["size"], name): stage
+        for result in (previous or {}).get("results", [])
+        for name, stage in result["stages"].items()
+    }
+    lines = []
+    for result in report["results"]:
+        lines.append(f"{result['size']} items ({result['rows']} lignes)")
+        for name in STAGES:
+            stage = result["stages"][name]
+            line = (
+                f"  {name:<15}{stage['seconds'] * 1000:10.1f} ms{stage['peakBytes'] / 2**20:10.1f} Mio"
+                f"{stage['requests']:8d} appels{stage['payloadBytes'] / 2**20:10.1f} Mio échangés"
+            )
+            old = before.get((result["size"], name))
+            if old and old["seconds"]:
+                line += f"   x{stage['seconds'] / old['seconds']:.2f} (durée)"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def main_benchmark(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Mesure les étapes de sync_videos sur des playlists synthétiques.")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Tailles de playlist, séparées par des virgules",
+    )
+    parser.add_argument("--output", help="Fichier JSON des résultats (par défaut benchmarks/results/)")
+    parser.add_argument("--compare", help="Résultats précédents à comparer")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            previous = json.load(fh)
+    report = run_benchmark(sizes)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"pipeline-{report['generatedAt'].replace(':', '').replace('-', '')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+        fh.write("\n")
+    print(format_report(report, previous))
+    print(f"Résultats enregistrés dans {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Micro‑benchmark de la construction des lignes de `sync_videos`.
+
+Compare la boucle ligne par ligne d'origine (fonctions de référence de
+`main.py`) à `row_transform.transform_videos` sur des vidéos synthétiques,
+vérifie que les lignes produites sont identiques et affiche les durées.
+
+Usage :
+    python benchmarks/bench_row_transform.py [--videos 100000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from row_transform import transform_videos  # noqa: E402
+
+
+def synthetic_videos(count: int, seed: int = 0) -> tuple[list[tuple[str, dict]], dict[str, dict]]:
+    """Items de playlist et détails de vidéos plausibles (durées, dates, miniatures variées)."""
+    rng = random.Random(seed)
+    entries = []
+    videos_data = {}
+    for index in range(count):
+        video_id = f"{index:011d}"
+        h, m, s = rng.choice([0, 0, 0, 1, 2]), rng.randrange(60), rng.randrange(60)
+        duration = "PT" + (f"{h}H" if h else "") + (f"{m}M" if m else "") + (f"{s}S" if s or not (h or m) else "")
+        published = (
+            f"20{rng.randrange(10, 26)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}"
+            f"T{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}Z"
+        )
+        qualities = ("default", "medium", "high")[: rng.randrange(4)]
+        thumbnails = {quality: {"url": f"https://i.ytimg.com/vi/{video_id}/{quality}.jpg"} for quality in qualities}
+        videos_data[video_id] = {
+            "id": video_id,
+            "snippet": {
+                "title": f"Vidéo {index}",
+                "channelTitle": f"Chaîne {index % 500}",
+                "channelId": f"UC{index % 500:022d}",
+                "publishedAt": published,
+                "description": "Description " * rng.randrange(8),
+                "tags": [f"tag{tag}" for tag in range(rng.randrange(5))],
+                "categoryId": str(rng.randrange(1, 30)),
+                "thumbnails": thumbnails,
+            },
+            "contentDetails": {"duration": duration},
+            "statistics": {"viewCount": str(rng.randrange(10**7)), "likeCount": str(rng.randrange(10**5))},
+        }
+        entries.append((f"PL{index % 3}", {"contentDetails": {"videoId": video_id}, "snippet": {"position": index}}))
+    return entries, videos_data
+
+
+def legacy_rows(entries, videos_data, channel_avatar) -> tuple[list[list], list[str]]:
+    """Boucle d'origine de `sync_videos`, une vidéo à la fois."""
+    rows, categories = [], []
+    for playlist_source_id, item in entries:
+        video_id = item["contentDetails"]["videoId"]
+        info = videos_data.get(video_id, {})
+        if info:
+            snippet = info.get("snippet", {})
+            stats = info.get("statistics", {})
+            video_duration = main.parse_duration(info.get("contentDetails", {}).get("duration", "PT0S"))
+            playlist_position = item.get("snippet", {}).get("position")
+            rows.append(
+                [
+                    channel_avatar(snippet.get("channelId", "")),
+                    snippet.get("title", "Inconnu"),
+                    f"https://www.youtube.com/watch?v={video_id}",
+                    snippet.get("channelTitle", "Inconnu"),
+                    main.format_published_at(snippet.get("publishedAt", "")),
+                    video_duration,
+                    stats.get("viewCount", "0"),
+                    stats.get("likeCount", "0"),
+                    stats.get("commentCount", "0"),
+                    snippet.get("description", "")[:50],
+                    ", ".join(snippet.get("tags", []) or []),
+                    snippet.get("categoryId", "Inconnu"),
+                    main.get_thumbnail_url(info),
+                    "",
+                    str(playlist_position) if playlist_position is not None else "",
+                    playlist_source_id,
+                ]
+            )
+            categories.append(main.get_duration_category(video_duration))
+    return rows, categories
+
+
+def columnar_rows(entries, videos_data, channel_avatar) -> tuple[list[list], list[str]]:
+    columns = transform_videos(entries, videos_data, channel_avatar)
+    return columns.rows(main.HEADERS), columns.categories
+
+
+def best_time(function, repeat: int, *args) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main_benchmark(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Mesure la construction des lignes de sync_videos.")
+    parser.add_argument("--videos", type=int, default=100_000, help="Nombre de vidéos synthétiques")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de mesures (la meilleure est retenue)")
+    args = parser.parse_args(argv)
+
+    entries, videos_data = synthetic_videos(args.videos)
+    avatars: dict[str, str] = {}
+
+    def channel_avatar(channel_id: str) -> str:
+        # Équivalent du cache en mémoire de `main.get_channel_avatar`
+        return avatars.setdefault(channel_id, f"https://yt3.ggpht.com/{channel_id}")
+
+    legacy_time, legacy = best_time(legacy_rows, args.repeat, entries, videos_data, channel_avatar)
+    columnar_time, columnar = best_time(columnar_rows, args.repeat, entries, videos_data, channel_avatar)
+    if legacy != columnar:
+        print("Les lignes produites diffèrent !")
+        return 1
+    print(f"{args.videos} vidéos, meilleure de {args.repeat} mesures")
+    print(f"  boucle ligne par ligne : {legacy_time * 1000:8.1f} ms")
+    print(f"  transformation par colonnes : {columnar_time * 1000:8.1f} ms")
+    print(f"  gain : x{legacy_time / columnar_time:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
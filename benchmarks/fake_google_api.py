@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Serveur HTTP local imitant l'API YouTube Data et l'API Google Sheets.
+
+Les points d'accès `playlistItems`, `videos` et `channels` sont servis par
+`SyntheticYouTube` (playlists synthétiques, voir `benchmarks/synthetic.py`),
+ceux de Sheets (`spreadsheets.get`, `values.get/batchGet`,
+`values.batchUpdate/batchClear`, `batchUpdate`) par un classeur en mémoire.
+`main.py`, `export_data.py` et `scripts/export_sheet.py` s'y connectent sans
+modification via les variables `YOUTUBE_API_URL` et `SHEETS_API_URL` (voir
+`http_client.py`) ; le compte de service généré par `--service-account`
+obtient ses jetons auprès du serveur (`/token`).
+
+Des pannes peuvent être injectées (`FaultPlan`) :
+
+    - latence de chaque réponse : `fixed:MS`, `uniform:MIN:MAX`,
+      `normal:MOYENNE:ÉCART` ou `exp:MOYENNE` (millisecondes) ;
+    - erreurs 500/503 avec une probabilité donnée, éventuellement en rafales
+      (`--error-burst` requêtes consécutives), sur les deux API ou sur une
+      seule (`--error-scope youtube|sheets`) ;
+    - jetons de pagination périmés (400 `invalidPageToken`) ;
+    - quota YouTube en unités (403 `quotaExceeded` une fois épuisé) et nombre
+      de requêtes Sheets par minute (429 `RESOURCE_EXHAUSTED`).
+
+`GET /_stats` renvoie le nombre de requêtes par point d'accès, les pannes
+injectées et les unités de quota consommées.
+
+Usage :
+    python benchmarks/fake_google_api.py --playlist PLfake=10000 [--port 8089]
+        [--latency uniform:20:80] [--error-rate 0.02] [--error-burst 3] [--error-scope youtube]
+        [--stale-token-rate 0.01] [--youtube-quota 10000] [--sheets-quota 60]
+        [--sheet AllVideos=data/videos.json] [--service-account sa.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import parse_qs, unquote, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SheetsBackend, SyntheticYouTube  # noqa: E402
+
+YOUTUBE_PREFIX = "/youtube/v3/"
+SHEETS_PREFIX = "/v4/spreadsheets/"
+ERROR_SCOPES = ("all", "youtube", "sheets")
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Tirage d'une latence en secondes à partir de `fixed:MS`, `uniform:MIN:MAX`, `normal:M:E` ou `exp:M`."""
+    kind, _, rest = (spec or "0").partition(":")
+    if not rest:
+        kind, rest = "fixed", kind
+    values = [float(value) / 1000 for value in rest.split(":")]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(*values)
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(*values))
+    if kind == "exp" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    raise ValueError(f"Latence invalide : {spec}")
+
+
+def error_body(code: int, message: str, reason: str, status: str = "") -> dict:
+    """Corps d'erreur au format des API Google."""
+    error = {"code": code, "message": message, "errors": [{"message": message, "reason": reason}]}
+    if status:
+        error["status"] = status
+    return {"error": error}
+
+
+class FaultPlan:
+    """
+    Latence et pannes injectées, tirées d'un générateur initialisé par `seed`
+    (reproductible à ordre de requêtes identique). Sûr entre threads.
+    """
+
+    def __init__(
+        self,
+        latency: str = "0",
+        error_rate: float = 0.0,
+        error_burst: int = 1,
+        error_scope: str = "all",
+        stale_token_rate: float = 0.0,
+        youtube_quota: int | None = None,
+        sheets_quota: int | None = None,
+        seed: int = 0,
+    ):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.error_burst = max(1, error_burst)
+        if error_scope not in ERROR_SCOPES:
+            raise ValueError(f"Portée d'erreur invalide : {error_scope}")
+        self.error_scope = error_scope
+        self.stale_token_rate = stale_token_rate
+        self.youtube_quota = youtube_quota
+        self.sheets_quota = sheets_quota
+        self.youtube_units = 0
+        self.requests: dict[str, int] = {}
+        self.faults: dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._burst_left = 0
+        self._sheets_window = (0, 0)
+        self._lock = threading.Lock()
+
+    def _fault(self, name: str, status: int, body: dict) -> tuple[int, dict]:
+        self.faults[name] = self.faults.get(name, 0) + 1
+        return status, body
+
+    def decide(self, endpoint: str, params: dict) -> tuple[float, tuple[int, dict] | None]:
+        """(latence en secondes, réponse d'erreur injectée ou None) pour une requête."""
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            delay = self.latency(self._rng)
+            api = "sheets" if endpoint.startswith("sheets.") else "youtube"
+            if api == "sheets":
+                minute = int(time.monotonic() // 60)
+                window, count = self._sheets_window
+                count = count + 1 if window == minute else 1
+                self._sheets_window = (minute, count)
+                if self.sheets_quota is not None and count > self.sheets_quota:
+                    message = "Quota exceeded for quota metric 'Requests' per minute."
+                    return delay, self._fault(
+                        "rateLimitExceeded", 429, error_body(429, message, "rateLimitExceeded", "RESOURCE_EXHAUSTED")
+                    )
+            else:
+                self.youtube_units += 1
+                if self.youtube_quota is not None and self.youtube_units > self.youtube_quota:
+                    message = "The request cannot be completed because you have exceeded your quota."
+                    return delay, self._fault("quotaExceeded", 403, error_body(403, message, "quotaExceeded"))
+            in_scope = self.error_scope in ("all", api)
+            if in_scope and (self._burst_left or self._rng.random() < self.error_rate):
+                self._burst_left = self._burst_left - 1 if self._burst_left else self.error_burst - 1
+                status = self._rng.choice([500, 503])
+                return delay, self._fault(str(status), status, error_body(status, "Backend Error", "backendError"))
+            if endpoint == "playlistItems" and params.get("pageToken") and self._rng.random() < self.stale_token_rate:
+                message = "The request specifies an invalid page token."
+                return delay, self._fault("invalidPageToken", 400, error_body(400, message, "invalidPageToken"))
+        return delay, None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": dict(self.requests), "faults": dict(self.faults), "youtubeUnits": self.youtube_units}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict | None, headers: dict | None = None) -> None:
+        content = b"" if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _read(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        api = self.server.api
+        url = urlparse(self.path)
+        query = parse_qs(url.query, keep_blank_values=True)
+        params = {name: values[-1] for name, values in query.items()}
+        payload = self._read() if method == "POST" else b""
+        if method == "POST" and url.path == "/token":
+            self._send(200, {"access_token": "fake-access-token", "token_type": "Bearer", "expires_in": 3600})
+            return
+        if url.path == "/_stats":
+            self._send(200, api.faults.stats())
+            return
+        body = json.loads(payload) if payload else {}
+        route = api.route(method, url.path, params, query, body)
+        if route is None:
+            self._send(404, error_body(404, f"Point d'accès inconnu : {url.path}", "notFound"))
+            return
+        endpoint, handler = route
+        delay, fault = api.faults.decide(endpoint, params)
+        if delay:
+            time.sleep(delay)
+        status, response = fault or handler()
+        if status != 200 or not endpoint.startswith(("playlistItems", "videos", "channels")):
+            self._send(status, response)
+            return
+        etag = '"' + hashlib.sha1(json.dumps(response, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, None, {"ETag": etag})
+        else:
+            self._send(200, {**response, "etag": etag}, {"ETag": etag})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    api: "FakeGoogleAPI"
+
+
+class FakeGoogleAPI:
+    """
+    Serveur local (thread d'arrière-plan) ; `port=0` choisit un port libre.
+    Utilisable comme gestionnaire de contexte.
+    """
+
+    def __init__(
+        self,
+        youtube: SyntheticYouTube,
+        sheets: SheetsBackend | None = None,
+        faults: FaultPlan | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.youtube = youtube
+        self.sheets = sheets or SheetsBackend()
+        self.faults = faults or FaultPlan()
+        self._sheets_lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.api = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environ(self) -> dict[str, str]:
+        """Variables d'environnement dirigeant les scripts vers ce serveur."""
+        return {"YOUTUBE_API_URL": f"{self.url}/youtube/v3", "SHEETS_API_URL": self.url}
+
+    def service_account_info(self) -> dict:
+        """Compte de service (clé RSA générée) dont les jetons sont délivrés par ce serveur."""
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ).decode("ascii")
+        return {
+            "type": "service_account",
+            "project_id": "fake-project",
+            "private_key_id": "fake-key",
+            "private_key": pem,
+            "client_email": "sync@fake-project.iam.gserviceaccount.com",
+            "client_id": "0",
+            "token_uri": f"{self.url}/token",
+        }
+
+    def route(self, method: str, path: str, params: dict, query: dict, body: dict):
+        """(nom du point d'accès, fonction produisant (statut, corps)) ou None."""
+        if method == "GET" and path.startswith(YOUTUBE_PREFIX):
+            endpoint = path[len(YOUTUBE_PREFIX) :].strip("/")
+            if endpoint in ("playlistItems", "videos", "channels"):
+                return endpoint, lambda: self.youtube.handle(path, params)
+            return None
+        if not path.startswith(SHEETS_PREFIX):
+            return None
+        rest = path[len(SHEETS_PREFIX) :]
+        backend = self.sheets
+        if method == "GET":
+            if "/values/" in rest:
+                range_ = unquote(rest.split("/values/", 1)[1])
+                return "sheets.values.get", self._sheets(lambda: backend.values_get(range_))
+            if rest.endswith("/values:batchGet"):
+                ranges = query.get("ranges", [])
+                return "sheets.values.batchGet", self._sheets(lambda: backend.values_batch_get(ranges))
+            return "sheets.get", self._sheets(backend.metadata)
+        if rest.endswith("/values:batchUpdate"):
+            return "sheets.values.batchUpdate", self._sheets(lambda: backend.values_batch_update(body))
+        if rest.endswith("/values:batchClear"):
+            return "sheets.values.batchClear", self._sheets(lambda: backend.values_batch_clear(body))
+        if rest.endswith(":batchUpdate"):
+            return "sheets.batchUpdate", self._sheets(lambda: backend.batch_update(body))
+        return None
+
+    def _sheets(self, function: Callable[[], dict]) -> Callable[[], tuple[int, dict]]:
+        def handler() -> tuple[int, dict]:
+            with self._sheets_lock:
+                return 200, function()
+
+        return handler
+
+    def start(self) -> "FakeGoogleAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeGoogleAPI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def _pairs(values: list[str], option: str) -> list[tuple[str, str]]:
+    pairs = []
+    for value in values:
+        name, sep, rest = value.partition("=")
+        if not sep or not name or not rest:
+            raise SystemExit(f"{option} attend NOM=VALEUR : {value}")
+        pairs.append((name, rest))
+    return pairs
+
+
+def main_server(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serveur local imitant les API YouTube Data et Google Sheets.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--playlist", action="append", default=[], help="Playlist synthétique ID=NOMBRE (répétable)"
+    )
+    parser.add_argument("--sheet", action="append", default=[], help="Onglet initial NOM=fichier JSON de lignes")
+    parser.add_argument("--latency", default="0", help="fixed:MS, uniform:MIN:MAX, normal:M:E ou exp:M")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilité d'une erreur 500/503")
+    parser.add_argument("--error-burst", type=int, default=1, help="Requêtes consécutives en erreur par panne")
+    parser.add_argument("--error-scope", choices=ERROR_SCOPES, default="all", help="API concernées par les erreurs")
+    parser.add_argument(
+        "--stale-token-rate", type=float, default=0.0, help="Probabilité qu'un pageToken soit refusé (400)"
+    )
+    parser.add_argument("--youtube-quota", type=int, help="Unités de quota YouTube disponibles")
+    parser.add_argument("--sheets-quota", type=int, help="Requêtes Sheets autorisées par minute")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--service-account", help="Écrit un compte de service utilisable avec ce serveur")
+    args = parser.parse_args(argv)
+
+    playlists = {name: int(count) for name, count in _pairs(args.playlist, "--playlist")}
+    sheets = SheetsBackend()
+    for name, path in _pairs(args.sheet, "--sheet"):
+        with open(path, encoding="utf-8") as fh:
+            sheets.set_tab(name, json.load(fh))
+    faults = FaultPlan(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_burst=args.error_burst,
+        error_scope=args.error_scope,
+        stale_token_rate=args.stale_token_rate,
+        youtube_quota=args.youtube_quota,
+        sheets_quota=args.sheets_quota,
+        seed=args.seed,
+    )
+    api = FakeGoogleAPI(SyntheticYouTube(playlists), sheets, faults, host=args.host, port=args.port)
+    if args.service_account:
+        with open(args.service_account, "w", encoding="utf-8") as fh:
+            json.dump(api.service_account_info(), fh, indent=2)
+    print(f"Serveur prêt sur {api.url}")
+    for name, value in api.environ().items():
+        print(f"export {name}={value}")
+    if args.service_account:
+        print(f'export SERVICE_ACCOUNT_JSON="$(cat {args.service_account})"')
+    try:
+        api._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api._server.server_close()
+        print(json.dumps(faults.stats(), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_server())
@@ -0,0 +1,333 @@
+"""
+Données YouTube synthétiques et faux clients en mémoire pour les mesures.
+
+Les vidéos sont générées de façon déterministe à partir de leur indice : une
+playlist de N items et les détails de ses vidéos n'ont pas besoin d'être
+construits à l'avance, ce qui permet de simuler des playlists de 100 000
+vidéos sans tout garder en mémoire.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from urllib.parse import urlparse
+
+PAGE_SIZE_MAX = 50
+
+
+def video_id(index: int) -> str:
+    """Identifiant YouTube (11 caractères) de la vidéo synthétique `index`."""
+    return f"v{index:010d}"
+
+
+def video_index(identifier: str) -> int | None:
+    if len(identifier) == 11 and identifier[0] == "v" and identifier[1:].isdigit():
+        return int(identifier[1:])
+    return None
+
+
+def video_detail(index: int) -> dict:
+    """Réponse `videos.list` (un item) plausible et stable pour la vidéo `index`."""
+    rng = random.Random(index)
+    identifier = video_id(index)
+    h, m, s = rng.choice([0, 0, 0, 1, 2]), rng.randrange(60), rng.randrange(60)
+    duration = "PT" + (f"{h}H" if h else "") + (f"{m}M" if m else "") + (f"{s}S" if s or not (h or m) else "")
+    published = (
+        f"20{rng.randrange(10, 26)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}"
+        f"T{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}Z"
+    )
+    qualities = ("default", "medium", "high")[: rng.randrange(4)]
+    return {
+        "kind": "youtube#video",
+        "id": identifier,
+        "snippet": {
+            "title": f"Vidéo {index}",
+            "channelTitle": f"Chaîne {index % 500}",
+            "channelId": f"UC{index % 500:022d}",
+            "publishedAt": published,
+            "description": "Description " * rng.randrange(8),
+            "tags": [f"tag{tag}" for tag in range(rng.randrange(5))],
+            "categoryId": str(rng.randrange(1, 30)),
+            "thumbnails": {
+                quality: {"url": f"https://i.ytimg.com/vi/{identifier}/{quality}.jpg"} for quality in qualities
+            },
+        },
+        "contentDetails": {"duration": duration},
+        "statistics": {"viewCount": str(rng.randrange(10**7)), "likeCount": str(rng.randrange(10**5))},
+    }
+
+
+def playlist_item(playlist_id: str, position: int, offset: int = 0) -> dict:
+    """Item `playlistItems` à la position `position` (vidéo `offset + position`)."""
+    identifier = video_id(offset + position)
+    return {
+        "kind": "youtube#playlistItem",
+        "id": f"{playlist_id}-{position}",
+        "snippet": {"playlistId": playlist_id, "position": position, "resourceId": {"videoId": identifier}},
+        "contentDetails": {"videoId": identifier},
+    }
+
+
+class SyntheticYouTube:
+    """
+    Réponses des points d'accès `playlistItems`, `videos` et `channels` pour
+    des playlists synthétiques (`{playlist_id: nombre d'items}`). Les jetons de
+    page encodent simplement la position de départ.
+    """
+
+    def __init__(self, playlists: dict[str, int]):
+        self.playlists = dict(playlists)
+        self._offsets: dict[str, int] = {}
+        offset = 0
+        for playlist_id, count in self.playlists.items():
+            self._offsets[playlist_id] = offset
+            offset += count
+
+    def handle(self, path: str, params: dict) -> tuple[int, dict]:
+        """(statut HTTP, corps JSON) pour une requête GET sur `path`."""
+        endpoint = path.rstrip("/").rsplit("/", 1)[-1]
+        if endpoint == "playlistItems":
+            return self._playlist_items(params)
+        if endpoint == "videos":
+            ids = [identifier for identifier in str(params.get("id", "")).split(",") if identifier]
+            items = [video_detail(index) for index in map(video_index, ids) if index is not None]
+            return 200, {"kind": "youtube#videoListResponse", "items": items}
+        if endpoint == "channels":
+            ids = [identifier for identifier in str(params.get("id", "")).split(",") if identifier]
+            items = [
+                {"id": channel, "snippet": {"thumbnails": {"default": {"url": f"https://yt3.ggpht.com/{channel}"}}}}
+                for channel in ids
+            ]
+            return 200, {"kind": "youtube#channelListResponse", "items": items}
+        return 404, {"error": {"code": 404, "message": f"Point d'accès inconnu : {path}"}}
+
+    def _playlist_items(self, params: dict) -> tuple[int, dict]:
+        playlist_id = params.get("playlistId")
+        if playlist_id not in self.playlists:
+            return 404, {"error": {"code": 404, "message": "playlistNotFound"}}
+        total = self.playlists[playlist_id]
+        token = params.get("pageToken")
+        start = 0
+        if token:
+            if not str(token).startswith("p") or not str(token)[1:].isdigit():
+                return 400, {"error": {"code": 400, "message": "invalidPageToken"}}
+            start = int(str(token)[1:])
+        size = min(int(params.get("maxResults", 5)), PAGE_SIZE_MAX)
+        end = min(start + size, total)
+        offset = self._offsets[playlist_id]
+        body = {
+            "kind": "youtube#playlistItemListResponse",
+            "items": [playlist_item(playlist_id, position, offset) for position in range(start, end)],
+            "pageInfo": {"totalResults": total, "resultsPerPage": size},
+        }
+        if end < total:
+            body["nextPageToken"] = f"p{end}"
+        return 200, body
+
+
+class FakeResponse:
+    """Réponse minimale compatible avec l'usage de `requests.Response` dans `main.py`."""
+
+    def __init__(self, status_code: int, content: bytes, url: str = ""):
+        self.status_code = status_code
+        self.content = content
+        self.headers: dict[str, str] = {}
+        self.url = url
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            import requests
+
+            raise requests.HTTPError(f"{self.status_code} pour {self.url}", response=self)
+
+
+class SyntheticSession:
+    """
+    Session HTTP en mémoire (à installer avec `http_client.set_session`) :
+    chaque réponse est sérialisée puis relue comme sur le réseau ; le nombre
+    d'appels et d'octets reçus est compté par point d'accès.
+    """
+
+    def __init__(self, youtube: SyntheticYouTube):
+        self.youtube = youtube
+        self.calls: dict[str, int] = {}
+        self.payload_bytes = 0
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        path = urlparse(url).path
+        status, body = self.youtube.handle(path, dict(params or {}))
+        content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        endpoint = path.rsplit("/", 1)[-1]
+        self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+        self.payload_bytes += len(content)
+        return FakeResponse(status, content, url)
+
+    def reset(self) -> None:
+        self.calls = {}
+        self.payload_bytes = 0
+
+
+def _sheet_name(range_: str) -> str:
+    name = range_.split("!")[0]
+    return name[1:-1].replace("''", "'") if name.startswith("'") and name.endswith("'") else name
+
+
+class SheetsBackend:
+    """
+    Classeur Google Sheets en mémoire : onglets, `values.get/batchGet`,
+    `values.batchUpdate/batchClear` et `batchUpdate` (ajout d'onglets,
+    effacement, insertion et suppression de lignes). Les plages écrites commencent en
+    colonne A.
+    """
+
+    def __init__(self):
+        self.tabs: dict[str, list[list]] = {}
+        self.sheet_ids: dict[str, int] = {}
+
+    def set_tab(self, name: str, rows: list[list]) -> None:
+        """Crée ou remplace l'onglet `name` avec `rows`."""
+        self.sheet_ids.setdefault(name, len(self.sheet_ids))
+        self.tabs[name] = [list(row) for row in rows]
+
+    @staticmethod
+    def _bounds(range_: str) -> tuple[int, int | None]:
+        cells = range_.split("!", 1)[1] if "!" in range_ else ""
+        first, _, last = cells.partition(":")
+        start = "".join(ch for ch in first if ch.isdigit())
+        end = "".join(ch for ch in last if ch.isdigit())
+        return (int(start) - 1 if start else 0), (int(end) if end else None)
+
+    def read(self, range_: str) -> list[list]:
+        rows = self.tabs.get(_sheet_name(range_), [])
+        start, end = self._bounds(range_)
+        window = [list(row) for row in rows[start:end]]
+        while window and not window[-1]:
+            window.pop()
+        return window
+
+    def metadata(self) -> dict:
+        sheets = []
+        for name, sheet_id in self.sheet_ids.items():
+            grid = {"rowCount": len(self.tabs[name])}
+            sheets.append({"properties": {"title": name, "sheetId": sheet_id, "gridProperties": grid}})
+        return {"sheets": sheets}
+
+    def values_get(self, range_: str) -> dict:
+        return {"range": range_, "values": self.read(range_)}
+
+    def values_batch_get(self, ranges: list[str]) -> dict:
+        return {"valueRanges": [self.values_get(range_) for range_ in ranges]}
+
+    def values_batch_update(self, body: dict) -> dict:
+        for entry in body.get("data", []):
+            rows = self.tabs.setdefault(_sheet_name(entry["range"]), [])
+            start, _ = self._bounds(entry["range"])
+            while len(rows) < start + len(entry["values"]):
+                rows.append([])
+            for offset, row in enumerate(entry["values"]):
+                rows[start + offset] = list(row)
+        return {"totalUpdatedRows": sum(len(entry["values"]) for entry in body.get("data", []))}
+
+    def values_batch_clear(self, body: dict) -> dict:
+        for range_ in body.get("ranges", []):
+            if _sheet_name(range_) in self.tabs:
+                self.tabs[_sheet_name(range_)] = []
+        return {"clearedRanges": list(body.get("ranges", []))}
+
+    def batch_update(self, body: dict) -> dict:
+        replies = []
+        names = {sheet_id: name for name, sheet_id in self.sheet_ids.items()}
+        for request in body.get("requests", []):
+            if "addSheet" in request:
+                title = request["addSheet"]["properties"]["title"]
+                self.set_tab(title, [])
+                names[self.sheet_ids[title]] = title
+                replies.append({"addSheet": {"properties": {"title": title, "sheetId": self.sheet_ids[title]}}})
+                continue
+            replies.append({})
+            for kind, payload in request.items():
+                if kind == "updateCells":
+                    self.tabs[names[payload["range"]["sheetId"]]] = []
+                    continue
+                if kind not in ("deleteDimension", "insertDimension"):
+                    continue
+                rows = self.tabs[names[payload["range"]["sheetId"]]]
+                start, end = payload["range"]["startIndex"], payload["range"]["endIndex"]
+                if kind == "deleteDimension":
+                    del rows[start:end]
+                else:
+                    rows[start:start] = [[] for _ in range(end - start)]
+        return {"replies": replies}
+
+
+class _Request:
+    def __init__(self, client: "SyntheticSheetsService", method: str, request: dict, handler):
+        self._client = client
+        self._method = method
+        self._request = request
+        self._handler = handler
+
+    def execute(self, num_retries: int = 0, http=None) -> dict:
+        result = self._handler()
+        sent = len(json.dumps(self._request, ensure_ascii=False).encode("utf-8"))
+        received = len(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+        self._client.record(self._method, sent, received)
+        return result
+
+
+class SyntheticSheetsService:
+    """
+    Client de type `googleapiclient` (`spreadsheets()`, `values()`) adossé à
+    un `SheetsBackend` ; compte les appels et les octets envoyés et reçus.
+    """
+
+    def __init__(self, backend: SheetsBackend | None = None):
+        self.backend = backend or SheetsBackend()
+        self.calls: dict[str, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def record(self, method: str, sent: int, received: int) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+
+    def reset(self) -> None:
+        self.calls = {}
+        self.bytes_sent = self.bytes_received = 0
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return _SyntheticValues(self)
+
+    def get(self, spreadsheetId, **kwargs):
+        return _Request(self, "get", kwargs, self.backend.metadata)
+
+    def batchUpdate(self, spreadsheetId, body):
+        return _Request(self, "batchUpdate", body, lambda: self.backend.batch_update(body))
+
+
+class _SyntheticValues:
+    def __init__(self, client: SyntheticSheetsService):
+        self.client = client
+
+    def get(self, spreadsheetId, range, **kwargs):
+        return _Request(self.client, "values.get", {"range": range}, lambda: self.client.backend.values_get(range))
+
+    def batchGet(self, spreadsheetId, ranges, **kwargs):
+        ranges = list(ranges)
+        return _Request(
+            self.client, "values.batchGet", {"ranges": ranges}, lambda: self.client.backend.values_batch_get(ranges)
+        )
+
+    def batchUpdate(self, spreadsheetId, body):
+        return _Request(self.client, "values.batchUpdate", body, lambda: self.client.backend.values_batch_update(body))
+
+    def batchClear(self, spreadsheetId, body):
+        return _Request(self.client, "values.batchClear", body, lambda: self.client.backend.values_batch_clear(body))
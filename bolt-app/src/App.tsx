@@ -16,6 +16,7 @@ import { SHEET_TABS, getConfig } from './utils/constants';
 import { filterVideosByDuration } from './utils/videoFilters';
 import { filterVideosBySearch } from './utils/searchUtils';
 import { sortVideos } from './utils/sortUtils';
+import { shardNameForRange } from './utils/api/sheets/shards';
 import { useVideos } from './hooks/useVideos';
 import { useSound } from './hooks/useSound';
 import { SearchFilters } from './types/search';
@@ -30,9 +31,10 @@ import { SortOptions } from './types/sort';
  */
 export default function App() {
   const { error: configError } = getConfig();
-  const { videos, isLoading, error: videosError, loadVideos } = useVideos(configError);
-  const { playClick } = useSound();
   const [selectedTab, setSelectedTab] = React.useState(-1);
+  const activeShard = selectedTab === -1 ? null : shardNameForRange(SHEET_TABS[selectedTab].range);
+  const { videos, isLoading, error: videosError, searchIndex, loadVideos } = useVideos(configError, activeShard);
+  const { playClick } = useSound();
   const [sortOptions, setSortOptions] = React.useState<SortOptions | null>(null);
   const [searchFilters, setSearchFilters] = React.useState<SearchFilters>({
     query: '',
@@ -91,8 +93,8 @@ export default function App() {
   }, [scrollToTop]);
 
   const filteredBySearch = React.useMemo(
-    () => filterVideosBySearch(videos, searchFilters),
-    [videos, searchFilters],
+    () => filterVideosBySearch(videos, searchFilters, searchIndex),
+    [videos, searchFilters, searchIndex],
   );
 
   const filteredByCategory = React.useMemo(
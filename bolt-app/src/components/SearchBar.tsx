@@ -105,7 +105,7 @@ export function SearchBar({ filters, onFiltersChange }: SearchBarProps) {
               <input
                 ref={inputRef}
                 type="text"
-                placeholder="Rechercher"
+                placeholder="Rechercher (début des mots)"
                 value={filters.query}
                 onChange={(e) => onFiltersChange({ ...filters, query: e.target.value })}
                 className="w-full pl-4 pr-10 h-10 rounded-l-full bg-transparent text-youtube-black dark:text-white placeholder-youtube-gray-dark dark:placeholder-gray-400 text-[16px] sm:text-sm focus:outline-none"
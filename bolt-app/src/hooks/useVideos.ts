@@ -1,19 +1,39 @@
-import { useState, useCallback } from 'react';
+import { useState, useCallback, useRef } from 'react';
 import { VideoData } from '../types/video';
-import { fetchAllVideos, fetchLocalVideos } from '../utils/api/sheets/index.ts';
+import { fetchAllVideos, fetchLocalVideosProgressively } from '../utils/api/sheets/index.ts';
+import { fetchSearchIndex, type SearchIndex } from '../utils/searchIndex.ts';
 
-export function useVideos(configError?: string) {
+/**
+ * Charge les vidéos. En mode local, `priorityShard` (fragment de l'onglet de
+ * durée affiché) est chargé et affiché en premier, les autres ensuite ; sur la
+ * vue « toutes les vidéos », la liste n'est affichée qu'une fois complète.
+ */
+export function useVideos(configError?: string, priorityShard: string | null = null) {
   const [videos, setVideos] = useState<VideoData[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [searchIndex, setSearchIndex] = useState<SearchIndex | null>(null);
+  // Lu au moment du chargement : changer d'onglet ne relance pas le chargement
+  const priorityShardRef = useRef(priorityShard);
+  priorityShardRef.current = priorityShard;
 
   const loadVideos = useCallback(async () => {
     try {
       setIsLoading(true);
       setError(null);
-      const { data, error: apiError, metadata } = configError
-        ? await fetchLocalVideos()
-        : await fetchAllVideos();
+      // L'index de recherche prégénéré est chargé en parallèle des vidéos
+      const [{ data, error: apiError, metadata }, index] = await Promise.all([
+        configError
+          ? fetchLocalVideosProgressively(priorityShardRef.current, (partial, shard) => {
+            // L'onglet a pu changer depuis le début du chargement
+            if (shard !== priorityShardRef.current) return;
+            setVideos(partial);
+            setIsLoading(false);
+          })
+          : fetchAllVideos(),
+        fetchSearchIndex(),
+      ]);
+      setSearchIndex(index);
 
       const errorMessage = apiError || (metadata?.errors?.length
         ? metadata.errors.join('\n')
@@ -40,6 +60,7 @@ export function useVideos(configError?: string) {
     videos,
     isLoading,
     error,
+    searchIndex,
     loadVideos
   };
 }
@@ -0,0 +1,35 @@
+import test from 'node:test';
+import assert from 'node:assert/strict';
+import { decodeCompactDataset, isCompactDataset } from './compact.ts';
+
+test('decodeCompactDataset reconstruit les lignes et les exceptions', () => {
+  const dataset = {
+    format: 'videos-columnar' as const,
+    version: 1 as const,
+    headers: ['channel', 'link', 'views', 'thumbnail'],
+    count: 2,
+    encodings: {
+      channel: 'dict' as const,
+      link: 'youtubeId' as const,
+      views: 'int' as const,
+      thumbnail: 'youtubeThumbnail' as const
+    },
+    dictionaries: { channel: ['COLORS'], thumbnail: ['hqdefault.jpg'] },
+    columns: { channel: [0, 0], link: ['abcdefghijk', null], views: [42, null], thumbnail: [0, null] },
+    exceptions: {
+      link: { '1': 'https://youtu.be/other' },
+      views: { '1': '1,2k' },
+      thumbnail: { '1': 'https://example.com/thumb.jpg' }
+    }
+  };
+
+  assert.ok(isCompactDataset(dataset));
+  assert.deepEqual(decodeCompactDataset(dataset), [
+    ['COLORS', 'https://www.youtube.com/watch?v=abcdefghijk', '42', 'https://i.ytimg.com/vi/abcdefghijk/hqdefault.jpg'],
+    ['COLORS', 'https://youtu.be/other', '1,2k', 'https://example.com/thumb.jpg']
+  ]);
+});
+
+test('isCompactDataset rejette un export ligne à ligne', () => {
+  assert.equal(isCompactDataset([['title']]), false);
+});
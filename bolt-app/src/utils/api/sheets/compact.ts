@@ -0,0 +1,69 @@
+/**
+ * Décodeur du jeu de données compact généré par `compact_dataset.py`
+ * (`public/data/videos.compact.json`) : colonnes, dictionnaires de chaînes
+ * répétées, identifiants de vidéo à la place des liens et miniatures.
+ */
+
+export type ColumnEncoding = 'string' | 'dict' | 'int' | 'youtubeId' | 'youtubeThumbnail';
+
+export interface CompactDataset {
+  format: 'videos-columnar';
+  version: 1;
+  headers: string[];
+  count: number;
+  encodings: Record<string, ColumnEncoding>;
+  dictionaries: Record<string, string[]>;
+  columns: Record<string, Array<string | number | null>>;
+  exceptions?: Record<string, Record<string, string>>;
+}
+
+const LINK_PREFIX = 'https://www.youtube.com/watch?v=';
+const THUMBNAIL_PREFIX = 'https://i.ytimg.com/vi/';
+
+export function isCompactDataset(value: unknown): value is CompactDataset {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    !Array.isArray(value) &&
+    (value as CompactDataset).format === 'videos-columnar' &&
+    (value as CompactDataset).version === 1
+  );
+}
+
+/**
+ * Reconstruit les lignes (sans l'en-tête) dans l'ordre des colonnes de
+ * `headers`, identiques à celles de `videos.json` complétées par des chaînes vides.
+ */
+export function decodeCompactDataset(dataset: CompactDataset): string[][] {
+  const { headers, count, columns, encodings } = dataset;
+  const dictionaries = dataset.dictionaries ?? {};
+  const exceptions = dataset.exceptions ?? {};
+  const videoIds = encodings.link === 'youtubeId' ? columns.link : undefined;
+  const rows: string[][] = Array.from({ length: count }, () => new Array<string>(headers.length).fill(''));
+
+  headers.forEach((name, columnIndex) => {
+    const encoding = encodings[name] ?? 'string';
+    const column = columns[name] ?? [];
+    const columnExceptions = exceptions[name] ?? {};
+    const dictionary = dictionaries[name] ?? [];
+
+    for (let rowIndex = 0; rowIndex < count; rowIndex++) {
+      const value = column[rowIndex];
+      let decoded: string;
+      if (value === null || value === undefined) {
+        decoded = columnExceptions[String(rowIndex)] ?? '';
+      } else if (encoding === 'dict') {
+        decoded = dictionary[value as number] ?? '';
+      } else if (encoding === 'youtubeId') {
+        decoded = `${LINK_PREFIX}${value}`;
+      } else if (encoding === 'youtubeThumbnail') {
+        decoded = `${THUMBNAIL_PREFIX}${videoIds?.[rowIndex] ?? ''}/${dictionary[value as number] ?? ''}`;
+      } else {
+        decoded = String(value);
+      }
+      rows[rowIndex][columnIndex] = decoded;
+    }
+  });
+
+  return rows;
+}
@@ -32,13 +32,17 @@ test('fetchAllVideos uses local data when config error', async () => {
     ]
   ];
 
-  const fetchMock = mock.method(globalThis, 'fetch', async () => {
+  const fetchMock = mock.method(globalThis, 'fetch', async (input: any) => {
+    const url = typeof input === 'string' ? input : input.url;
+    if (url.includes('data/videos.compact.json')) {
+      return new Response('', { status: 404 });
+    }
     return new Response(JSON.stringify(rows), { status: 200 });
   });
 
   const result = await fetchAllVideos();
 
-  assert.equal(fetchMock.mock.calls.length, 1);
+  assert.equal(fetchMock.mock.calls.length, 2);
   assert.equal(result.error, error);
   assert.ok(result.metadata?.errors?.includes(error));
 
@@ -105,6 +109,9 @@ test('fetchAllVideos returns synchronized data on success', async () => {
 
   const fetchMock = mock.method(globalThis, 'fetch', async (input: any) => {
     const url = typeof input === 'string' ? input : input.url;
+    if (url.includes('data/videos.compact.json')) {
+      return new Response('', { status: 404 });
+    }
     if (url.includes('data/videos.json')) {
       calls.push('local');
       return new Response(JSON.stringify(localRows), { status: 200 });
@@ -166,6 +173,9 @@ test('fetchAllVideos keeps local data when synchronization fails', async () => {
 
   const fetchMock = mock.method(globalThis, 'fetch', async (input: any) => {
     const url = typeof input === 'string' ? input : input.url;
+    if (url.includes('data/videos.compact.json')) {
+      return new Response('', { status: 404 });
+    }
     if (url.includes('data/videos.json')) {
       calls.push('local');
       return new Response(JSON.stringify(localRows), { status: 200 });
@@ -1,10 +1,10 @@
 import type { VideoData } from '../../../types/video.ts';
 import type { ApiResponse } from './types.ts';
 import { synchronizeSheets } from './sync.ts';
-import { fetchLocalVideos } from './local.ts';
+import { fetchLocalVideos, fetchLocalVideosProgressively } from './local.ts';
 import { getConfig } from '../../constants.ts';
 
-export { fetchLocalVideos };
+export { fetchLocalVideos, fetchLocalVideosProgressively };
 
 /**
  * Récupère toutes les vidéos.
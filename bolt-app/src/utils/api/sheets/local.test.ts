@@ -6,15 +6,94 @@ import assert from 'node:assert/strict';
 test('fetchLocalVideos ajoute un paramètre de version et utilise cache "no-store"', async () => {
   const fetchMock = mock.method(globalThis, 'fetch', async (input: any, init?: RequestInit) => {
     const url = typeof input === 'string' ? input : input.url;
-    assert.ok(/data\/videos\.json\?t=\d+/.test(url));
+    assert.ok(/data\/videos(\.compact)?\.json\?t=\d+/.test(url));
     assert.equal(init?.cache, 'no-store');
+    if (url.includes('videos.compact.json')) {
+      return new Response('', { status: 404 });
+    }
     return new Response(JSON.stringify([[]]), { status: 200 });
   });
 
   const { fetchLocalVideos } = await import(`./local.ts?test=${Date.now()}`);
 
   await fetchLocalVideos();
+  assert.equal(fetchMock.mock.calls.length, 2);
+
+  mock.restoreAll();
+});
+
+test('fetchLocalVideos lit le jeu de données compact en priorité', async () => {
+  const compact = {
+    format: 'videos-columnar',
+    version: 1,
+    headers: ['channelAvatar', 'title', 'link', 'thumbnail'],
+    count: 1,
+    encodings: { channelAvatar: 'dict', title: 'string', link: 'youtubeId', thumbnail: 'youtubeThumbnail' },
+    dictionaries: { channelAvatar: ['https://example.com/a.jpg'], thumbnail: ['hqdefault.jpg'] },
+    columns: { channelAvatar: [0], title: ['Compact'], link: ['abcdefghijk'], thumbnail: [0] },
+    exceptions: {}
+  };
+  const fetchMock = mock.method(globalThis, 'fetch', async () => {
+    return new Response(JSON.stringify(compact), { status: 200 });
+  });
+
+  const { fetchLocalVideos } = await import(`./local.ts?compact=${Date.now()}`);
+  const result = await fetchLocalVideos();
+
   assert.equal(fetchMock.mock.calls.length, 1);
+  assert.equal(result.data[0].title, 'Compact');
+  assert.equal(result.data[0].link, 'https://www.youtube.com/watch?v=abcdefghijk');
+
+  mock.restoreAll();
+});
+
+test('fetchLocalVideosProgressively affiche l\'onglet actif avant les autres fragments', async () => {
+  const shard = (title: string) => ({
+    format: 'videos-columnar',
+    version: 1,
+    headers: ['channelAvatar', 'title', 'link'],
+    count: 1,
+    encodings: { channelAvatar: 'string', title: 'string', link: 'youtubeId' },
+    dictionaries: {},
+    columns: { channelAvatar: [''], title: [title], link: ['abcdefghijk'] },
+    exceptions: {}
+  });
+  const manifest = {
+    format: 'videos-shards',
+    version: 1,
+    count: 2,
+    shards: [
+      { name: '0-5min', file: 'shards/0-5min.json', count: 1, sha256: 'aaaa' },
+      { name: '60Plusmin', file: 'shards/60Plusmin.json', count: 1, sha256: 'bbbb' }
+    ]
+  };
+  const requested: string[] = [];
+  mock.method(globalThis, 'fetch', async (input: any) => {
+    const url = typeof input === 'string' ? input : input.url;
+    requested.push(url);
+    if (url.includes('manifest.json')) {
+      return new Response(JSON.stringify(manifest), { status: 200 });
+    }
+    return new Response(JSON.stringify(shard(url.includes('60Plusmin') ? 'Long' : 'Court')), { status: 200 });
+  });
+
+  const { fetchLocalVideosProgressively } = await import(`./local.ts?shards=${Date.now()}`);
+  const partials: string[][] = [];
+  const result = await fetchLocalVideosProgressively('60Plusmin', (videos: any[], name: string) => {
+    partials.push([name, ...videos.map(video => video.title)]);
+  });
+
+  assert.deepEqual(partials, [['60Plusmin', 'Long']]);
+  assert.ok(requested[1].includes('data/shards/60Plusmin.json?v=bbbb'));
+  assert.deepEqual(result.data.map((video: any) => video.title), ['Court', 'Long']);
+
+  // Vue « toutes les vidéos » : pas d'affichage partiel d'un seul fragment
+  partials.length = 0;
+  const all = await fetchLocalVideosProgressively(null, (videos: any[], name: string) => {
+    partials.push([name, ...videos.map(video => video.title)]);
+  });
+  assert.deepEqual(partials, []);
+  assert.deepEqual(all.data.map((video: any) => video.title), ['Court', 'Long']);
 
   mock.restoreAll();
 });
@@ -2,19 +2,47 @@ import type { VideoData } from '../../../types/video.ts';
 import type { ApiResponse } from './types.ts';
 import { validateRow } from './validation.ts';
 import { mapRowToVideo } from './transform.ts';
+import { decodeCompactDataset, isCompactDataset } from './compact.ts';
+import { fetchShardRows, isShardManifest, shardLoadOrder } from './shards.ts';
 
-export async function fetchLocalVideos(): Promise<ApiResponse<VideoData[]>> {
+async function fetchJson(path: string): Promise<unknown> {
+  const baseUrl = (import.meta as any).env?.BASE_URL ?? '';
+  const url = `${baseUrl}${path}?t=${Date.now()}`;
+  const res = await fetch(url, { cache: 'no-store' });
+  if (!res.ok) {
+    throw new Error(`HTTP error ${res.status}`);
+  }
+  return res.json();
+}
+
+/**
+ * Lit le jeu de données compact (`data/videos.compact.json`) et, s'il est
+ * absent ou illisible, l'export ligne à ligne `data/videos.json`.
+ */
+async function fetchLocalRows(): Promise<any[][]> {
   try {
-    const baseUrl = (import.meta as any).env?.BASE_URL ?? '';
-    const url = `${baseUrl}data/videos.json?t=${Date.now()}`;
-    const res = await fetch(url, { cache: 'no-store' });
-    const json = await res.json();
-    const [, ...rows] = json as any[][]; // skip header row
-    const videos = rows
-      .filter(validateRow)
-      .map((row, index) => mapRowToVideo(row, index));
+    const compact = await fetchJson('data/videos.compact.json');
+    if (isCompactDataset(compact)) {
+      return decodeCompactDataset(compact);
+    }
+  } catch {
+    // Repli sur l'export ligne à ligne
+  }
+  const json = await fetchJson('data/videos.json');
+  const [, ...rows] = json as any[][]; // skip header row
+  return rows;
+}
+
+function rowsToVideos(rows: any[][]): VideoData[] {
+  return rows
+    .filter(validateRow)
+    .map((row, index) => mapRowToVideo(row, index));
+}
 
-    return { data: videos };
+export async function fetchLocalVideos(): Promise<ApiResponse<VideoData[]>> {
+  try {
+    const rows = await fetchLocalRows();
+    return { data: rowsToVideos(rows) };
   } catch (err) {
     console.error('Erreur lors du chargement des vidéos locales:', err);
     return {
@@ -25,3 +53,48 @@ export async function fetchLocalVideos(): Promise<ApiResponse<VideoData[]>> {
     };
   }
 }
+
+/**
+ * Charge les vidéos locales fragment par fragment (`data/shards/manifest.json`) :
+ * le fragment de l'onglet `priorityShard` est lu en premier et transmis à
+ * `onPartial` (avec son nom) pour un premier affichage, puis les autres sont
+ * lus en parallèle. Sans onglet prioritaire (vue « toutes les vidéos ») ou si
+ * son fragment est vide, aucun affichage partiel n'a lieu : un seul fragment
+ * passerait pour la liste complète. Le résultat final suit l'ordre du
+ * manifeste, identique à `videos.json`.
+ * Sans manifeste (ou si un fragment échoue), se rabat sur `fetchLocalVideos`.
+ */
+export async function fetchLocalVideosProgressively(
+  priorityShard: string | null,
+  onPartial: (videos: VideoData[], shard: string) => void
+): Promise<ApiResponse<VideoData[]>> {
+  let manifest: unknown;
+  try {
+    manifest = await fetchJson('data/shards/manifest.json');
+  } catch {
+    return fetchLocalVideos();
+  }
+  if (!isShardManifest(manifest)) {
+    return fetchLocalVideos();
+  }
+
+  try {
+    let rest = shardLoadOrder(manifest, priorityShard);
+    const rowsByShard = new Map<string, string[][]>();
+    const first = rest[0];
+    if (first && first.name === priorityShard) {
+      const firstRows = await fetchShardRows(first);
+      rowsByShard.set(first.name, firstRows);
+      onPartial(rowsToVideos(firstRows), first.name);
+      rest = rest.slice(1);
+    }
+    const restRows = await Promise.all(rest.map(shard => fetchShardRows(shard)));
+    rest.forEach((shard, index) => rowsByShard.set(shard.name, restRows[index]));
+
+    const rows = manifest.shards.flatMap(shard => rowsByShard.get(shard.name) ?? []);
+    return { data: rowsToVideos(rows) };
+  } catch (err) {
+    console.warn('Fragments locaux indisponibles, lecture de videos.json :', err);
+    return fetchLocalVideos();
+  }
+}
@@ -0,0 +1,24 @@
+import test from 'node:test';
+import assert from 'node:assert/strict';
+import { shardLoadOrder, shardNameForRange } from './shards.ts';
+
+const manifest = {
+  format: 'videos-shards' as const,
+  version: 1 as const,
+  count: 3,
+  shards: [
+    { name: '0-5min', file: 'shards/0-5min.json', count: 2, sha256: 'a' },
+    { name: '5-10min', file: 'shards/5-10min.json', count: 0, sha256: 'b' },
+    { name: '60Plusmin', file: 'shards/60Plusmin.json', count: 1, sha256: 'c' },
+  ],
+};
+
+test('shardNameForRange retire les guillemets de l\'onglet', () => {
+  assert.equal(shardNameForRange("'60Plusmin'!A:Z"), '60Plusmin');
+});
+
+test('shardLoadOrder charge l\'onglet actif en premier et ignore les fragments vides', () => {
+  assert.deepEqual(shardLoadOrder(manifest, '60Plusmin').map(shard => shard.name), ['60Plusmin', '0-5min']);
+  assert.deepEqual(shardLoadOrder(manifest, null).map(shard => shard.name), ['0-5min', '60Plusmin']);
+  assert.deepEqual(shardLoadOrder(manifest, '5-10min').map(shard => shard.name), ['0-5min', '60Plusmin']);
+});
@@ -0,0 +1,62 @@
+/**
+ * Fragments par catégorie de durée générés par `public_data.py`
+ * (`public/data/shards/manifest.json` et `shards/<catégorie>.json`, au format
+ * compact). Le manifeste donne le nombre de lignes et l'empreinte SHA-256 de
+ * chaque fragment : l'empreinte sert de version dans l'URL, ce qui permet au
+ * navigateur de garder en cache les fragments inchangés.
+ */
+import { decodeCompactDataset, isCompactDataset } from './compact.ts';
+
+export interface ShardEntry {
+  name: string;
+  file: string;
+  count: number;
+  sha256: string | null;
+}
+
+export interface ShardManifest {
+  format: 'videos-shards';
+  version: 1;
+  count: number;
+  shards: ShardEntry[];
+}
+
+export function isShardManifest(value: unknown): value is ShardManifest {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    !Array.isArray(value) &&
+    (value as ShardManifest).format === 'videos-shards' &&
+    (value as ShardManifest).version === 1 &&
+    Array.isArray((value as ShardManifest).shards)
+  );
+}
+
+/** Nom du fragment correspondant à une plage d'onglet (`'0-5min'!A:Z` → `0-5min`). */
+export function shardNameForRange(range: string): string {
+  return range.split('!')[0].replace(/^'(.*)'$/, '$1');
+}
+
+/**
+ * Ordre de chargement : le fragment demandé d'abord (ou le premier non vide),
+ * puis les autres dans l'ordre du manifeste. Les fragments vides sont ignorés.
+ */
+export function shardLoadOrder(manifest: ShardManifest, priority: string | null): ShardEntry[] {
+  const shards = manifest.shards.filter(shard => shard.count > 0);
+  const first = shards.find(shard => shard.name === priority) ?? shards[0];
+  return first ? [first, ...shards.filter(shard => shard !== first)] : [];
+}
+
+export async function fetchShardRows(shard: ShardEntry): Promise<string[][]> {
+  const baseUrl = (import.meta as any).env?.BASE_URL ?? '';
+  const version = shard.sha256 ? shard.sha256.slice(0, 16) : String(Date.now());
+  const res = await fetch(`${baseUrl}data/${shard.file}?v=${version}`);
+  if (!res.ok) {
+    throw new Error(`HTTP error ${res.status}`);
+  }
+  const dataset = await res.json();
+  if (!isCompactDataset(dataset)) {
+    throw new Error(`Fragment ${shard.name} invalide`);
+  }
+  return decodeCompactDataset(dataset);
+}
@@ -0,0 +1,41 @@
+import test from 'node:test';
+import assert from 'node:assert/strict';
+import { searchIndexKeys, tokenize } from './searchIndex.ts';
+
+test('tokenize retire la casse et les accents', () => {
+  assert.deepEqual(tokenize('Éléphant, CAFÉ-crème & co_op 2024'), ['elephant', 'cafe', 'creme', 'co', 'op', '2024']);
+});
+
+test('searchIndexKeys décode les différences et croise les mots', () => {
+  const index = {
+    format: 'videos-search' as const,
+    version: 2 as const,
+    fields: ['title', 'channel'],
+    count: 4,
+    ids: ['a', 'b', 'c', 'd'],
+    tokens: ['concert', 'opera', 'operette', 'rock'],
+    postings: [[0, 3], [0, 1], [2], [3]],
+    masks: [[1, 1], [1, 2], [1], [3]],
+  };
+  assert.deepEqual(searchIndexKeys(index, 'ope'), new Set(['a', 'b', 'c']));
+  assert.deepEqual(searchIndexKeys(index, 'concert r'), new Set(['d']));
+  assert.deepEqual(searchIndexKeys(index, 'jazz'), new Set());
+  assert.equal(searchIndexKeys(index, ' - '), null);
+});
+
+test('searchIndexKeys ne cherche que dans les champs choisis', () => {
+  const index = {
+    format: 'videos-search' as const,
+    version: 2 as const,
+    fields: ['title', 'channel', 'tags'],
+    count: 3,
+    ids: ['a', 'b', 'c'],
+    tokens: ['opera', 'paris'],
+    postings: [[0, 1, 1], [1]],
+    masks: [[1, 2, 4], [2]],
+  };
+  assert.deepEqual(searchIndexKeys(index, 'ope', ['title']), new Set(['a']));
+  assert.deepEqual(searchIndexKeys(index, 'ope', ['title', 'channel']), new Set(['a', 'b']));
+  assert.deepEqual(searchIndexKeys(index, 'opera paris', ['title']), new Set());
+  assert.deepEqual(searchIndexKeys(index, 'opera paris', ['channel']), new Set(['b']));
+});
@@ -0,0 +1,146 @@
+/**
+ * Index de recherche inversé généré par `search_index.py`
+ * (`public/data/videos.search.json`) : mots normalisés du titre et de la
+ * chaîne, triés pour une recherche par préfixe.
+ * `masks[i][j]` indique les champs (bit `k` = `fields[k]`) de la ligne de
+ * `postings[i][j]` qui contiennent le mot `tokens[i]`.
+ */
+
+export interface SearchIndex {
+  format: 'videos-search';
+  version: 2;
+  fields: string[];
+  count: number;
+  ids: string[];
+  tokens: string[];
+  postings: number[][];
+  masks: number[][];
+}
+
+const LINK_PREFIX = 'https://www.youtube.com/watch?v=';
+const TOKEN_PATTERN = /[\p{L}\p{N}]+/gu;
+const COMBINING_MARKS = /\p{Mn}/gu;
+
+export function isSearchIndex(value: unknown): value is SearchIndex {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    !Array.isArray(value) &&
+    (value as SearchIndex).format === 'videos-search' &&
+    (value as SearchIndex).version === 2
+  );
+}
+
+/** Minuscules sans accents, comme `normalize_text` côté Python. */
+export function normalizeText(text: string): string {
+  return text.toLowerCase().normalize('NFKD').replace(COMBINING_MARKS, '');
+}
+
+export function tokenize(text: string): string[] {
+  return normalizeText(text).match(TOKEN_PATTERN) ?? [];
+}
+
+/** Clé d'une vidéo dans l'index : identifiant YouTube ou lien complet. */
+export function videoKey(link: string): string {
+  return link.startsWith(LINK_PREFIX) ? link.slice(LINK_PREFIX.length) : link;
+}
+
+const indexedKeysCache = new WeakMap<SearchIndex, Set<string>>();
+
+/** Clés de toutes les vidéos présentes dans l'index (calculées une seule fois). */
+export function indexedKeys(index: SearchIndex): Set<string> {
+  let keys = indexedKeysCache.get(index);
+  if (!keys) {
+    keys = new Set(index.ids);
+    indexedKeysCache.set(index, keys);
+  }
+  return keys;
+}
+
+function lowerBound(tokens: string[], term: string): number {
+  let low = 0;
+  let high = tokens.length;
+  while (low < high) {
+    const middle = (low + high) >> 1;
+    if (tokens[middle] < term) {
+      low = middle + 1;
+    } else {
+      high = middle;
+    }
+  }
+  return low;
+}
+
+/** Masque des champs `fields` de l'index (tous les champs indexés si absent). */
+function fieldMask(index: SearchIndex, fields?: readonly string[]): number {
+  let mask = 0;
+  index.fields.forEach((name, bit) => {
+    if (!fields || fields.includes(name)) {
+      mask |= 1 << bit;
+    }
+  });
+  return mask;
+}
+
+/**
+ * Pour chaque mot de `terms`, clés des vidéos dont l'un des champs `fields`
+ * (tous les champs indexés si absent) contient un mot commençant par celui-ci.
+ */
+export function searchIndexTermKeys(
+  index: SearchIndex,
+  terms: readonly string[],
+  fields?: readonly string[]
+): Set<string>[] {
+  const selected = fieldMask(index, fields);
+  return terms.map(term => {
+    const keys = new Set<string>();
+    if (selected === 0) {
+      return keys;
+    }
+    for (let position = lowerBound(index.tokens, term); position < index.tokens.length; position++) {
+      if (!index.tokens[position].startsWith(term)) break;
+      const masks = index.masks[position];
+      let rowId = 0;
+      index.postings[position].forEach((delta, offset) => {
+        rowId += delta;
+        if (masks[offset] & selected) {
+          keys.add(index.ids[rowId]);
+        }
+      });
+    }
+    return keys;
+  });
+}
+
+/**
+ * Clés des vidéos dont les champs `fields` contiennent, pour chaque mot de la
+ * requête, un mot commençant par celui-ci. Retourne `null` si la requête ne
+ * contient aucun mot.
+ */
+export function searchIndexKeys(
+  index: SearchIndex,
+  query: string,
+  fields?: readonly string[]
+): Set<string> | null {
+  const terms = tokenize(query);
+  if (terms.length === 0) {
+    return null;
+  }
+  const [first, ...others] = searchIndexTermKeys(index, terms, fields);
+  return new Set([...first].filter(key => others.every(keys => keys.has(key))));
+}
+
+/** Charge `data/videos.search.json` ; `null` s'il est absent ou invalide. */
+export async function fetchSearchIndex(): Promise<SearchIndex | null> {
+  try {
+    const baseUrl = (import.meta as any).env?.BASE_URL ?? '';
+    const res = await fetch(`${baseUrl}data/videos.search.json?t=${Date.now()}`, { cache: 'no-store' });
+    if (!res.ok) {
+      return null;
+    }
+    const json = await res.json();
+    return isSearchIndex(json) ? json : null;
+  } catch {
+    return null;
+  }
+}
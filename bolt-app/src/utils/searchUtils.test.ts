@@ -13,3 +13,53 @@ test('filterVideosBySearch utilise myCategory pour le champ category', () => {
   const result = filterVideosBySearch(videos, filters);
   assert.deepEqual(result, [videos[1]]);
 });
+
+test('filterVideosBySearch interroge l\'index par préfixe, sans accents', () => {
+  const videos = [
+    { title: 'Concert à l\'Opéra', channel: 'Arte', link: 'https://www.youtube.com/watch?v=aaaaaaaaaaa', myCategory: '' },
+    { title: 'Live', channel: 'Rock', link: 'https://www.youtube.com/watch?v=bbbbbbbbbbb', myCategory: 'Opéra' },
+    { title: 'Recette', channel: 'Cuisine', link: 'https://www.youtube.com/watch?v=ccccccccccc', myCategory: '' },
+  ] as any;
+  const index = {
+    format: 'videos-search' as const,
+    version: 2 as const,
+    fields: ['title', 'channel'],
+    count: 3,
+    ids: ['aaaaaaaaaaa', 'bbbbbbbbbbb', 'ccccccccccc'],
+    tokens: ['a', 'arte', 'concert', 'cuisine', 'l', 'live', 'opera', 'recette', 'rock'],
+    postings: [[0], [0], [0], [2], [0], [1], [0], [2], [1]],
+    masks: [[1], [2], [1], [2], [1], [1], [1], [1], [2]],
+  };
+  const filters = { query: 'OPE', fields: ['title', 'channel', 'category'] } as any;
+  assert.deepEqual(filterVideosBySearch(videos, filters, index), [videos[0], videos[1]]);
+  assert.deepEqual(filterVideosBySearch(videos, { ...filters, query: 'concert op' }, index), [videos[0]]);
+  // Les mots peuvent venir de champs différents (index et catégorie)
+  assert.deepEqual(filterVideosBySearch(videos, { ...filters, query: 'live opera' }, index), [videos[1]]);
+  // Seuls les champs cochés sont cherchés, par début de mot
+  assert.deepEqual(filterVideosBySearch(videos, { query: 'opera', fields: ['title'] }, index), [videos[0]]);
+  assert.deepEqual(filterVideosBySearch(videos, { ...filters, query: 'pera' }, index), []);
+  assert.deepEqual(filterVideosBySearch(videos, { query: 'arte', fields: ['title'] }, index), []);
+});
+
+test('filterVideosBySearch applique la même règle sans index', () => {
+  const videos = [
+    { title: 'Concert à l\'Opéra', channel: 'Arte', link: 'https://www.youtube.com/watch?v=aaaaaaaaaaa' },
+    { title: 'Live', channel: 'Rock', link: 'https://www.youtube.com/watch?v=ddddddddddd' },
+  ] as any;
+  const index = {
+    format: 'videos-search' as const,
+    version: 2 as const,
+    fields: ['title', 'channel'],
+    count: 1,
+    ids: ['aaaaaaaaaaa'],
+    tokens: ['a', 'arte', 'concert', 'l', 'opera'],
+    postings: [[0], [0], [0], [0], [0]],
+    masks: [[1], [2], [1], [1], [1]],
+  };
+  const filters = { query: 'opera arte', fields: ['title', 'channel'] } as const;
+  for (const source of [undefined, index]) {
+    assert.deepEqual(filterVideosBySearch(videos, filters, source), [videos[0]]);
+    assert.deepEqual(filterVideosBySearch(videos, { ...filters, query: 'cert' }, source), []);
+    assert.deepEqual(filterVideosBySearch(videos, { ...filters, query: 'ROCK liv' }, source), [videos[1]]);
+  }
+});
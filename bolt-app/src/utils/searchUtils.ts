@@ -1,18 +1,43 @@
 import type { VideoData } from '../types/video.ts';
 import type { SearchFilters } from '../types/search.ts';
+import { indexedKeys, searchIndexTermKeys, tokenize, videoKey, type SearchIndex } from './searchIndex.ts';
 
-export function filterVideosBySearch(videos: VideoData[], filters: SearchFilters): VideoData[] {
+/**
+ * Filtre les vidéos selon la recherche : chaque mot de la requête doit
+ * commencer un mot (sans accents ni casse) de l'un des champs choisis. Le
+ * titre et la chaîne sont cherchés dans l'index prégénéré ; la catégorie, et
+ * tous les champs des vidéos absentes de l'index (ajoutées depuis sa
+ * génération), sont découpés en mots à la volée.
+ */
+export function filterVideosBySearch(
+  videos: VideoData[],
+  filters: SearchFilters,
+  index?: SearchIndex | null
+): VideoData[] {
   if (!filters.query.trim() || filters.fields.length === 0) {
     return videos;
   }
 
-  const searchTerm = filters.query.toLowerCase().trim();
-  
+  const terms = tokenize(filters.query);
+  if (terms.length === 0) {
+    return videos;
+  }
+
+  const indexedFields = filters.fields.filter(field => field !== 'category');
+  const termKeys = index && indexedFields.length > 0 ? searchIndexTermKeys(index, terms, indexedFields) : null;
+  const knownKeys = index && termKeys ? indexedKeys(index) : null;
+  const categoryOnly = filters.fields.filter(field => field === 'category');
+
   return videos.filter(video => {
-    return filters.fields.some(field => {
-      const key = field === 'category' ? 'myCategory' : field;
-      const value = (video[key as keyof VideoData] ?? '').toLowerCase();
-      return value.includes(searchTerm);
+    const key = videoKey(video.link ?? '');
+    const indexed = knownKeys?.has(key) ?? false;
+    const words = (indexed ? categoryOnly : filters.fields).flatMap(field => {
+      const name = field === 'category' ? 'myCategory' : field;
+      return tokenize((video[name as keyof VideoData] ?? '').toString());
     });
+    return terms.every(
+      (term, position) =>
+        (indexed && termKeys?.[position].has(key)) || words.some(word => word.startsWith(term))
+    );
   });
 }
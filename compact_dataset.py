@@ -0,0 +1,186 @@
+"""
+Format compact du jeu de données publié pour l'application web
+(`bolt-app/public/data/videos.compact.json`).
+
+Les lignes `[HEADERS] + lignes` sont stockées par colonnes :
+
+    - les chaînes répétées (avatar, chaîne, catégorie, playlistId,
+      myCategory) sont remplacées par un indice dans un dictionnaire ;
+    - `link` ne conserve que l'identifiant de la vidéo ;
+    - `thumbnail` ne conserve que l'indice du nom de fichier
+      (`hqdefault.jpg`, …) de la miniature `i.ytimg.com` de cette vidéo ;
+    - les compteurs (vues, likes, commentaires, position) sont des entiers.
+
+Une valeur qui ne respecte pas la forme attendue de sa colonne est rangée
+telle quelle dans `exceptions[colonne][indice de ligne]` (l'entrée de la
+colonne vaut alors `null`). Les lignes plus courtes que les en‑têtes sont
+complétées par des chaînes vides.
+
+Le fichier est accompagné de versions précompressées `.gz` et `.br` (si le
+module `brotli` est installé). Le décodeur correspondant se trouve dans
+`bolt-app/src/utils/api/sheets/compact.ts`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import re
+
+from dataset_writer import write_bytes_if_changed
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    brotli = None
+
+FORMAT_NAME = "videos-columnar"
+FORMAT_VERSION = 1
+
+LINK_PREFIX = "https://www.youtube.com/watch?v="
+THUMBNAIL_PREFIX = "https://i.ytimg.com/vi/"
+
+# Encodage de chaque colonne connue ; les autres colonnes restent des chaînes
+COLUMN_ENCODINGS = {
+    "channelAvatar": "dict",
+    "channel": "dict",
+    "category": "dict",
+    "myCategory": "dict",
+    "playlistId": "dict",
+    "link": "youtubeId",
+    "thumbnail": "youtubeThumbnail",
+    "views": "int",
+    "likes": "int",
+    "comments": "int",
+    "playlistPosition": "int",
+}
+
+_VIDEO_ID_RE = re.compile(r"[A-Za-z0-9_-]{11}")
+_INT_RE = re.compile(r"0|[1-9][0-9]*")
+
+
+class CompactEncoder:
+    """Encodeur incrémental : les lignes sont ajoutées une à une (lecture en flux)."""
+
+    def __init__(self, headers: list[str]):
+        self.headers = list(headers)
+        self.encodings = {name: COLUMN_ENCODINGS.get(name, "string") for name in self.headers}
+        self.dictionaries: dict[str, list[str]] = {
+            name: [] for name, encoding in self.encodings.items() if encoding in ("dict", "youtubeThumbnail")
+        }
+        self.columns: dict[str, list] = {name: [] for name in self.headers}
+        self.exceptions: dict[str, dict[str, str]] = {}
+        self._lookups: dict[str, dict[str, int]] = {name: {} for name in self.dictionaries}
+        self._link_index = self.headers.index("link") if "link" in self.headers else None
+        self.count = 0
+
+    def _dictionary_index(self, name: str, value: str) -> int:
+        lookup = self._lookups[name]
+        if value not in lookup:
+            lookup[value] = len(self.dictionaries[name])
+            self.dictionaries[name].append(value)
+        return lookup[value]
+
+    def add(self, row: list) -> None:
+        width = len(self.headers)
+        values = [str(value) for value in row[:width]] + [""] * (width - len(row))
+        video_id = None
+        if self._link_index is not None:
+            link = values[self._link_index]
+            if link.startswith(LINK_PREFIX) and _VIDEO_ID_RE.fullmatch(link[len(LINK_PREFIX) :]):
+                video_id = link[len(LINK_PREFIX) :]
+        for name, value in zip(self.headers, values):
+            encoding = self.encodings[name]
+            encoded = self._encode(name, encoding, value, video_id)
+            if encoded is None and encoding != "string":
+                self.exceptions.setdefault(name, {})[str(self.count)] = value
+            self.columns[name].append(value if encoding == "string" else encoded)
+        self.count += 1
+
+    def _encode(self, name: str, encoding: str, value: str, video_id: str | None):
+        if encoding == "dict":
+            return self._dictionary_index(name, value)
+        if encoding == "youtubeId":
+            return video_id
+        if encoding == "youtubeThumbnail" and video_id is not None:
+            prefix = f"{THUMBNAIL_PREFIX}{video_id}/"
+            variant = value[len(prefix) :]
+            if value.startswith(prefix) and variant and "/" not in variant:
+                return self._dictionary_index(name, variant)
+        if encoding == "int" and _INT_RE.fullmatch(value) and int(value) <= 2**53:
+            return int(value)
+        return None
+
+    def dataset(self) -> dict:
+        return {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "headers": self.headers,
+            "count": self.count,
+            "encodings": self.encodings,
+            "dictionaries": self.dictionaries,
+            "columns": self.columns,
+            "exceptions": self.exceptions,
+        }
+
+
+def encode_rows(headers: list[str], rows) -> dict:
+    """Encode les lignes (sans l'en‑tête) au format colonne compact."""
+    encoder = CompactEncoder(headers)
+    for row in rows:
+        encoder.add(row)
+    return encoder.dataset()
+
+
+def decode_dataset(dataset: dict) -> list[list[str]]:
+    """Reconstruit les lignes (sans l'en‑tête) d'un jeu de données compact."""
+    if dataset.get("format") != FORMAT_NAME or dataset.get("version") != FORMAT_VERSION:
+        raise ValueError("Format de jeu de données compact inconnu")
+    headers = dataset["headers"]
+    count = dataset["count"]
+    columns = dataset["columns"]
+    dictionaries = dataset.get("dictionaries", {})
+    exceptions = dataset.get("exceptions", {})
+    rows = [[""] * len(headers) for _ in range(count)]
+    video_ids = columns.get("link") if dataset["encodings"].get("link") == "youtubeId" else None
+    for column_index, name in enumerate(headers):
+        encoding = dataset["encodings"][name]
+        column = columns[name]
+        column_exceptions = exceptions.get(name, {})
+        for row_index in range(count):
+            value = column[row_index]
+            if value is None:
+                rows[row_index][column_index] = column_exceptions.get(str(row_index), "")
+            elif encoding == "dict":
+                rows[row_index][column_index] = dictionaries[name][value]
+            elif encoding == "youtubeId":
+                rows[row_index][column_index] = LINK_PREFIX + value
+            elif encoding == "youtubeThumbnail":
+                video_id = video_ids[row_index]
+                rows[row_index][column_index] = f"{THUMBNAIL_PREFIX}{video_id}/{dictionaries[name][value]}"
+            else:
+                rows[row_index][column_index] = str(value)
+    return rows
+
+
+def write_compact_dataset(path: str, headers: list[str], rows) -> bool:
+    """
+    Écrit le jeu de données compact dans `path` ainsi que `path.gz` et
+    `path.br`, chacun seulement si son contenu a changé. Renvoie True si le
+    fichier JSON a été remplacé.
+    """
+    return write_encoded_dataset(path, encode_rows(headers, rows))
+
+
+def write_encoded_dataset(path: str, dataset: dict) -> bool:
+    """Variante de `write_compact_dataset` pour un jeu déjà encodé (`CompactEncoder.dataset()`)."""
+    payload = json.dumps(dataset, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    changed = write_bytes_if_changed(path, [payload])
+    # `mtime=0` rend l'archive reproductible : elle n'est réécrite que si le contenu change
+    write_bytes_if_changed(f"{path}.gz", [gzip.compress(payload, compresslevel=9, mtime=0)])
+    if brotli is not None:
+        write_bytes_if_changed(f"{path}.br", [brotli.compress(payload, quality=11)])
+    else:
+        logging.warning("Module brotli absent : %s.br n'est pas généré.", path)
+    return changed
@@ -0,0 +1,160 @@
+"""
+Écriture des jeux de données exportés (`data/videos.json`,
+`bolt-app/public/data/videos.{csv,json}`).
+
+Les lignes sont écrites une à une dans un fichier temporaire du même
+répertoire, synchronisé sur disque (`fsync`) puis renommé de façon atomique :
+un arrêt brutal laisse toujours l'ancien fichier intact. Une empreinte SHA‑256
+du contenu est calculée pendant l'écriture et comparée à celle du fichier
+existant ; s'ils sont identiques, le fichier n'est pas remplacé (ni sa date de
+modification, ni le commit du workflow de synchronisation).
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+from typing import Iterable, Iterator
+
+_CHUNK_SIZE = 1 << 16
+
+
+def file_digest(path: str) -> str | None:
+    """Empreinte SHA‑256 d'un fichier, ou None s'il n'existe pas."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as existing:
+            for chunk in iter(lambda: existing.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def write_if_changed(path: str, chunks: Iterable[str]) -> bool:
+    """
+    Écrit `chunks` (texte UTF‑8) dans `path` de façon atomique.
+
+    Renvoie True si le fichier a été créé ou remplacé, False si son contenu
+    était déjà identique.
+    """
+    return write_bytes_if_changed(path, (chunk.encode("utf-8") for chunk in chunks))
+
+
+def write_bytes_if_changed(path: str, chunks: Iterable[bytes]) -> bool:
+    """Variante binaire de `write_if_changed` (fichiers précompressés)."""
+    with AtomicWriter(path) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.changed
+
+
+class AtomicWriter:
+    """
+    Fichier écrit par morceaux (`write`) puis remplacé atomiquement à la
+    sortie du bloc `with`, uniquement si son contenu a changé (`changed`).
+    En cas d'exception, le fichier temporaire est supprimé et l'existant
+    conservé. Utilisable comme cible de `csv.writer`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.directory = os.path.dirname(path) or "."
+        self.changed = False
+        self._digest = hashlib.sha256()
+        self._file = None
+        self._tmp_path = None
+
+    def __enter__(self) -> "AtomicWriter":
+        os.makedirs(self.directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.path)}.", suffix=".tmp", dir=self.directory
+        )
+        self._file = os.fdopen(fd, "wb")
+        return self
+
+    def write(self, data: str | bytes) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._digest.update(data)
+        self._file.write(data)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self._commit()
+        finally:
+            if not self._file.closed:
+                self._file.close()
+            if os.path.exists(self._tmp_path):
+                os.unlink(self._tmp_path)
+
+    def _commit(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        if file_digest(self.path) == self._digest.hexdigest():
+            return
+        os.chmod(self._tmp_path, 0o644)
+        os.replace(self._tmp_path, self.path)
+        _fsync_directory(self.directory)
+        self.changed = True
+
+
+def _fsync_directory(directory: str) -> None:
+    """Rend le renommage durable (sans effet sur les systèmes qui ne le permettent pas)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def iter_json_rows(rows: Iterable[list], indent: int | None = None) -> Iterator[str]:
+    """
+    Sérialise une liste de lignes ligne par ligne, avec exactement la même
+    sortie que `json.dump(list(rows), f, ensure_ascii=False, indent=indent)`.
+    """
+    first = True
+    if indent is None:
+        for row in rows:
+            yield ("[" if first else ", ") + json.dumps(row, ensure_ascii=False)
+            first = False
+        yield "[]" if first else "]"
+        return
+    pad = " " * indent
+    for row in rows:
+        encoded = json.dumps(row, ensure_ascii=False, indent=indent).replace("\n", "\n" + pad)
+        yield ("[\n" if first else ",\n") + pad + encoded
+        first = False
+    yield "[]" if first else "\n]"
+
+
+def iter_csv_rows(rows: Iterable[list]) -> Iterator[str]:
+    """Sérialise les lignes au format CSV (dialecte par défaut de `csv.writer`)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def write_json_rows(path: str, rows: Iterable[list], indent: int | None = None) -> bool:
+    """Écrit `rows` en JSON si le contenu a changé ; renvoie True si le fichier a été remplacé."""
+    return write_if_changed(path, iter_json_rows(rows, indent))
+
+
+def write_csv_rows(path: str, rows: Iterable[list]) -> bool:
+    """Écrit `rows` en CSV si le contenu a changé ; renvoie True si le fichier a été remplacé."""
+    return write_if_changed(path, iter_csv_rows(rows))
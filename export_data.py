@@ -13,7 +13,12 @@ l'identifiant du classeur sont récupérés depuis les variables
 d'environnement `SPREADSHEET_ID` et `YOUTUBE_API_KEY`.
 
 Usage :
-    python export_data.py
+    python export_data.py [--chunk-rows N] [--max-in-flight N] [--profile]
+
+L'onglet est lu par fenêtres de `--chunk-rows` lignes (5 000 par défaut),
+avec au plus `--max-in-flight` requêtes simultanées ; les lignes sont écrites
+dans le fichier au fur et à mesure (voir `sheet_chunks.py`). `--profile`
+enregistre un profil cProfile et tracemalloc de l'export (voir `profiling.py`).
 
 Assurez‑vous que les variables d'environnement suivantes sont définies :
     - SPREADSHEET_ID : identifiant du Google Sheets (ou URL complète)
@@ -22,16 +27,22 @@ Assurez‑vous que les variables d'environnement suivantes sont définies :
 
 from __future__ import annotations
 
+import argparse
 import os
-import json
 import pathlib
 import re
 import sys
 import logging
-from typing import List
+from typing import Iterator, List
 
 import requests
 
+import http_client
+from dataset_writer import write_json_rows
+from profiling import PROFILE_DIR, profile_stages
+from run_metrics import metrics
+from sheet_chunks import DEFAULT_CHUNK_ROWS, DEFAULT_MAX_IN_FLIGHT, iter_chunked_rows, sheet_title
+
 # En-têtes attendues (doivent correspondre à celles utilisées dans main.py)
 HEADERS = [
     "channelAvatar",
@@ -75,19 +86,69 @@ def fetch_sheet_values(spreadsheet_id: str, api_key: str, range_: str) -> List[L
         Liste de lignes (chaque ligne est une liste de chaînes). Si aucune valeur
         n'est trouvée, renvoie une liste vide.
     """
-    encoded_range = requests.utils.quote(range_, safe="")
-    url = f"https://sheets.googleapis.com/v4/spreadsheets/{spreadsheet_id}/values/{encoded_range}?key={api_key}"
-    resp = requests.get(url, timeout=10)
     try:
-        resp.raise_for_status()
-        data = resp.json()
+        return _get_range(spreadsheet_id, api_key, range_)
     except Exception as e:
         logging.error("Erreur lors de la récupération des données de la feuille: %s", e)
         return []
-    return data.get("values", [])
+
+def _get_range(spreadsheet_id: str, api_key: str, range_: str) -> List[List[str]]:
+    """Lit une plage et lève une exception en cas d'erreur HTTP."""
+    encoded_range = requests.utils.quote(range_, safe="")
+    url = http_client.sheets_url(f"v4/spreadsheets/{spreadsheet_id}/values/{encoded_range}?key={api_key}")
+    resp = http_client.get(url)
+    resp.raise_for_status()
+    return resp.json().get("values", [])
+
+def fetch_grid_row_count(spreadsheet_id: str, api_key: str, title: str) -> int | None:
+    """Nombre de lignes de la grille d'un onglet, ou None s'il est inconnu."""
+    url = http_client.sheets_url(f"v4/spreadsheets/{spreadsheet_id}")
+    params = {"key": api_key, "fields": "sheets.properties(title,gridProperties.rowCount)"}
+    try:
+        resp = http_client.get(url, params=params)
+        resp.raise_for_status()
+        sheets = resp.json().get("sheets", [])
+    except Exception as e:
+        logging.warning("Taille de l'onglet %s inconnue: %s", title, e)
+        return None
+    for sheet in sheets:
+        properties = sheet.get("properties", {})
+        if properties.get("title") == title:
+            return properties.get("gridProperties", {}).get("rowCount")
+    return None
+
+def iter_sheet_values(
+    spreadsheet_id: str,
+    api_key: str,
+    range_: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> Iterator[List[str]]:
+    """
+    Rend les lignes d'une plage fenêtre par fenêtre (`chunk_rows` lignes par
+    requête, `max_in_flight` requêtes simultanées au plus). Chaque fenêtre est
+    relancée seule en cas d'échec ; RuntimeError est levée si elle échoue
+    définitivement.
+    """
+    total_rows = fetch_grid_row_count(spreadsheet_id, api_key, sheet_title(range_))
+    return iter_chunked_rows(
+        range_,
+        lambda window: _get_range(spreadsheet_id, api_key, window),
+        chunk_rows=chunk_rows,
+        max_in_flight=max_in_flight,
+        total_rows=total_rows,
+    )
 
 def main() -> int:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Exporte l'onglet AllVideos vers data/videos.json")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Lignes lues par requête")
+    parser.add_argument(
+        "--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT, help="Requêtes de lecture simultanées"
+    )
+    parser.add_argument("--profile", action="store_true", help="Profile l'export (cProfile et tracemalloc)")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help="Dossier des profils")
+    args = parser.parse_args()
     raw_spreadsheet_id = os.environ.get("SPREADSHEET_ID", "")
     api_key = os.environ.get("YOUTUBE_API_KEY", "")
 
@@ -104,17 +165,30 @@ def main() -> int:
         return 1
     # Récupère toutes les données de l'onglet AllVideos (en-têtes + lignes)
     range_all = "AllVideos!A1:P"
-    values = fetch_sheet_values(spreadsheet_id, api_key, range_all)
-    if not values:
-        logging.warning("Aucune donnée récupérée depuis la feuille.\n")
+    row_count = 0
+
+    def counted(rows):
+        nonlocal row_count
+        for row in rows:
+            row_count += 1
+            yield row
+
     # Chemin du fichier de sortie
-    data_dir = pathlib.Path("data")
-    data_dir.mkdir(parents=True, exist_ok=True)
-    json_path = data_dir / "videos.json"
+    json_path = pathlib.Path("data") / "videos.json"
     try:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(values, f, ensure_ascii=False, indent=2)
-        logging.info("Données écrites dans %s", json_path)
+        with profile_stages(args.profile_dir if args.profile else None):
+            # Lecture et écriture entrelacées : une seule étape
+            metrics.stage("export_json")
+            # Lignes écrites au fil de la lecture ; l'écriture atomique laisse
+            # l'ancien fichier intact si une fenêtre échoue et ignore un contenu identique
+            rows = iter_sheet_values(spreadsheet_id, api_key, range_all, args.chunk_rows, args.max_in_flight)
+            changed = write_json_rows(str(json_path), counted(rows), indent=2)
+        if changed:
+            logging.info("Données écrites dans %s (%s lignes)", json_path, row_count)
+        else:
+            logging.info("Fichier inchangé : %s", json_path)
+        if not row_count:
+            logging.warning("Aucune donnée récupérée depuis la feuille.\n")
     except Exception as e:
         logging.error("Erreur lors de l'écriture du fichier %s: %s", json_path, e)
         return 1
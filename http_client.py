@@ -0,0 +1,137 @@
+"""
+Client HTTP partagé pour les appels REST aux API YouTube et Google Sheets.
+
+Toutes les requêtes passent par une unique `requests.Session` dont les
+connexions (keep‑alive) sont réutilisées d'un appel à l'autre, avec une taille
+de pool, une limite de connexions par hôte et un délai d'expiration communs.
+La configuration se fait via les variables d'environnement suivantes :
+
+    - HTTP_TIMEOUT : délai d'expiration en secondes (10 par défaut)
+    - HTTP_POOL_SIZE : nombre d'hôtes dont le pool est conservé (10 par défaut)
+    - HTTP_MAX_PER_HOST : connexions simultanées maximales par hôte (10 par défaut)
+    - HTTP_KEEP_ALIVE : "0" pour fermer la connexion après chaque requête
+    - YOUTUBE_API_URL : adresse de l'API YouTube Data
+      (https://www.googleapis.com/youtube/v3 par défaut)
+    - SHEETS_API_URL : adresse de l'API Google Sheets
+      (https://sheets.googleapis.com par défaut)
+
+Les deux adresses permettent de viser un serveur local, par exemple
+`benchmarks/fake_google_api.py`.
+
+Chaque appel est mesuré par `run_metrics` (durée, statut, octets reçus)
+lorsque la collecte est active.
+
+Les tests remplacent la session par un faux client via `set_session`.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from run_metrics import metrics
+
+DEFAULT_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "10"))
+DEFAULT_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "10"))
+DEFAULT_MAX_PER_HOST = int(os.environ.get("HTTP_MAX_PER_HOST", "10"))
+DEFAULT_KEEP_ALIVE = os.environ.get("HTTP_KEEP_ALIVE", "1") != "0"
+
+DEFAULT_YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+DEFAULT_SHEETS_API_URL = "https://sheets.googleapis.com"
+YOUTUBE_API_URL = os.environ.get("YOUTUBE_API_URL", DEFAULT_YOUTUBE_API_URL).rstrip("/")
+SHEETS_API_URL = os.environ.get("SHEETS_API_URL", DEFAULT_SHEETS_API_URL).rstrip("/")
+
+_session = None
+_lock = threading.Lock()
+
+
+def create_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    keep_alive: bool = DEFAULT_KEEP_ALIVE,
+) -> requests.Session:
+    """
+    Crée une session avec un pool de connexions borné : au plus `max_per_host`
+    connexions par hôte (les requêtes supplémentaires attendent qu'une
+    connexion se libère) et `pool_size` hôtes conservés.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=max_per_host, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_session():
+    """Retourne la session partagée (créée au premier appel)."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def set_session(session):
+    """Remplace la session partagée (tests, configuration) et renvoie l'ancienne."""
+    global _session
+    with _lock:
+        previous, _session = _session, session
+    return previous
+
+
+def endpoint_of(url: str) -> tuple[str, str]:
+    """(API, point d'accès) d'une URL, pour les mesures : ("youtube", "videos"), ("sheets", "values.get")…"""
+    path = urlparse(url).path
+    if url.startswith(YOUTUBE_API_URL):
+        return "youtube", path.rstrip("/").rsplit("/", 1)[-1]
+    if url.startswith(SHEETS_API_URL):
+        return "sheets", "values.get" if "/values/" in path else "get"
+    return "other", urlparse(url).netloc
+
+
+def get(url: str, params: dict | None = None, headers: dict | None = None, timeout: float | None = None):
+    """Effectue un GET via la session partagée avec le délai d'expiration par défaut."""
+    if not metrics.enabled:
+        return get_session().get(
+            url, params=params, headers=headers, timeout=DEFAULT_TIMEOUT if timeout is None else timeout
+        )
+    start = time.perf_counter()
+    status: int | str = "error"
+    size = 0
+    try:
+        response = get_session().get(
+            url, params=params, headers=headers, timeout=DEFAULT_TIMEOUT if timeout is None else timeout
+        )
+        status = getattr(response, "status_code", "error")
+        size = len(getattr(response, "content", b"") or b"")
+        return response
+    finally:
+        api, endpoint = endpoint_of(url)
+        metrics.record_http(api, endpoint, status, size, time.perf_counter() - start)
+
+
+def youtube_url(endpoint: str) -> str:
+    """URL d'un point d'accès de l'API YouTube Data (`playlistItems`, `videos`…)."""
+    return f"{YOUTUBE_API_URL}/{endpoint}"
+
+
+def sheets_url(path: str) -> str:
+    """URL d'un chemin de l'API Google Sheets (`v4/spreadsheets/…`)."""
+    return f"{SHEETS_API_URL}/{path}"
+
+
+def sheets_client_options() -> dict | None:
+    """
+    `client_options` de `googleapiclient.discovery.build("sheets", "v4")` :
+    None pour l'adresse par défaut, sinon l'adresse de `SHEETS_API_URL`.
+    """
+    if SHEETS_API_URL == DEFAULT_SHEETS_API_URL:
+        return None
+    return {"api_endpoint": f"{SHEETS_API_URL}/"}
@@ -3,13 +3,40 @@ import re
 import time
 import logging
 import json
-from datetime import datetime
+import sqlite3
+from datetime import datetime, timezone
 import argparse
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
 
-import requests
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 
+import http_client
+from dataset_writer import write_if_changed, write_json_rows
+from profiling import PROFILE_DIR, profile_stages
+from public_data import (
+    DURATION_TABS,
+    PUBLIC_DATA_DIR,
+    get_duration_category,
+    iter_merged_rows,
+    iter_public_rows,
+    write_public_data,
+)
+from row_transform import DEFAULT_THUMBNAIL_URL, ISO_DURATION_RE, format_published_at, transform_videos
+from run_metrics import metrics, write_report, write_textfile
+from state_store import STATE_DB_PATH, StateStore, read_json
+from sync_checkpoint import (
+    CHECKPOINT_PATH,
+    DEFAULT_CHECKPOINT_TTL_HOURS,
+    SyncCheckpoint,
+    checkpoint_key,
+    remove_checkpoint,
+    rows_digest,
+)
+
 """
 Ce module fournit une fonction permettant de synchroniser une playlist YouTube
 vers un classeur Google Sheets. Les vidéos sont regroupées par tranche de
@@ -43,9 +70,21 @@ HEADERS = [
     "playlistId",
 ]
 
+# Index des colonnes servant de clé de ligne et dernière colonne (notation A1)
+_LINK_INDEX = HEADERS.index("link")
+_PLAYLIST_ID_INDEX = HEADERS.index("playlistId")
+_LAST_COLUMN = chr(ord("A") + len(HEADERS) - 1)
+
 # Valeurs par défaut pour les miniatures et avatars en cas d’absence de données
 DEFAULT_AVATAR_URL = "https://via.placeholder.com/48"
-DEFAULT_THUMBNAIL_URL = "https://via.placeholder.com/480x360?text=No+Thumbnail"
+
+# Nombre de playlists paginées simultanément par défaut
+DEFAULT_PLAYLIST_WORKERS = 4
+
+# Nombre maximal d’IDs par requête `videos.list` / `channels.list` et nombre
+# de lots `videos.list` en vol pendant la pagination
+YOUTUBE_BATCH_SIZE = 50
+DEFAULT_DETAIL_WORKERS = 4
 
 # Expressions régulières pour extraire l’ID du classeur et celui de la playlist
 _SPREADSHEET_RE = re.compile(r"/spreadsheets/d/([A-Za-z0-9-_]{25,60})")
@@ -87,8 +126,7 @@ def parse_playlist_ids(value: str) -> list[str]:
 
 def parse_duration(iso_duration: str) -> str:
     """Convertit une durée ISO 8601 (ex. 'PT5M20S') en format 'HH:MM:SS'."""
-    pattern = re.compile(r"^PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?$")
-    match = pattern.match(iso_duration or "")
+    match = ISO_DURATION_RE.match(iso_duration or "")
     if not match:
         return "Inconnue"
     h = int(match.group(1)) if match.group(1) else 0
@@ -97,56 +135,115 @@ def parse_duration(iso_duration: str) -> str:
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 
-def get_duration_category(duration: str) -> str:
-    """Classe la durée en catégories (0‑5 min, 5‑10 min, etc.)."""
-    parts = (duration or "").split(":")
-    if len(parts) != 3:
-        return "Inconnue"
-    try:
-        h = int(parts[0])
-        m = int(parts[1])
-        s = int(parts[2])
-    except ValueError:
-        return "Inconnue"
-    total_seconds = h * 3600 + m * 60 + s
-    if total_seconds <= 300:
-        return "0-5min"
-    elif total_seconds <= 600:
-        return "5-10min"
-    elif total_seconds <= 1200:
-        return "10-20min"
-    elif total_seconds <= 1800:
-        return "20-30min"
-    elif total_seconds <= 2400:
-        return "30-40min"
-    elif total_seconds <= 3000:
-        return "40-50min"
-    elif total_seconds <= 3600:
-        return "50-60min"
-    else:
-        return "60Plusmin"
+# Points d’accès de l’API YouTube Data (adresse de base : `http_client.YOUTUBE_API_URL`)
+PLAYLIST_ITEMS_ENDPOINT = "playlistItems"
 
+# Nouveaux parcours d’une playlist tentés après un jeton de page invalide
+MAX_PAGINATION_RECOVERIES = 3
 
-def get_sheet_id(spreadsheet_id: str, sheet_title: str, service) -> int | None:
-    """Retourne l’ID de feuille correspondant au titre dans un Google Sheet."""
-    spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    for sheet in spreadsheet.get("sheets", []):
-        if sheet["properties"]["title"] == sheet_title:
-            return sheet["properties"]["sheetId"]
-    return None
+# Mode incrémental : nombre d’items connus consécutifs (positions cohérentes)
+# à observer avant d’arrêter la pagination (état conservé dans `STATE_DB_PATH`)
+INCREMENTAL_KNOWN_RUN = 20
+
+# Cache local des réponses YouTube (ETag + corps) pour les requêtes conditionnelles
+RESPONSE_CACHE_PATH = os.path.join("data", "youtube_cache.json")
+
+# Rapport de mesures de chaque exécution (voir `run_metrics`)
+RUN_REPORT_PATH = os.path.join("data", "run_report.json")
+
+
+class ResponseCache:
+    """
+    Cache des réponses JSON de l’API YouTube indexé par requête (URL + paramètres
+    hors clé API). Chaque entrée conserve l’ETag et le corps : les exécutions
+    suivantes envoient `If-None-Match` et réutilisent le corps sur un 304.
+
+    Le cache est inactif tant que `load` n’a pas été appelé. Seules les
+    entrées utilisées pendant l’exécution sont conservées par `save`.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, dict] = {}
+        self._used: set[str] = set()
+        self._lock = threading.Lock()
 
+    @staticmethod
+    def key_for(url: str, params: dict) -> str:
+        query = "&".join(f"{name}={params[name]}" for name in sorted(params) if name != "key")
+        return f"{url}?{query}"
 
-def ensure_sheet_exists(service, spreadsheet_id: str, sheet_name: str) -> int:
-    """Vérifie l’existence de l’onglet et le crée au besoin. Retourne le sheetId."""
-    sheet_id = get_sheet_id(spreadsheet_id, sheet_name, service)
-    if sheet_id is not None:
-        return sheet_id
-    requests_body = {"requests": [{"addSheet": {"properties": {"title": sheet_name}}}]}
-    service.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body=requests_body).execute()
-    sheet_id = get_sheet_id(spreadsheet_id, sheet_name, service)
-    if sheet_id is None:
-        raise RuntimeError(f"Impossible de créer l’onglet '{sheet_name}'.")
-    return sheet_id
+    def load(self, path: str) -> None:
+        entries = read_json(path, {})
+        with self._lock:
+            self._entries = entries
+            self._used = set()
+            self.hits = self.misses = 0
+            self.enabled = True
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            entries = {key: value for key, value in self._entries.items() if key in self._used}
+        write_if_changed(path, [json.dumps(entries, ensure_ascii=False, separators=(",", ":"))])
+
+    def close(self) -> None:
+        with self._lock:
+            self.enabled = False
+            self._entries = {}
+            self._used = set()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            if not self.enabled:
+                return None
+            entry = self._entries.get(key)
+            return entry if entry and entry.get("etag") else None
+
+    def store(self, key: str, etag: str | None, body: dict) -> None:
+        with self._lock:
+            if not self.enabled:
+                return
+            self._used.add(key)
+            if etag:
+                self._entries[key] = {"etag": etag, "body": body}
+            else:
+                self._entries.pop(key, None)
+
+    def record_hit(self, key: str) -> None:
+        with self._lock:
+            self._used.add(key)
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+
+response_cache = ResponseCache()
+
+
+def fetch_youtube_json(url: str, params: dict) -> dict:
+    """
+    Effectue une requête GET sur l’API YouTube et renvoie le JSON décodé.
+    Si une réponse est en cache, la requête est conditionnelle (`If-None-Match`)
+    et un 304 renvoie le corps mis en cache. Lève les erreurs HTTP comme
+    `raise_for_status`.
+    """
+    key = ResponseCache.key_for(url, params)
+    cached = response_cache.get(key)
+    headers = {"If-None-Match": cached["etag"]} if cached is not None else None
+    resp = http_client.get(url, params=params, headers=headers)
+    if cached is not None and resp.status_code == 304:
+        response_cache.record_hit(key)
+        return cached["body"]
+    resp.raise_for_status()
+    data = resp.json()
+    if response_cache.enabled:
+        response_cache.record_miss()
+        response_cache.store(key, resp.headers.get("ETag") or data.get("etag"), data)
+    return data
 
 
 def load_cached_playlist_items(source_id: str, cache_path: str = "data/videos.json") -> list[dict]:
@@ -186,16 +283,245 @@ def load_cached_playlist_items(source_id: str, cache_path: str = "data/videos.js
     return sorted(cached_items, key=lambda item: item["snippet"]["position"])
 
 
+def _known_playlist_items(source_id: str, cache_path: str, store: StateStore | None) -> list[dict]:
+    """Items connus d’une playlist : magasin d’état s’il est fourni, sinon dernier export JSON."""
+    if store is not None:
+        return store.playlist_items(source_id)
+    return load_cached_playlist_items(source_id, cache_path)
+
+
+def _video_id(item: dict) -> str | None:
+    return item.get("contentDetails", {}).get("videoId")
+
+
+def _item_key(item: dict) -> str | None:
+    """Identifiant d’un item de playlist (id de l’item, à défaut de la vidéo)."""
+    return item.get("id") or _video_id(item)
+
+
+def _item_position(item: dict, default: int) -> int:
+    position = item.get("snippet", {}).get("position")
+    return position if isinstance(position, int) else default
+
+
+def _fetch_playlist_page(params: dict, max_retries: int) -> dict:
+    """Récupère une page de playlistItems ; un jeton invalide (400/404) lève immédiatement."""
+    backoff = 1
+    for attempt in range(max_retries):
+        try:
+            return fetch_youtube_json(http_client.youtube_url(PLAYLIST_ITEMS_ENDPOINT), params)
+        except Exception as err:
+            status_code = getattr(getattr(err, "response", None), "status_code", None)
+            if status_code in {400, 404} or attempt == max_retries - 1:
+                raise
+            logging.warning("Erreur API YouTube (playlistItems): %s", err)
+            metrics.increment("retries", endpoint="playlistItems")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+    raise RuntimeError("Échec de récupération des items de la playlist")
+
+
+def fetch_playlist_delta(
+    source_id: str,
+    api_key: str,
+    previous: dict,
+    snapshot: list[dict],
+    max_retries: int = 5,
+    known_run: int = INCREMENTAL_KNOWN_RUN,
+    on_page: Callable[[list[dict]], None] | None = None,
+) -> tuple[list[dict], dict] | None:
+    """
+    Récupère une playlist en s’appuyant sur les items connus (`snapshot`, lus
+    depuis le magasin d’état ou le dernier export) et sur l’état de la
+    pagination précédente (`previous` : total d’items, jeton et position de
+    la dernière page).
+
+    - Ajouts en tête : la pagination s’arrête dès que `known_run` items connus
+      consécutifs sont observés avec un décalage constant égal au nombre de
+      nouveautés ; le milieu est repris du snapshot.
+    - Ajouts en fin : la première page est vérifiée puis la pagination reprend
+      directement au jeton de la dernière page connue.
+
+    Dans les deux cas, les pages à partir du jeton de la dernière page connue
+    sont relues et vérifiées (décalage constant), ce qui détecte aussi une
+    suppression compensée par un ajout en fin de playlist.
+
+    Renvoie (items, nouvel état) ou None si un réordonnancement, une
+    suppression, une incohérence ou une erreur est détecté : un parcours
+    complet est alors nécessaire.
+    """
+    old_positions = {_video_id(item): item["snippet"]["position"] for item in snapshot}
+    old_by_position = {position: video_id for video_id, position in old_positions.items()}
+    previous_total = previous.get("total")
+    if not old_positions or len(old_positions) != len(snapshot) or not isinstance(previous_total, int):
+        return None
+    page_size = previous.get("pageSize") or 50
+    params = {"part": "snippet,contentDetails", "playlistId": source_id, "maxResults": page_size, "key": api_key}
+    fetched: list[dict] = []
+    shift: int | None = None
+    run = 0
+    total: int | None = None
+    last_page = {"token": None, "start": 0}
+
+    def walk(stop_when_known: bool, expected_shift: int | None) -> bool:
+        """Pagine depuis `params` en vérifiant chaque item ; renvoie False en cas d’incohérence."""
+        nonlocal shift, run, total
+        while True:
+            data = _fetch_playlist_page(params, max_retries)
+            if total is None:
+                total = data.get("pageInfo", {}).get("totalResults")
+            page = data.get("items", [])
+            if page:
+                last_page["token"] = params.get("pageToken")
+                last_page["start"] = page[0].get("snippet", {}).get("position", len(fetched))
+            for item in page:
+                position = item.get("snippet", {}).get("position", len(fetched))
+                old_position = old_positions.get(_video_id(item))
+                if old_position is not None:
+                    if shift is None:
+                        shift = position - old_position
+                    if position - old_position != shift or (expected_shift is not None and shift != expected_shift):
+                        return False
+                    run += 1
+                elif shift is not None and old_by_position.get(position - shift) is not None:
+                    # Un item connu a été remplacé ou un item inséré au milieu
+                    return False
+                fetched.append(item)
+            if on_page is not None and page:
+                on_page(page)
+            next_page_token = data.get("nextPageToken")
+            if not next_page_token:
+                params.pop("pageToken", None)
+                return True
+            params["pageToken"] = next_page_token
+            if stop_when_known and shift is not None and run >= known_run:
+                return True
+
+    try:
+        if not walk(stop_when_known=True, expected_shift=None):
+            return None
+        reached_end = "pageToken" not in params
+        if shift is None or total is None:
+            return None if not reached_end else (fetched, _playlist_state(fetched, total, page_size, last_page))
+        # Les items nouveaux en tête doivent précéder le premier item connu
+        for item in fetched:
+            position = item.get("snippet", {}).get("position", 0)
+            if _video_id(item) not in old_positions and position >= shift and (position - shift) in old_by_position:
+                return None
+        if reached_end:
+            return fetched, _playlist_state(fetched, total, page_size, last_page)
+        tail_additions = total - (previous_total + shift)
+        last_fetched = fetched[-1].get("snippet", {}).get("position", len(fetched) - 1)
+        if tail_additions < 0 or (tail_additions > 0 and shift != 0):
+            return None
+        # Fin de la playlist relue depuis le jeton de la dernière page connue et
+        # vérifiée item par item : ajouts en fin, mais aussi suppression au milieu
+        # compensée par un ajout en fin (total inchangé, positions décalées)
+        tail_token = previous.get("tailToken")
+        tail_start = previous.get("tailStart")
+        middle: list[dict] = []
+        if tail_token and isinstance(tail_start, int) and tail_start > last_fetched + 1:
+            middle = [
+                {**item, "snippet": {**item["snippet"], "position": item["snippet"]["position"] + shift}}
+                for item in snapshot
+                if last_fetched < item["snippet"]["position"] + shift < tail_start
+            ]
+            if on_page is not None and middle:
+                on_page(middle)
+            params["pageToken"] = tail_token
+            tail_begin = len(fetched)
+            if not walk(stop_when_known=False, expected_shift=shift):
+                return None
+            if not fetched[tail_begin:] or fetched[tail_begin].get("snippet", {}).get("position") != tail_start:
+                return None
+            fetched[tail_begin:tail_begin] = middle
+        elif not walk(stop_when_known=False, expected_shift=shift):
+            return None
+    except Exception as err:
+        logging.warning("Récupération incrémentale impossible pour la playlist %s : %s", source_id, err)
+        return None
+    return fetched, _playlist_state(fetched, total, page_size, last_page)
+
+
+def _playlist_state(items: list[dict], total: int | None, page_size: int, last_page: dict) -> dict:
+    """État de pagination mémorisé pour le prochain parcours incrémental."""
+    return {
+        "total": total if isinstance(total, int) else len(items),
+        "pageSize": page_size,
+        "tailToken": last_page["token"],
+        "tailStart": last_page["start"],
+    }
+
+
 def fetch_all_playlist_items(
-    source_id: str, api_key: str, max_retries: int = 5, cache_path: str = "data/videos.json"
+    source_id: str,
+    api_key: str,
+    max_retries: int = 5,
+    cache_path: str = "data/videos.json",
+    on_page: Callable[[list[dict]], None] | None = None,
+    playlist_state: dict | None = None,
+    store: StateStore | None = None,
+    checkpoint: SyncCheckpoint | None = None,
 ) -> list[dict]:
     """
     Récupère tous les items d’une playlist YouTube en gérant la pagination,
     avec gestion d’erreurs réseau et backoff exponentiel.
 
+    `on_page` est appelé avec les nouveaux items de chaque page dès sa réception,
+    ce qui permet de lancer les traitements suivants sans attendre la fin de
+    la pagination.
+
+    Les items connus de la playlist sont lus dans `store` (magasin d’état
+    SQLite) s’il est fourni, sinon dans l’export `cache_path`. Si
+    `playlist_state` (état par playlist, mis à jour sur place) est fourni, un
+    parcours incrémental (`fetch_playlist_delta`) appuyé sur ces items est
+    tenté d’abord ; un parcours complet est effectué en cas d’échec.
+
+    Si un jeton de page devient invalide (400/404), la pagination reprend au
+    jeton de la page précédente, dernier jeton accepté par l’API (une seule
+    requête de plus) ; l’API ne permet pas d’aller directement à une position.
+    Si ce jeton est lui aussi refusé, ou si aucun n’est connu (reprise d’un
+    point de reprise), elle repart du début. Les items déjà reçus ne sont pas
+    oubliés : les pages dont les items correspondent (même position, même
+    identifiant) remplacent leurs copies sans être retraitées (ni
+    dédoublonnées, ni transmises à `on_page`), et le traitement normal reprend
+    au premier item inconnu. Si la playlist a changé entre‑temps, les items
+    reçus au‑delà du premier écart sont abandonnés ; le résultat est celui
+    d’un parcours complet. Au plus `MAX_PAGINATION_RECOVERIES` reprises sont
+    tentées.
+
+    Avec `checkpoint` (point de reprise d’une exécution interrompue), une
+    playlist déjà récupérée est reprise telle quelle et un parcours complet
+    interrompu repart de la dernière page enregistrée ; chaque page reçue y
+    est enregistrée.
+
     Lève RuntimeError si toutes les tentatives pour récupérer une page échouent.
     """
-    base_url = "https://www.googleapis.com/youtube/v3/playlistItems"
+    progress = None
+    if checkpoint is not None:
+        completed = checkpoint.completed_playlist(source_id)
+        if completed is not None:
+            items, state = completed
+            if playlist_state is not None and state is not None:
+                playlist_state[source_id] = state
+            if on_page is not None and items:
+                on_page(items)
+            logging.info("Playlist %s reprise du point de reprise (%s vidéos).", source_id, len(items))
+            return items
+        progress = checkpoint.playlist_progress(source_id)
+    if progress is None and playlist_state is not None and playlist_state.get(source_id):
+        snapshot = _known_playlist_items(source_id, cache_path, store)
+        delta = fetch_playlist_delta(
+            source_id, api_key, playlist_state[source_id], snapshot, max_retries, on_page=on_page
+        )
+        if delta is not None:
+            items, playlist_state[source_id] = delta
+            logging.info("Playlist %s récupérée en mode incrémental (%s vidéos).", source_id, len(items))
+            if checkpoint is not None:
+                checkpoint.complete_playlist(source_id, items, playlist_state[source_id])
+            return items
+        logging.info("Playlist %s : parcours complet (mode incrémental non applicable).", source_id)
+    base_url = http_client.youtube_url(PLAYLIST_ITEMS_ENDPOINT)
     params = {
         "part": "snippet,contentDetails",
         "playlistId": source_id,
@@ -205,42 +531,85 @@ def fetch_all_playlist_items(
     items: list[dict] = []
     seen_item_ids: set[str] = set()
     backoff = 1
-    page_sizes = [50, 25, 10, 5]
-    page_size_index = 0
+    recoveries = 0
+    # Jeton et index du premier item de chaque page reçue (reprise après un
+    # jeton invalide) ; `stepped_back` : la requête en cours est une reprise
+    # au jeton de la page précédente
+    pages: list[tuple[str | None, int]] = []
+    stepped_back = False
+    # Pendant un nouveau parcours après un jeton invalide : position → index
+    # des items déjà reçus, et nombre d’items vérifiés depuis le début
+    replay: dict[int, int] | None = None
+    verified = 0
+
+    def end_replay(page_token: str | None) -> None:
+        """Termine la vérification ; les items reçus au‑delà du dernier vérifié sont abandonnés."""
+        nonlocal replay, seen_item_ids
+        replay = None
+        if verified < len(items):
+            logging.warning(
+                "Playlist %s modifiée pendant la pagination : %s vidéo(s) reçue(s) à partir de la position %s "
+                "sont remplacées par le nouveau parcours.",
+                source_id,
+                len(items) - verified,
+                verified,
+            )
+            del items[verified:]
+            seen_item_ids = {item_id for item in items if (item_id := _item_key(item))}
+            if checkpoint is not None:
+                checkpoint.reset_playlist(source_id)
+                if items and page_token:
+                    checkpoint.save_page(source_id, list(items), page_token, params["maxResults"])
+        else:
+            logging.info(
+                "Playlist %s : %s vidéo(s) déjà reçue(s) vérifiée(s) sans retraitement.", source_id, verified
+            )
+
+    if progress is not None:
+        # Reprise d’un parcours interrompu : pages déjà reçues puis jeton suivant
+        items.extend(progress["items"])
+        seen_item_ids.update(item_id for item in items if (item_id := _item_key(item)))
+        params["maxResults"] = progress["pageSize"]
+        params["pageToken"] = progress["pageToken"]
+        if on_page is not None and items:
+            on_page(list(items))
+        logging.info("Playlist %s : pagination reprise après %s vidéos.", source_id, len(items))
     while True:
         data = None
         restart_pagination = False
         for attempt in range(max_retries):
             try:
-                resp = requests.get(base_url, params=params, timeout=10)
-                resp.raise_for_status()
-                data = resp.json()
+                data = fetch_youtube_json(base_url, params)
                 break
             except Exception as err:
                 logging.warning("Erreur API YouTube (playlistItems): %s", err)
                 status_code = getattr(getattr(err, "response", None), "status_code", None)
-                if (
-                    params.get("pageToken")
-                    and status_code in {400, 404}
-                    and page_size_index < len(page_sizes) - 1
-                ):
-                    page_size_index += 1
-                    params["maxResults"] = page_sizes[page_size_index]
+                if params.get("pageToken") and status_code in {400, 404} and recoveries < MAX_PAGINATION_RECOVERIES:
+                    recoveries += 1
+                    resume_token, resume_index = pages.pop() if pages and not stepped_back else (None, 0)
+                    if resume_token is None:
+                        pages.clear()
                     logging.warning(
-                        "Jeton de pagination YouTube devenu invalide; reprise depuis le début "
-                        "avec des pages de %s éléments.",
-                        params["maxResults"],
+                        "Jeton de pagination YouTube devenu invalide; reprise %s, "
+                        "les %s vidéo(s) déjà reçue(s) sont vérifiées sans être retraitées.",
+                        "à la page précédente" if resume_token else "depuis le début",
+                        len(items) - resume_index,
                     )
-                    params.pop("pageToken", None)
-                    items.clear()
-                    seen_item_ids.clear()
+                    if resume_token:
+                        params["pageToken"] = resume_token
+                    else:
+                        params.pop("pageToken", None)
+                    stepped_back = bool(resume_token)
+                    metrics.increment("pagination_restarts")
+                    replay = {_item_position(item, index): index for index, item in enumerate(items)}
+                    verified = resume_index
                     backoff = 1
                     restart_pagination = True
                     break
                 if attempt == max_retries - 1:
                     status_code = getattr(getattr(err, "response", None), "status_code", None)
                     if params.get("pageToken") and status_code in {400, 404}:
-                        cached_items = load_cached_playlist_items(source_id, cache_path)
+                        cached_items = _known_playlist_items(source_id, cache_path, store)
                         if cached_items:
                             fresh_ids = {
                                 item.get("contentDetails", {}).get("videoId") for item in items
@@ -263,30 +632,117 @@ def fetch_all_playlist_items(
                         max_retries,
                     )
                     raise RuntimeError("Échec de récupération des items de la playlist") from err
+                metrics.increment("retries", endpoint="playlistItems")
                 time.sleep(backoff)
                 backoff = min(backoff * 2, 60)
         if restart_pagination:
             continue
-        for item in data.get("items", []):
-            item_id = item.get("id") or item.get("contentDetails", {}).get("videoId")
+        page_token = params.get("pageToken")
+        page = data.get("items", [])
+        next_page_token = data.get("nextPageToken")
+        pages.append((page_token, verified if replay is not None else len(items)))
+        stepped_back = False
+        if replay is not None:
+            # Items déjà reçus : copie remplacée par la réponse, sans retraitement
+            matched = 0
+            for item in page:
+                index = replay.get(_item_position(item, verified))
+                if index != verified or _item_key(items[index]) != _item_key(item):
+                    break
+                items[index] = item
+                verified += 1
+                matched += 1
+            if matched < len(page) or verified == len(items) or not next_page_token:
+                end_replay(page_token)
+            page = page[matched:]
+        page_start = len(items)
+        for item in page:
+            item_id = _item_key(item)
             if item_id and item_id in seen_item_ids:
                 continue
             items.append(item)
             if item_id:
                 seen_item_ids.add(item_id)
-        next_page_token = data.get("nextPageToken")
+        if on_page is not None and len(items) > page_start:
+            on_page(items[page_start:])
         if not next_page_token:
+            if playlist_state is not None:
+                first = (data.get("items") or [{}])[0]
+                playlist_state[source_id] = _playlist_state(
+                    items,
+                    data.get("pageInfo", {}).get("totalResults"),
+                    params["maxResults"],
+                    {"token": page_token, "start": first.get("snippet", {}).get("position", page_start)},
+                )
             break
+        if checkpoint is not None and replay is None:
+            checkpoint.save_page(source_id, items[page_start:], next_page_token, params["maxResults"])
         params["pageToken"] = next_page_token
+    if checkpoint is not None:
+        checkpoint.complete_playlist(
+            source_id, items, playlist_state.get(source_id) if playlist_state is not None else None
+        )
     return items
 
 
+def fetch_playlists_items(
+    playlist_ids: list[str],
+    api_key: str,
+    max_workers: int = DEFAULT_PLAYLIST_WORKERS,
+    on_page: Callable[[list[dict]], None] | None = None,
+    playlist_state: dict | None = None,
+    store: StateStore | None = None,
+    checkpoint: SyncCheckpoint | None = None,
+) -> list[tuple[str, list[dict]]]:
+    """
+    Pagine plusieurs playlists en parallèle (au plus `max_workers` à la fois)
+    et renvoie les couples (playlist, items) dans l’ordre des identifiants fournis.
+    `on_page` (appelé depuis les threads), `playlist_state`, `store` et
+    `checkpoint` sont transmis à `fetch_all_playlist_items`.
+
+    Lève RuntimeError dès qu’une playlist (dans l’ordre) ne peut être récupérée ;
+    les paginations encore en attente sont alors annulées.
+    """
+    workers = max(1, min(max_workers, len(playlist_ids)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            (
+                playlist_id,
+                executor.submit(
+                    fetch_all_playlist_items,
+                    playlist_id,
+                    api_key,
+                    on_page=on_page,
+                    playlist_state=playlist_state,
+                    store=store,
+                    checkpoint=checkpoint,
+                ),
+            )
+            for playlist_id in playlist_ids
+        ]
+        results: list[tuple[str, list[dict]]] = []
+        for playlist_id, future in futures:
+            try:
+                results.append((playlist_id, future.result()))
+            except RuntimeError:
+                logging.error("Impossible de récupérer les vidéos de la playlist %s", playlist_id)
+                for _, pending in futures:
+                    pending.cancel()
+                raise
+    return results
+
+
 def fetch_videos_details(video_ids: list[str], api_key: str, max_retries: int = 5) -> dict[str, dict]:
-    """Récupère les détails de plusieurs vidéos en une seule requête API."""
-    base_url = "https://www.googleapis.com/youtube/v3/videos"
+    """
+    Récupère les détails de plusieurs vidéos par lots de 50. Les IDs sont triés
+    avant d’être découpés : un même ensemble d’IDs donne toujours les mêmes
+    requêtes, et donc les mêmes entrées du cache des réponses (ETag).
+    """
+    base_url = http_client.youtube_url("videos")
     details: dict[str, dict] = {}
-    for i in range(0, len(video_ids), 50):
-        batch = video_ids[i : i + 50]
+    video_ids = sorted(dict.fromkeys(video_ids))
+    for i in range(0, len(video_ids), YOUTUBE_BATCH_SIZE):
+        batch = video_ids[i : i + YOUTUBE_BATCH_SIZE]
         params = {
             "part": "snippet,contentDetails,statistics",
             "id": ",".join(batch),
@@ -296,9 +752,7 @@ def fetch_videos_details(video_ids: list[str], api_key: str, max_retries: int =
         data: dict[str, dict] = {}
         for attempt in range(max_retries):
             try:
-                resp = requests.get(base_url, params=params, timeout=10)
-                resp.raise_for_status()
-                data = resp.json()
+                data = fetch_youtube_json(base_url, params)
                 break
             except Exception as err:
                 logging.warning("Erreur API YouTube (videos): %s", err)
@@ -306,6 +760,7 @@ def fetch_videos_details(video_ids: list[str], api_key: str, max_retries: int =
                     # Si toutes les tentatives échouent pour ce batch, passe au suivant
                     data = {}
                     break
+                metrics.increment("retries", endpoint="videos")
                 time.sleep(backoff)
                 backoff = min(backoff * 2, 60)
         for item in data.get("items", []):
@@ -313,6 +768,177 @@ def fetch_videos_details(video_ids: list[str], api_key: str, max_retries: int =
     return details
 
 
+class VideoDetailsPipeline:
+    """
+    Récupère les détails des vidéos au fil de la pagination : chaque lot de 50
+    nouveaux IDs est envoyé à `videos.list` dès qu’il est complet, pendant que
+    les pages suivantes de `playlistItems` sont encore en cours.
+
+    `add_items` peut être utilisé comme callback `on_page` (thread‑safe) ;
+    `collect` complète les IDs restants et renvoie le même dictionnaire que
+    `fetch_videos_details` sur la liste dédupliquée.
+
+    Les lots sont formés playlist par playlist, dans l’ordre des pages, et non
+    dans l’ordre d’arrivée des pages des différents threads : d’une exécution
+    à l’autre, une playlist inchangée produit les mêmes lots, dont les réponses
+    peuvent alors être revalidées par ETag. Les restes partiels sont réunis et
+    triés par `collect`.
+
+    Les IDs de `deferred` (vidéos déjà connues) ne sont demandés que s’ils
+    sont ajoutés explicitement avec `force=True`.
+
+    Avec `checkpoint`, les détails reçus lors d’une exécution interrompue ne
+    sont pas redemandés et chaque lot terminé y est enregistré.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        executor: ThreadPoolExecutor,
+        batch_size: int = YOUTUBE_BATCH_SIZE,
+        deferred: set[str] | None = None,
+        checkpoint: SyncCheckpoint | None = None,
+    ):
+        self._api_key = api_key
+        self._executor = executor
+        self._batch_size = batch_size
+        self._deferred = deferred or set()
+        self._checkpoint = checkpoint
+        self._resumed = checkpoint.details() if checkpoint is not None else {}
+        self._lock = threading.Lock()
+        self._requested: set[str] = set(self._resumed)
+        # IDs en attente par playlist ("" : IDs ajoutés directement)
+        self._pending: dict[str, list[str]] = {}
+        self._futures: list[Future] = []
+
+    @property
+    def requested_count(self) -> int:
+        with self._lock:
+            return len(self._requested)
+
+    def add_items(self, items: list[dict]) -> None:
+        """Ajoute les vidéos d’une page et envoie les lots complets."""
+        by_playlist: dict[str, list[str]] = {}
+        for item in items:
+            by_playlist.setdefault(item.get("snippet", {}).get("playlistId", ""), []).append(_video_id(item))
+        for playlist_id, video_ids in by_playlist.items():
+            self.add_video_ids(video_ids, playlist_id=playlist_id)
+
+    def add_video_ids(self, video_ids: list[str], force: bool = False, playlist_id: str = "") -> None:
+        with self._lock:
+            pending = self._pending.setdefault(playlist_id, [])
+            for video_id in video_ids:
+                if video_id and video_id not in self._requested and (force or video_id not in self._deferred):
+                    self._requested.add(video_id)
+                    pending.append(video_id)
+            while len(pending) >= self._batch_size:
+                self._submit(pending[: self._batch_size])
+                del pending[: self._batch_size]
+
+    def _submit(self, batch: list[str]) -> None:
+        self._futures.append(self._executor.submit(self._fetch_batch, batch))
+
+    def _fetch_batch(self, batch: list[str]) -> dict[str, dict]:
+        details = fetch_videos_details(batch, self._api_key)
+        if self._checkpoint is not None:
+            try:
+                self._checkpoint.save_details(details)
+            except sqlite3.Error as e:
+                # Le point de reprise est facultatif : les détails restent utilisables
+                logging.warning("Point de reprise non enregistré pour %d vidéos : %s", len(details), e)
+        return details
+
+    def collect(self, video_ids: list[str]) -> dict[str, dict]:
+        """Envoie le dernier lot partiel, attend tous les lots et fusionne les résultats."""
+        self.add_video_ids(video_ids)
+        with self._lock:
+            rest = sorted(video_id for pending in self._pending.values() for video_id in pending)
+            self._pending.clear()
+            for start in range(0, len(rest), self._batch_size):
+                self._submit(rest[start : start + self._batch_size])
+            futures = list(self._futures)
+        details = {video_id: self._resumed[video_id] for video_id in video_ids if video_id in self._resumed}
+        for future in futures:
+            details.update(future.result())
+        return details
+
+
+# Paliers de fraîcheur des statistiques : (âge maximal de la vidéo, intervalle de
+# rafraîchissement), en secondes. Une heure le premier jour, un jour le premier
+# mois, une semaine ensuite.
+REFRESH_TIERS: list[tuple[float | None, float]] = [
+    (86400, 3600),
+    (30 * 86400, 86400),
+    (None, 7 * 86400),
+]
+_DETAIL_SNIPPET_FIELDS = (
+    "title",
+    "channelTitle",
+    "channelId",
+    "publishedAt",
+    "description",
+    "tags",
+    "categoryId",
+    "thumbnails",
+)
+
+
+def refresh_interval(published_at: str, now: float) -> float:
+    """Intervalle de rafraîchissement d’une vidéo selon l’âge de sa publication (ISO 8601)."""
+    try:
+        published = datetime.strptime(published_at or "", "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        age = now - published.timestamp()
+    except ValueError:
+        age = float("inf")
+    for max_age, interval in REFRESH_TIERS:
+        if max_age is None or age <= max_age:
+            return interval
+    return REFRESH_TIERS[-1][1]
+
+
+def plan_refresh(
+    video_ids: list[str], state: dict[str, dict], now: float, max_refreshes: int | None = None
+) -> list[str]:
+    """
+    Sélectionne les vidéos connues dont les statistiques doivent être
+    rafraîchies : celles dont le dernier rafraîchissement dépasse l’intervalle
+    de leur palier, triées par retard relatif décroissant (à retard égal, les
+    plus récentes d’abord) et limitées à `max_refreshes` si fourni.
+    """
+    due: list[tuple[float, float, str]] = []
+    for video_id in video_ids:
+        entry = state.get(video_id)
+        if not entry:
+            continue
+        interval = refresh_interval(entry["detail"].get("snippet", {}).get("publishedAt", ""), now)
+        overdue = (now - float(entry.get("refreshedAt", 0))) / interval
+        if overdue >= 1:
+            due.append((-overdue, interval, video_id))
+    due.sort()
+    selected = [video_id for _, _, video_id in due]
+    return selected if max_refreshes is None else selected[: max(0, max_refreshes)]
+
+
+def compact_video_detail(info: dict) -> dict:
+    """Réduit un item `videos.list` aux champs utilisés pour construire les lignes."""
+    snippet = {
+        key: value
+        for key, value in info.get("snippet", {}).items()
+        if key in _DETAIL_SNIPPET_FIELDS
+    }
+    if "description" in snippet:
+        snippet["description"] = (snippet["description"] or "")[:50]
+    content_details = {
+        key: value for key, value in info.get("contentDetails", {}).items() if key == "duration"
+    }
+    return {
+        "id": info.get("id"),
+        "snippet": snippet,
+        "contentDetails": content_details,
+        "statistics": info.get("statistics", {}),
+    }
+
+
 def get_thumbnail_url(video_data: dict) -> str:
     """Extrait l’URL de miniature la plus grande disponible."""
     thumb_info = video_data.get("snippet", {}).get("thumbnails", {})
@@ -322,41 +948,67 @@ def get_thumbnail_url(video_data: dict) -> str:
     return DEFAULT_THUMBNAIL_URL
 
 
-def format_published_at(iso_timestamp: str) -> str:
-    """
-    Formate l’horodatage ISO d'une vidéo YouTube en heure locale sans appliquer
-    de conversion de fuseau horaire. La valeur renvoyée est une chaîne au
-    format `dd/mm/YYYY HH:MM` précédée d'une apostrophe. Si l'horodatage n'est
-    pas conforme au format ISO attendu, la fonction renvoie une chaîne vide.
+# Cache d’avatars de chaîne (évite de refaire des requêtes)
+channel_avatar_cache: dict[str, str] = {}
+# Horodatage (epoch) des avatars obtenus avec succès : seuls ceux‑ci sont persistés
+channel_avatar_fetched_at: dict[str, float] = {}
 
-    Exemple :
+# Cache persistant des avatars entre deux exécutions
+AVATAR_CACHE_PATH = os.path.join("data", "channel_avatars.json")
+DEFAULT_AVATAR_TTL_DAYS = 30
+DEFAULT_AVATAR_CACHE_MAX_ENTRIES = 5000
 
-    >>> format_published_at("2025-01-07T13:45:00Z")
-    "'07/01/2025 13:45"
+
+def load_avatar_cache(
+    path: str = AVATAR_CACHE_PATH, ttl_days: float = DEFAULT_AVATAR_TTL_DAYS, now: float | None = None
+) -> int:
     """
-    try:
-        # La chaîne ISO fournie par l’API YouTube est toujours en UTC (suffixe 'Z').
-        dt = datetime.strptime(iso_timestamp or "", "%Y-%m-%dT%H:%M:%SZ")
-    except ValueError:
-        return ""
-    # Aucun ajustement de fuseau horaire : on formate simplement la date/heure UTC.
-    return f"'{dt.strftime('%d/%m/%Y %H:%M') }".strip()
+    Charge dans `channel_avatar_cache` les avatars persistés dont l’âge ne
+    dépasse pas `ttl_days`. Retourne le nombre d’entrées chargées.
+    """
+    entries = read_json(path, {})
+    now = time.time() if now is None else now
+    max_age = ttl_days * 86400
+    loaded = 0
+    for channel_id, entry in entries.items():
+        try:
+            url = str(entry["url"])
+            fetched_at = float(entry["fetchedAt"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if now - fetched_at > max_age:
+            continue
+        channel_avatar_cache[channel_id] = url
+        channel_avatar_fetched_at[channel_id] = fetched_at
+        loaded += 1
+    return loaded
 
 
-# Cache d’avatars de chaîne (évite de refaire des requêtes)
-channel_avatar_cache: dict[str, str] = {}
+def save_avatar_cache(path: str = AVATAR_CACHE_PATH, max_entries: int = DEFAULT_AVATAR_CACHE_MAX_ENTRIES) -> None:
+    """
+    Persiste les avatars obtenus avec succès (les valeurs par défaut dues à une
+    erreur réseau ne sont pas conservées). Au‑delà de `max_entries`, les
+    entrées les plus anciennes sont évincées.
+    """
+    newest = sorted(channel_avatar_fetched_at.items(), key=lambda entry: entry[1], reverse=True)[:max_entries]
+    entries = {
+        channel_id: {"url": channel_avatar_cache[channel_id], "fetchedAt": fetched_at}
+        for channel_id, fetched_at in sorted(newest)
+        if channel_id in channel_avatar_cache
+    }
+    write_if_changed(path, [json.dumps(entries, ensure_ascii=False, indent=0)])
 
 
 def get_channel_avatar(channel_id: str, api_key: str) -> str:
     """Retourne l'URL de l'avatar de chaîne (avec cache et gestion d’erreurs)."""
+    if not channel_id:
+        # Vidéo sans chaîne (supprimée ou privée) : aucune requête possible
+        return DEFAULT_AVATAR_URL
     if channel_id in channel_avatar_cache:
         return channel_avatar_cache[channel_id]
-    channel_url = (
-        "https://www.googleapis.com/youtube/v3/channels"
-        f"?part=snippet&id={channel_id}&key={api_key}"
-    )
+    channel_url = f"{http_client.youtube_url('channels')}?part=snippet&id={channel_id}&key={api_key}"
     try:
-        response = requests.get(channel_url, timeout=10)
+        response = http_client.get(channel_url)
         response.raise_for_status()
         data = response.json()
     except Exception as e:
@@ -364,56 +1016,364 @@ def get_channel_avatar(channel_id: str, api_key: str) -> str:
         data = {}
     avatar_url = DEFAULT_AVATAR_URL
     if data.get("items"):
-        thumbs = data["items"][0].get("snippet", {}).get("thumbnails", {})
-        avatar_url = thumbs.get("default", {}).get("url", DEFAULT_AVATAR_URL)
+        avatar_url = _avatar_from_channel(data["items"][0])
+        channel_avatar_fetched_at[channel_id] = time.time()
     channel_avatar_cache[channel_id] = avatar_url
     return avatar_url
 
 
+def _avatar_from_channel(item: dict) -> str:
+    thumbs = item.get("snippet", {}).get("thumbnails", {})
+    return thumbs.get("default", {}).get("url", DEFAULT_AVATAR_URL)
+
+
+def fetch_channel_avatars(channel_ids, api_key: str, max_retries: int = 5) -> dict[str, str]:
+    """
+    Résout les avatars de plusieurs chaînes par lots de 50 IDs (`channels.list`)
+    et remplit `channel_avatar_cache`. Les chaînes déjà en cache ne sont pas
+    redemandées ; celles absentes de la réponse reçoivent l’avatar par défaut.
+    """
+    base_url = http_client.youtube_url("channels")
+    requested = [cid for cid in dict.fromkeys(channel_ids) if cid]
+    missing = [cid for cid in requested if cid not in channel_avatar_cache]
+    metrics.record_cache("channel_avatars", len(requested) - len(missing), len(missing))
+    for i in range(0, len(missing), YOUTUBE_BATCH_SIZE):
+        batch = missing[i : i + YOUTUBE_BATCH_SIZE]
+        params = {
+            "part": "snippet",
+            "id": ",".join(batch),
+            "maxResults": YOUTUBE_BATCH_SIZE,
+            "key": api_key,
+        }
+        backoff = 1
+        data: dict | None = None
+        for attempt in range(max_retries):
+            try:
+                resp = http_client.get(base_url, params=params)
+                resp.raise_for_status()
+                data = resp.json()
+                break
+            except Exception as err:
+                logging.warning("Erreur API YouTube (channels): %s", err)
+                if attempt == max_retries - 1:
+                    logging.error("Impossible de récupérer les avatars de %s chaîne(s).", len(batch))
+                    break
+                metrics.increment("retries", endpoint="channels")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+        if data is not None:
+            # Réponse valide : les chaînes absentes (supprimées) gardent l’avatar par défaut
+            fetched_at = time.time()
+            for item in data.get("items", []):
+                channel_avatar_cache[item["id"]] = _avatar_from_channel(item)
+            for channel_id in batch:
+                channel_avatar_fetched_at[channel_id] = fetched_at
+        for channel_id in batch:
+            channel_avatar_cache.setdefault(channel_id, DEFAULT_AVATAR_URL)
+    return {cid: channel_avatar_cache[cid] for cid in dict.fromkeys(channel_ids) if cid in channel_avatar_cache}
+
+
 def add_video_to_categories(entry: list, duration_category: str, videos_by_category: dict[str, list], all_videos: list) -> None:
     """Ajoute une entrée vidéo à la catégorie correspondante et à la liste globale."""
     videos_by_category[duration_category].append(entry)
     all_videos.append(entry)
 
 
-def write_category(service, spreadsheet_id: str, sheet_name: str, rows: list[list]) -> None:
+def _normalize_row(row: list) -> list[str]:
+    """Convertit une ligne en chaînes et retire les cellules vides finales (omises par l'API)."""
+    normalized = ["" if value is None else str(value) for value in row]
+    while normalized and normalized[-1] == "":
+        normalized.pop()
+    return normalized
+
+
+def _row_key(row: list) -> tuple[str, str]:
+    """Clé d'identification d'une ligne : lien de la vidéo + playlist d'origine."""
+    link = row[_LINK_INDEX] if len(row) > _LINK_INDEX else ""
+    playlist = row[_PLAYLIST_ID_INDEX] if len(row) > _PLAYLIST_ID_INDEX else ""
+    return str(link), str(playlist)
+
+
+def _contiguous_runs(indices: list[int]) -> list[tuple[int, int]]:
+    """Regroupe des indices triés en intervalles contigus inclusifs [(début, fin), ...]."""
+    runs: list[tuple[int, int]] = []
+    for index in indices:
+        if runs and index == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], index)
+        else:
+            runs.append((index, index))
+    return runs
+
+
+def compute_row_diff(existing_values: list[list], rows: list[list]) -> dict | None:
     """
-    Écrit les données de vidéos dans un onglet spécifique. Cette fonction assure
-    la création de l’onglet si nécessaire, efface son contenu actuel puis insère
-    les en‑têtes et les lignes fournies.
+    Compare le contenu actuel d'un onglet (en‑tête compris) avec les lignes à
+    écrire. Les lignes sont identifiées par lien + playlistId.
+
+    Retourne un dictionnaire avec les indices (0 = première ligne de données)
+    des lignes supprimées (`removed`, dans l'onglet actuel), insérées et
+    modifiées (`inserted`/`changed`, dans `rows`), ainsi que `header_changed`.
+    Retourne None si un diff n'est pas applicable (clés dupliquées ou ordre
+    des vidéos conservées modifié) : une réécriture complète est alors requise.
+    """
+    existing_rows = existing_values[1:] if existing_values else []
+    header_changed = not existing_values or _normalize_row(existing_values[0]) != _normalize_row(HEADERS)
+    existing_keys = [_row_key(row) for row in existing_rows]
+    new_keys = [_row_key(row) for row in rows]
+    if len(set(existing_keys)) != len(existing_keys) or len(set(new_keys)) != len(new_keys):
+        return None
+    existing_by_key = {key: index for index, key in enumerate(existing_keys)}
+    new_key_set = set(new_keys)
+    removed = [index for index, key in enumerate(existing_keys) if key not in new_key_set]
+    kept_existing = [key for key in existing_keys if key in new_key_set]
+    kept_new = [key for key in new_keys if key in existing_by_key]
+    if kept_existing != kept_new:
+        return None
+    inserted: list[int] = []
+    changed: list[int] = []
+    for index, (key, row) in enumerate(zip(new_keys, rows)):
+        if key not in existing_by_key:
+            inserted.append(index)
+        elif _normalize_row(existing_rows[existing_by_key[key]]) != _normalize_row(row):
+            changed.append(index)
+    return {"removed": removed, "inserted": inserted, "changed": changed, "header_changed": header_changed}
+
+
+def build_diff_requests(
+    sheet_id: int, sheet_name: str, diff: dict, rows: list[list]
+) -> tuple[list[dict], list[dict]]:
+    """
+    Traduit un diff en requêtes Sheets : suppressions/insertions de lignes
+    (`spreadsheets().batchUpdate`, appliquées dans l'ordre) puis plages de
+    valeurs à écrire (`values().batchUpdate`).
     """
-    # Assure que l’onglet existe et obtient son ID
-    sheet_id = ensure_sheet_exists(service, spreadsheet_id, sheet_name)
-    # Efface tout le contenu de l’onglet
-    clear_body = {
-        "requests": [
+    structural: list[dict] = []
+    # Suppressions en partant du bas pour ne pas décaler les indices restants
+    for start, end in reversed(_contiguous_runs(diff["removed"])):
+        structural.append(
             {
-                "updateCells": {
-                    "range": {
-                        "sheetId": sheet_id,
-                    },
-                    "fields": "*",
+                "deleteDimension": {
+                    "range": {"sheetId": sheet_id, "dimension": "ROWS", "startIndex": start + 1, "endIndex": end + 2}
                 }
             }
-        ]
+        )
+    # Insertions dans l'ordre croissant : les lignes précédentes sont déjà en place
+    for start, end in _contiguous_runs(diff["inserted"]):
+        structural.append(
+            {
+                "insertDimension": {
+                    "range": {"sheetId": sheet_id, "dimension": "ROWS", "startIndex": start + 1, "endIndex": end + 2},
+                    "inheritFromBefore": False,
+                }
+            }
+        )
+    data: list[dict] = []
+    if diff["header_changed"]:
+        data.append({"range": f"{sheet_name}!A1", "values": [HEADERS]})
+    for start, end in _contiguous_runs(sorted(diff["inserted"] + diff["changed"])):
+        data.append({"range": f"{sheet_name}!A{start + 2}", "values": rows[start : end + 1]})
+    return structural, data
+
+
+def get_sheet_ids(service, spreadsheet_id: str) -> dict[str, int]:
+    """Retourne la correspondance titre d’onglet → sheetId en un seul appel."""
+    with metrics.http_call("sheets", "get"):
+        spreadsheet = (
+            service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields="sheets.properties").execute()
+        )
+    return {
+        sheet["properties"]["title"]: sheet["properties"]["sheetId"] for sheet in spreadsheet.get("sheets", [])
     }
-    service.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body=clear_body).execute()
-    # Prépare les valeurs à insérer : en‑tête suivi des lignes
-    values = [HEADERS] + rows
-    body = {"values": values}
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range=f"{sheet_name}!A1",
-        valueInputOption="RAW",
-        body=body,
-    ).execute()
 
 
-def sync_videos(playlist_id: str, sheet_tab_name: str = "AllVideos") -> None:
+def ensure_sheets_exist(
+    service, spreadsheet_id: str, sheet_names: list[str], sheet_ids: dict[str, int] | None = None
+) -> dict[str, int]:
+    """
+    Vérifie l’existence de plusieurs onglets et crée ceux qui manquent en un
+    seul batchUpdate. Retourne la correspondance titre → sheetId.
+
+    `sheet_ids` permet de réutiliser des métadonnées déjà lues.
+    """
+    sheet_ids = dict(sheet_ids) if sheet_ids is not None else get_sheet_ids(service, spreadsheet_id)
+    missing = [name for name in dict.fromkeys(sheet_names) if name not in sheet_ids]
+    if missing:
+        body = {"requests": [{"addSheet": {"properties": {"title": name}}} for name in missing]}
+        with metrics.http_call("sheets", "batchUpdate"):
+            response = service.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body=body).execute()
+        for name, reply in zip(missing, (response or {}).get("replies", [])):
+            sheet_ids[name] = reply["addSheet"]["properties"]["sheetId"]
+        if any(name not in sheet_ids for name in missing):
+            sheet_ids = get_sheet_ids(service, spreadsheet_id)
+        for name in missing:
+            if name not in sheet_ids:
+                raise RuntimeError(f"Impossible de créer l’onglet '{name}'.")
+    return sheet_ids
+
+
+def publish_tabs(service, spreadsheet_id: str, tabs: dict[str, list[list]], diff: bool = False) -> None:
+    """
+    Écrit plusieurs onglets en un minimum d’allers‑retours : métadonnées du
+    classeur lues une seule fois, onglets manquants créés en un batchUpdate,
+    puis effacement (`updateCells`, valeurs et mise en forme, dans un
+    batchUpdate) et écriture (`values().batchUpdate`) de tous les onglets en
+    une requête chacun.
+
+    Avec `diff=True`, les onglets existants sont relus en un `batchGet` et seules
+    les lignes insérées, supprimées ou modifiées sont envoyées. Les onglets pour
+    lesquels le diff n’est pas applicable sont réécrits entièrement.
+    """
+    existing_ids = get_sheet_ids(service, spreadsheet_id)
+    sheet_ids = ensure_sheets_exist(service, spreadsheet_id, list(tabs), existing_ids)
+    full_rewrite = list(tabs)
+    structural: list[dict] = []
+    data: list[dict] = []
+    if diff:
+        known_tabs = [name for name in tabs if name in existing_ids]
+        full_rewrite = [name for name in tabs if name not in existing_ids]
+        if known_tabs:
+            with metrics.http_call("sheets", "values.batchGet"):
+                response = (
+                    service.spreadsheets()
+                    .values()
+                    .batchGet(
+                        spreadsheetId=spreadsheet_id, ranges=[f"{name}!A1:{_LAST_COLUMN}" for name in known_tabs]
+                    )
+                    .execute()
+                )
+            for name, value_range in zip(known_tabs, response.get("valueRanges", [])):
+                rows = tabs[name]
+                changes = compute_row_diff(value_range.get("values", []), rows)
+                if changes is None:
+                    logging.info("Diff impossible pour l'onglet %s ; réécriture complète.", name)
+                    full_rewrite.append(name)
+                    continue
+                tab_structural, tab_data = build_diff_requests(sheet_ids[name], name, changes, rows)
+                structural.extend(tab_structural)
+                data.extend(tab_data)
+                logging.info(
+                    "Onglet %s : %s insertion(s), %s suppression(s), %s modification(s).",
+                    name,
+                    len(changes["inserted"]),
+                    len(changes["removed"]),
+                    len(changes["changed"]),
+                )
+    if full_rewrite:
+        # Efface tout le contenu des onglets réécrits, mise en forme comprise
+        # (les onglets créés à l’instant sont vides)
+        structural.extend(
+            {"updateCells": {"range": {"sheetId": sheet_ids[name]}, "fields": "*"}}
+            for name in full_rewrite
+            if name in existing_ids
+        )
+        data.extend({"range": f"{name}!A1", "values": [HEADERS] + tabs[name]} for name in full_rewrite)
+    if structural:
+        with metrics.http_call("sheets", "batchUpdate"):
+            service.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body={"requests": structural}).execute()
+    if data:
+        with metrics.http_call("sheets", "values.batchUpdate"):
+            service.spreadsheets().values().batchUpdate(
+                spreadsheetId=spreadsheet_id, body={"valueInputOption": "RAW", "data": data}
+            ).execute()
+
+
+def write_category(service, spreadsheet_id: str, sheet_name: str, rows: list[list], diff: bool = False) -> None:
+    """
+    Écrit les données de vidéos dans un onglet spécifique. Cette fonction assure
+    la création de l’onglet si nécessaire, efface son contenu actuel puis insère
+    les en‑têtes et les lignes fournies.
+
+    Avec `diff=True`, le contenu actuel de l’onglet est relu et seules les
+    lignes insérées, supprimées ou modifiées sont envoyées. Si le diff n’est
+    pas applicable (ordre modifié, doublons), l’onglet est réécrit entièrement.
+    Pour plusieurs onglets, préférer `publish_tabs` qui regroupe les appels.
+    """
+    publish_tabs(service, spreadsheet_id, {sheet_name: rows}, diff=diff)
+
+
+def verify_published_rows(service, spreadsheet_id: str, expected_rows: list[list]) -> bool:
+    """
+    Relit les onglets de durée en un seul `batchGet` et les compare aux lignes
+    publiées pour l'application web (en‑tête compris), comme le ferait
+    `scripts/export_sheet.py`. Retourne False et journalise l'écart sinon.
+    """
+    with metrics.http_call("sheets", "values.batchGet"):
+        response = (
+            service.spreadsheets()
+            .values()
+            .batchGet(spreadsheetId=spreadsheet_id, ranges=[f"{name}!A1:{_LAST_COLUMN}" for name in DURATION_TABS])
+            .execute()
+        )
+    sheet_rows = [
+        _normalize_row(row)
+        for row in iter_merged_rows(value_range.get("values", []) for value_range in response.get("valueRanges", []))
+    ]
+    expected = [_normalize_row(row) for row in expected_rows]
+    if sheet_rows == expected:
+        logging.info("Vérification Google Sheets : %s ligne(s) identiques aux données publiées.", len(expected))
+        return True
+    differing = sum(1 for read, written in zip(sheet_rows, expected) if read != written)
+    logging.warning(
+        "Vérification Google Sheets : %s ligne(s) relue(s) pour %s publiée(s), %s différente(s).",
+        len(sheet_rows),
+        len(expected),
+        differing,
+    )
+    return False
+
+
+def sync_videos(
+    playlist_id: str,
+    sheet_tab_name: str = "AllVideos",
+    diff_writes: bool = False,
+    playlist_workers: int = DEFAULT_PLAYLIST_WORKERS,
+    detail_workers: int = DEFAULT_DETAIL_WORKERS,
+    avatar_cache_path: str | None = AVATAR_CACHE_PATH,
+    avatar_ttl_days: float = DEFAULT_AVATAR_TTL_DAYS,
+    refresh_avatars: bool = False,
+    response_cache_path: str | None = RESPONSE_CACHE_PATH,
+    incremental: bool = False,
+    refresh_tiers: bool = False,
+    quota_budget: int | None = None,
+    state_db_path: str | None = STATE_DB_PATH,
+    public_data_dir: str | None = PUBLIC_DATA_DIR,
+    verify_sheets: bool = False,
+    checkpoint_path: str | None = CHECKPOINT_PATH,
+    checkpoint_ttl_hours: float = DEFAULT_CHECKPOINT_TTL_HOURS,
+) -> None:
     """
     Récupère les vidéos d’une playlist YouTube et met à jour un Google Sheet.
     Regroupe les vidéos par catégorie de durée et alimente les onglets correspondants,
     en plus de l’onglet principal (AllVideos).
+
+    Avec `diff_writes=True`, seules les lignes modifiées sont envoyées à Sheets.
+    `playlist_workers` borne le nombre de playlists paginées simultanément et
+    `detail_workers` le nombre de lots `videos.list` envoyés pendant la pagination.
+    Les avatars sont lus depuis `avatar_cache_path` (entrées de moins de
+    `avatar_ttl_days` jours) sauf si `refresh_avatars` est vrai ; `None`
+    désactive le cache persistant. `response_cache_path` est le fichier des
+    réponses YouTube (ETag) réutilisées via des requêtes conditionnelles.
+    Positions des playlists, état de pagination, derniers détails connus des
+    vidéos et lignes exportées sont conservés dans le magasin SQLite
+    `state_db_path` (`None` le désactive ; `incremental` et `refresh_tiers`
+    sont alors sans effet).
+    Avec `incremental=True`, la pagination s’arrête dès que les items déjà
+    connus sont atteints.
+    Avec `refresh_tiers=True`, seules les vidéos nouvelles ou dont les
+    statistiques sont périmées selon `REFRESH_TIERS` sont redemandées (dans la
+    limite de `quota_budget` unités `videos.list`) ; les autres reprennent
+    leurs derniers détails connus.
+    Les fichiers de l’application web (`videos.csv`, `videos.json`,
+    `videos.compact.json`) sont écrits dans `public_data_dir` directement à
+    partir des lignes construites (`None` désactive l’écriture) ; avec
+    `verify_sheets=True`, les onglets de durée sont relus pour vérifier qu’ils
+    correspondent à ces fichiers.
+    Les pages de playlists, lots de détails et onglets écrits sont enregistrés
+    au fil de l’exécution dans le point de reprise `checkpoint_path` (voir
+    `sync_checkpoint.py` ; `None` le désactive) : une exécution interrompue
+    est reprise par la suivante si les paramètres sont identiques et si le
+    point de reprise a moins de `checkpoint_ttl_hours` heures. Il est supprimé
+    à la fin de la synchronisation.
     """
     # Variables d’environnement requises
     YOUTUBE_API_KEY = os.environ.get("YOUTUBE_API_KEY")
@@ -444,25 +1404,136 @@ def sync_videos(playlist_id: str, sheet_tab_name: str = "AllVideos") -> None:
         logging.error("SERVICE_ACCOUNT_JSON invalide")
         return
     creds = service_account.Credentials.from_service_account_info(creds_info, scopes=SCOPES)
-    service = build("sheets", "v4", credentials=creds)
-    all_items_by_playlist: list[tuple[str, list[dict]]] = []
-    all_video_ids: list[str] = []
-    for playlist_source_id in playlist_source_ids:
-        try:
-            items = fetch_all_playlist_items(playlist_source_id, YOUTUBE_API_KEY)
-        except RuntimeError:
-            logging.error("Impossible de récupérer les vidéos de la playlist %s", playlist_source_id)
-            raise
-        if not items:
-            logging.error(
-                "Aucun élément récupéré pour la playlist %s. Vérifiez l'identifiant ou la visibilité.",
-                playlist_source_id,
+    service = build("sheets", "v4", credentials=creds, client_options=http_client.sheets_client_options())
+    if response_cache_path:
+        response_cache.load(response_cache_path)
+    store = StateStore(state_db_path) if state_db_path else None
+    playlist_state = None
+    if incremental and store is not None:
+        playlist_state = {
+            source_id: state
+            for source_id in playlist_source_ids
+            if (state := store.playlist_state(source_id)) is not None
+        }
+    use_refresh_tiers = refresh_tiers and store is not None
+    run_key = checkpoint_key(
+        playlists=playlist_source_ids,
+        spreadsheet=SPREADSHEET_ID,
+        tab=SHEET_TAB_NAME,
+        incremental=incremental,
+        refresh_tiers=refresh_tiers,
+        quota_budget=quota_budget,
+        youtube_api=http_client.YOUTUBE_API_URL,
+        sheets_api=http_client.SHEETS_API_URL,
+    )
+    checkpoint_ttl = checkpoint_ttl_hours * 3600
+    checkpoint = SyncCheckpoint(checkpoint_path, run_key, checkpoint_ttl) if checkpoint_path else None
+    if checkpoint is not None and checkpoint.resumed:
+        logging.info("Reprise de l'exécution interrompue depuis %s.", checkpoint_path)
+    try:
+        # Les lots `videos.list` partent pendant la pagination des playlists ;
+        # les vidéos déjà connues attendent la planification des rafraîchissements
+        with ThreadPoolExecutor(max_workers=max(1, detail_workers)) as details_executor:
+            details_pipeline = VideoDetailsPipeline(
+                YOUTUBE_API_KEY,
+                details_executor,
+                deferred=store.known_video_ids() if use_refresh_tiers else None,
+                checkpoint=checkpoint,
+            )
+            metrics.stage("fetch_playlists")
+            all_items_by_playlist = fetch_playlists_items(
+                playlist_source_ids,
+                YOUTUBE_API_KEY,
+                playlist_workers,
+                on_page=details_pipeline.add_items,
+                playlist_state=playlist_state,
+                store=store,
+                checkpoint=checkpoint,
             )
-            raise RuntimeError(f"Aucun élément récupéré pour la playlist {playlist_source_id}")
-        all_items_by_playlist.append((playlist_source_id, items))
-        all_video_ids.extend(it["contentDetails"]["videoId"] for it in items)
+            all_video_ids: list[str] = []
+            for playlist_source_id, items in all_items_by_playlist:
+                if not items:
+                    logging.error(
+                        "Aucun élément récupéré pour la playlist %s. Vérifiez l'identifiant ou la visibilité.",
+                        playlist_source_id,
+                    )
+                    raise RuntimeError(f"Aucun élément récupéré pour la playlist {playlist_source_id}")
+                all_video_ids.extend(it["contentDetails"]["videoId"] for it in items)
 
-    videos_data = fetch_videos_details(list(dict.fromkeys(all_video_ids)), YOUTUBE_API_KEY)
+            unique_video_ids = list(dict.fromkeys(all_video_ids))
+            metrics.stage("fetch_details")
+            now = time.time()
+            video_state = store.video_states(unique_video_ids) if use_refresh_tiers else None
+            if video_state is not None:
+                known_ids = [video_id for video_id in unique_video_ids if video_id in video_state]
+                new_count = len(unique_video_ids) - len(known_ids)
+                max_refreshes = None
+                if quota_budget is not None:
+                    max_refreshes = quota_budget * YOUTUBE_BATCH_SIZE - new_count
+                    if max_refreshes < 0:
+                        logging.warning(
+                            "Budget de quota (%s unités) insuffisant pour les %s nouvelles vidéos ; "
+                            "seules celles‑ci sont récupérées.",
+                            quota_budget,
+                            new_count,
+                        )
+                refresh_ids = plan_refresh(known_ids, video_state, now, max_refreshes)
+                details_pipeline.add_video_ids(sorted(refresh_ids), force=True)
+                metrics.record_cache("video_details", len(known_ids) - len(refresh_ids), new_count + len(refresh_ids))
+                logging.info(
+                    "Statistiques : %s nouvelle(s) vidéo(s), %s rafraîchie(s), %s reprise(s) de l'état local.",
+                    new_count,
+                    len(refresh_ids),
+                    len(known_ids) - len(refresh_ids),
+                )
+            videos_data = details_pipeline.collect(unique_video_ids)
+        metrics.stage("save_state")
+        fetched_details = {video_id: compact_video_detail(info) for video_id, info in videos_data.items()}
+        if video_state is not None:
+            for video_id in unique_video_ids:
+                if video_id not in videos_data and video_id in video_state:
+                    videos_data[video_id] = video_state[video_id]["detail"]
+        if store is not None:
+            try:
+                store.save_details(fetched_details, now)
+                store.prune_videos(unique_video_ids)
+                for source_id, items in all_items_by_playlist:
+                    store.replace_playlist_items(source_id, items)
+                for source_id, state in (playlist_state or {}).items():
+                    store.set_playlist_state(source_id, state)
+            except sqlite3.Error as e:
+                logging.error("Erreur lors de l'écriture de l'état local : %s", e)
+        if response_cache_path:
+            metrics.record_cache("youtube_responses", response_cache.hits, response_cache.misses)
+            logging.info(
+                "Cache des réponses YouTube : %s réponse(s) inchangée(s) (304), %s téléchargée(s).",
+                response_cache.hits,
+                response_cache.misses,
+            )
+            try:
+                response_cache.save(response_cache_path)
+            except OSError as e:
+                logging.error("Erreur lors de l'écriture du cache des réponses YouTube : %s", e)
+    finally:
+        response_cache.close()
+        if store is not None:
+            store.close()
+        if checkpoint is not None:
+            checkpoint.close()
+    # Avatars de toutes les chaînes résolus par lots de 50 avant la construction des lignes
+    metrics.stage("avatars")
+    if avatar_cache_path and not refresh_avatars:
+        loaded = load_avatar_cache(avatar_cache_path, avatar_ttl_days)
+        logging.info("%s avatar(s) de chaîne chargé(s) depuis %s", loaded, avatar_cache_path)
+    fetch_channel_avatars(
+        (info.get("snippet", {}).get("channelId", "") for info in videos_data.values()), YOUTUBE_API_KEY
+    )
+    if avatar_cache_path:
+        try:
+            save_avatar_cache(avatar_cache_path)
+        except OSError as e:
+            logging.error("Erreur lors de l'écriture du cache d'avatars : %s", e)
+    metrics.stage("transform")
     # Catégories de durée pré‑définies
     videos_by_category: dict[str, list] = {
         "0-5min": [],
@@ -477,62 +1548,100 @@ def sync_videos(playlist_id: str, sheet_tab_name: str = "AllVideos") -> None:
     }
     # Liste globale de toutes les vidéos
     all_videos: list[list] = []
-    for playlist_source_id, items in all_items_by_playlist:
-        for item in items:
-            video_id = item["contentDetails"]["videoId"]
-            video_link = f"https://www.youtube.com/watch?v={video_id}"
-            info = videos_data.get(video_id, {})
-            if info:
-                snippet = info.get("snippet", {})
-                stats = info.get("statistics", {})
-                title = snippet.get("title", "Inconnu")
-                channel = snippet.get("channelTitle", "Inconnu")
-                channel_id = snippet.get("channelId", "")
-                duration_iso = info.get("contentDetails", {}).get("duration", "PT0S")
-                video_duration = parse_duration(duration_iso)
-                thumbnail_url = get_thumbnail_url(info)
-                avatar_url = get_channel_avatar(channel_id, YOUTUBE_API_KEY)
-                published_at = format_published_at(snippet.get("publishedAt", ""))
-                duration_category = get_duration_category(video_duration)
-                playlist_position = item.get("snippet", {}).get("position")
-                entry = [
-                    avatar_url,
-                    title,
-                    video_link,
-                    channel,
-                    published_at,
-                    video_duration,
-                    stats.get("viewCount", "0"),
-                    stats.get("likeCount", "0"),
-                    stats.get("commentCount", "0"),
-                    snippet.get("description", "")[:50],
-                    ", ".join(snippet.get("tags", []) or []),
-                    snippet.get("categoryId", "Inconnu"),
-                    thumbnail_url,
-                    "",  # myCategory (colonne personnalisée optionnelle)
-                    str(playlist_position) if playlist_position is not None else "",
-                    playlist_source_id,
-                ]
-                add_video_to_categories(entry, duration_category, videos_by_category, all_videos)
-    # Écriture des données dans chaque onglet de catégorie
-    for category_name, rows in videos_by_category.items():
-        write_category(service, SPREADSHEET_ID, category_name, rows)
-    # Enfin, écrire l’ensemble des vidéos dans l’onglet principal
-    write_category(service, SPREADSHEET_ID, SHEET_TAB_NAME, all_videos)
+    # Lignes construites par colonnes en une passe (voir row_transform)
+    video_columns = transform_videos(
+        ((playlist_source_id, item) for playlist_source_id, items in all_items_by_playlist for item in items),
+        videos_data,
+        lambda channel_id: get_channel_avatar(channel_id, YOUTUBE_API_KEY),
+    )
+    for entry, duration_category in zip(video_columns.rows(HEADERS), video_columns.categories):
+        add_video_to_categories(entry, duration_category, videos_by_category, all_videos)
+    # Écriture de chaque onglet de catégorie puis de l’onglet principal, en un
+    # nombre constant d’appels à l’API Sheets
+    tabs = dict(videos_by_category)
+    tabs[SHEET_TAB_NAME] = all_videos
+    metrics.stage("sheets_write")
+    if checkpoint_path:
+        # Les onglets déjà écrits avec le même contenu avant l’interruption sont sautés
+        with SyncCheckpoint(checkpoint_path, run_key, checkpoint_ttl) as checkpoint:
+            digests = {name: rows_digest(rows) for name, rows in tabs.items()}
+            written = checkpoint.written_tabs()
+            pending = {name: rows for name, rows in tabs.items() if written.get(name) != digests[name]}
+            if len(pending) < len(tabs):
+                logging.info("%s onglet(s) déjà écrit(s) avant l'interruption.", len(tabs) - len(pending))
+            if pending:
+                publish_tabs(service, SPREADSHEET_ID, pending, diff=diff_writes)
+                checkpoint.mark_tabs_written({name: digests[name] for name in pending})
+    else:
+        publish_tabs(service, SPREADSHEET_ID, tabs, diff=diff_writes)
 
     # -----------------------------------------------------------------------
     # Mise à jour du fichier local `data/videos.json` pour le mode hors‑ligne.
     # Ce bloc écrit la liste complète des vidéos (y compris les plus récentes)
     # dans le fichier JSON. Ainsi, même sans `SPREADSHEET_ID` ni `API_KEY`,
-    # l’application affichera les vidéos à jour.
+    # l’application affichera les vidéos à jour. L’écriture est atomique et
+    # ignorée si le contenu n’a pas changé.
+    metrics.stage("local_export")
     try:
-        os.makedirs("data", exist_ok=True)
         local_path = os.path.join("data", "videos.json")
-        with open(local_path, "w", encoding="utf-8") as f:
-            json.dump([HEADERS] + all_videos, f, ensure_ascii=False)
-        logging.info("Fichier local mis à jour : %s", local_path)
+        if not write_json_rows(local_path, itertools.chain([HEADERS], all_videos)):
+            logging.info("Fichier local inchangé : %s", local_path)
+        else:
+            logging.info("Fichier local mis à jour : %s", local_path)
     except Exception as e:
         logging.error("Erreur lors de l'écriture de videos.json : %s", e)
+    # Fichiers de l’application web écrits depuis les lignes en mémoire, sans
+    # relire la feuille (même filtrage que `scripts/export_sheet.py`)
+    if public_data_dir:
+        metrics.stage("public_data")
+        try:
+            count = write_public_data(iter_public_rows(HEADERS, videos_by_category), public_data_dir)
+            logging.info(
+                "Données de l'application web publiées : %s vidéo(s) dans %s", max(count - 1, 0), public_data_dir
+            )
+        except Exception as e:
+            logging.error("Erreur lors de l'écriture des données de l'application web : %s", e)
+    if verify_sheets:
+        metrics.stage("verify_sheets")
+        try:
+            verify_published_rows(service, SPREADSHEET_ID, list(iter_public_rows(HEADERS, videos_by_category)))
+        except Exception as e:
+            logging.error("Erreur lors de la vérification de la feuille : %s", e)
+    # Les lignes exportées sont aussi conservées dans le magasin d’état, d’où
+    # `python state_store.py --export` peut régénérer le JSON du front-end
+    if state_db_path:
+        metrics.stage("save_rows")
+        try:
+            with StateStore(state_db_path) as store:
+                store.replace_rows(HEADERS, all_videos)
+        except sqlite3.Error as e:
+            logging.error("Erreur lors de l'écriture de l'état local : %s", e)
+    if checkpoint_path:
+        remove_checkpoint(checkpoint_path)
+
+
+def report_run(report: dict, report_path: str | None = RUN_REPORT_PATH, textfile_path: str | None = None) -> None:
+    """
+    Journalise le résumé d'une exécution mesurée par `run_metrics` puis écrit
+    le rapport JSON (`report_path`) et le fichier texte Prometheus
+    (`textfile_path`) ; `None` désactive l'écriture correspondante.
+    """
+    totals = report["totals"]
+    logging.info(
+        "Exécution terminée en %.1f s (%s) ; %s requête(s), %s reprise(s), ~%s unité(s) de quota YouTube.",
+        report["durationSeconds"],
+        ", ".join(f"{stage['name']} {stage['seconds']:.1f} s" for stage in report["stages"]) or "aucune étape",
+        int(totals["requests"]),
+        int(totals["retries"]),
+        int(totals["youtubeQuotaUnits"]),
+    )
+    for path, writer in ((report_path, write_report), (textfile_path, write_textfile)):
+        if not path:
+            continue
+        try:
+            writer(path, report)
+        except OSError as e:
+            logging.error("Erreur lors de l'écriture des mesures %s : %s", path, e)
 
 
 if __name__ == "__main__":
@@ -542,5 +1651,128 @@ if __name__ == "__main__":
         help="Identifiant(s) ou URL(s) de playlist YouTube (séparés par des virgules si plusieurs)",
     )
     parser.add_argument("--sheet-tab-name", default="AllVideos", help="Nom de l'onglet cible dans Google Sheets")
+    parser.add_argument(
+        "--diff-writes",
+        action="store_true",
+        help="N'envoie à Google Sheets que les lignes insérées, supprimées ou modifiées",
+    )
+    parser.add_argument(
+        "--playlist-workers",
+        type=int,
+        default=DEFAULT_PLAYLIST_WORKERS,
+        help="Nombre maximal de playlists paginées en parallèle",
+    )
+    parser.add_argument(
+        "--detail-workers",
+        type=int,
+        default=DEFAULT_DETAIL_WORKERS,
+        help="Nombre maximal de lots videos.list envoyés en parallèle pendant la pagination",
+    )
+    parser.add_argument(
+        "--avatar-cache",
+        default=AVATAR_CACHE_PATH,
+        help="Fichier du cache persistant des avatars de chaîne (chaîne vide pour le désactiver)",
+    )
+    parser.add_argument(
+        "--avatar-ttl-days",
+        type=float,
+        default=DEFAULT_AVATAR_TTL_DAYS,
+        help="Durée de validité (en jours) d'un avatar mis en cache",
+    )
+    parser.add_argument(
+        "--refresh-avatars",
+        action="store_true",
+        help="Ignore le cache persistant et redemande tous les avatars",
+    )
+    parser.add_argument(
+        "--response-cache",
+        default=RESPONSE_CACHE_PATH,
+        help="Fichier du cache des réponses YouTube (ETag) ; chaîne vide pour le désactiver",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Arrête la pagination dès que les vidéos déjà connues de l'état local sont atteintes",
+    )
+    parser.add_argument(
+        "--refresh-tiers",
+        action="store_true",
+        help="Ne rafraîchit que les statistiques périmées selon l'âge des vidéos",
+    )
+    parser.add_argument(
+        "--quota-budget",
+        type=int,
+        default=None,
+        help="Nombre maximal d'unités de quota videos.list par exécution (avec --refresh-tiers)",
+    )
+    parser.add_argument(
+        "--state-db",
+        default=STATE_DB_PATH,
+        help="Base SQLite de l'état local (positions, détails des vidéos) ; chaîne vide pour la désactiver",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=CHECKPOINT_PATH,
+        help="Point de reprise d'une exécution interrompue (SQLite) ; chaîne vide pour le désactiver",
+    )
+    parser.add_argument(
+        "--checkpoint-ttl-hours",
+        type=float,
+        default=DEFAULT_CHECKPOINT_TTL_HOURS,
+        help="Âge maximal (en heures) d'un point de reprise réutilisable",
+    )
+    parser.add_argument(
+        "--public-dir",
+        default=PUBLIC_DATA_DIR,
+        help="Dossier des données de l'application web (videos.csv/json) ; chaîne vide pour ne pas les écrire",
+    )
+    parser.add_argument(
+        "--verify-sheets",
+        action="store_true",
+        help="Relit les onglets de durée après l'écriture et les compare aux données publiées",
+    )
+    parser.add_argument(
+        "--metrics-report",
+        default=RUN_REPORT_PATH,
+        help="Rapport JSON des mesures (étapes, appels HTTP, caches) ; chaîne vide pour le désactiver",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        default=None,
+        help="Fichier texte Prometheus des mesures (collecteur textfile de node_exporter)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile chaque étape (cProfile et tracemalloc) ; rapports écrits sous --profile-dir",
+    )
+    parser.add_argument(
+        "--profile-dir", default=PROFILE_DIR, help="Dossier des profils (un sous-dossier par exécution)"
+    )
     args = parser.parse_args()
-    sync_videos(args.playlist_id, args.sheet_tab_name)
+    metrics.start()
+    run_status = "error"
+    try:
+        with profile_stages(args.profile_dir if args.profile else None):
+            sync_videos(
+                args.playlist_id,
+                args.sheet_tab_name,
+                diff_writes=args.diff_writes,
+                playlist_workers=args.playlist_workers,
+                detail_workers=args.detail_workers,
+                avatar_cache_path=args.avatar_cache or None,
+                avatar_ttl_days=args.avatar_ttl_days,
+                refresh_avatars=args.refresh_avatars,
+                response_cache_path=args.response_cache or None,
+                incremental=args.incremental,
+                refresh_tiers=args.refresh_tiers,
+                quota_budget=args.quota_budget,
+                state_db_path=args.state_db or None,
+                public_data_dir=args.public_dir or None,
+                verify_sheets=args.verify_sheets,
+                checkpoint_path=args.checkpoint or None,
+                checkpoint_ttl_hours=args.checkpoint_ttl_hours,
+            )
+        run_status = "ok"
+    finally:
+        report_run(metrics.finish(run_status), args.metrics_report or None, args.metrics_textfile or None)
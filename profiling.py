@@ -0,0 +1,208 @@
+"""
+Mode profil (`--profile`) de `main.py`, `export_data.py` et
+`scripts/export_sheet.py`.
+
+Chaque étape signalée par `run_metrics.metrics.stage` est mesurée avec
+cProfile et tracemalloc. Pour chaque étape, dans un dossier horodaté
+(`data/profile/<date>/` par défaut) :
+
+    - `NN-<étape>.prof` : profil cProfile du thread principal, lisible avec
+      `python -m pstats` ou snakeviz ;
+    - `NN-<étape>.alloc.txt` : pic de mémoire de l'étape et lignes ayant le
+      plus alloué pendant l'étape (écart entre les instantanés tracemalloc
+      de début et de fin, tous threads confondus).
+
+Les threads démarrés pendant le profil (pools de pagination, lots
+`videos.list`, lectures par fenêtres) sont profilés séparément et réunis
+dans `threads.prof`. `summary.txt` récapitule la durée, le pic de mémoire et
+les fonctions les plus coûteuses de chaque étape.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from run_metrics import metrics
+
+PROFILE_DIR = os.path.join("data", "profile")
+
+# Profondeur des piles conservées par tracemalloc et taille des rapports
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATIONS = 25
+TOP_FUNCTIONS = 8
+
+_MIB = 1024 * 1024
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", name).strip("-") or "etape"
+
+
+class StageProfiler:
+    """Profils cProfile et tracemalloc par étape, écrits dans `out_dir`."""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.summary: list[dict] = []
+        self._index = 0
+        self._stage: str | None = None
+        self._profile: cProfile.Profile | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._started = 0.0
+        self._thread_profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._owns_tracemalloc = False
+
+    def start(self, first_stage: str = "startup") -> None:
+        os.makedirs(self.out_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracemalloc = True
+        threading.setprofile(self._profile_thread)
+        self.enter(first_stage)
+
+    def _profile_thread(self, frame, event, arg) -> None:
+        # Premier événement d'un nouveau thread : remplace ce crochet par un
+        # profil cProfile propre au thread
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Un seul profileur actif à la fois à partir de Python 3.12
+            return
+        with self._lock:
+            self._thread_profiles.append(profile)
+
+    def enter(self, name: str | None) -> None:
+        """Termine l'étape en cours (écriture de ses rapports) et commence `name`."""
+        if self._stage is not None:
+            self._close_stage()
+        self._stage = name
+        if name is None:
+            return
+        self._index += 1
+        self._snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        self._profile = cProfile.Profile()
+        try:
+            self._profile.enable()
+        except ValueError:
+            self._profile = None
+
+    def _close_stage(self) -> None:
+        seconds = time.perf_counter() - self._started
+        if self._profile is not None:
+            self._profile.disable()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        base = os.path.join(self.out_dir, f"{self._index:02d}-{_slug(self._stage)}")
+        top_functions: list[str] = []
+        if self._profile is not None:
+            self._profile.dump_stats(f"{base}.prof")
+            top_functions = _top_functions(pstats.Stats(self._profile))
+        differences = snapshot.compare_to(self._snapshot, "lineno")
+        net = sum(stat.size_diff for stat in differences)
+        with open(f"{base}.alloc.txt", "w", encoding="utf-8") as fh:
+            fh.write(f"Étape : {self._stage}\n")
+            fh.write(f"Durée : {seconds:.3f} s\n")
+            fh.write(f"Pic de mémoire suivie : {peak / _MIB:.1f} Mio (fin : {current / _MIB:.1f} Mio)\n")
+            fh.write(f"Allocations nettes : {net / _MIB:+.1f} Mio\n\n")
+            fh.write(f"{TOP_ALLOCATIONS} lignes ayant le plus alloué pendant l'étape :\n")
+            for stat in differences[:TOP_ALLOCATIONS]:
+                fh.write(f"{stat}\n")
+        self.summary.append(
+            {
+                "stage": self._stage,
+                "seconds": seconds,
+                "peak": peak,
+                "net": net,
+                "functions": top_functions,
+            }
+        )
+        self._profile = None
+        self._snapshot = None
+
+    def finish(self) -> None:
+        """Termine la dernière étape, écrit `threads.prof` et `summary.txt`."""
+        self.enter(None)
+        threading.setprofile(None)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        with self._lock:
+            thread_profiles = list(self._thread_profiles)
+        thread_functions: list[str] = []
+        if thread_profiles:
+            stats = pstats.Stats(thread_profiles[0])
+            for profile in thread_profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(os.path.join(self.out_dir, "threads.prof"))
+            thread_functions = _top_functions(stats)
+        with open(os.path.join(self.out_dir, "summary.txt"), "w", encoding="utf-8") as fh:
+            for entry in self.summary:
+                fh.write(
+                    f"{entry['stage']:<18}{entry['seconds']:9.3f} s   pic {entry['peak'] / _MIB:8.1f} Mio"
+                    f"   net {entry['net'] / _MIB:+8.1f} Mio\n"
+                )
+                for line in entry["functions"]:
+                    fh.write(f"    {line}\n")
+            if thread_profiles:
+                fh.write(f"threads ({len(thread_profiles)})\n")
+                for line in thread_functions:
+                    fh.write(f"    {line}\n")
+
+
+def _top_functions(stats: pstats.Stats) -> list[str]:
+    """Lignes de `print_stats` des fonctions au temps cumulé le plus élevé."""
+    buffer = io.StringIO()
+    stats.stream = buffer
+    stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    lines = buffer.getvalue().splitlines()
+    header = next((index for index, line in enumerate(lines) if line.lstrip().startswith("ncalls")), None)
+    if header is None:
+        return []
+    return [line.strip() for line in lines[header + 1 :] if line.strip()]
+
+
+def profile_dir(base: str = PROFILE_DIR) -> str:
+    """Dossier horodaté d'une exécution profilée sous `base`."""
+    return os.path.join(base, datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"))
+
+
+@contextlib.contextmanager
+def profile_stages(base: str | None = PROFILE_DIR):
+    """
+    Profile les étapes du bloc `with` (marquées par `metrics.stage`) et écrit
+    les rapports dans un dossier horodaté sous `base` ; sans effet si `base`
+    est None ou vide. La collecte de `metrics` est activée le temps du bloc
+    si elle ne l'est pas déjà. Renvoie le profileur (ou None).
+    """
+    if not base:
+        yield None
+        return
+    owns_metrics = not metrics.enabled
+    if owns_metrics:
+        metrics.start()
+    profiler = StageProfiler(profile_dir(base))
+    profiler.start()
+    metrics.stage_listeners.append(profiler.enter)
+    try:
+        yield profiler
+    finally:
+        metrics.stage_listeners.remove(profiler.enter)
+        profiler.finish()
+        if owns_metrics:
+            metrics.finish()
+        logging.info("Profils des étapes écrits dans %s", profiler.out_dir)
@@ -0,0 +1,189 @@
+"""
+Fichiers de données publiés pour l'application web (`bolt-app/public/data`).
+
+`videos.csv`, `videos.json` et `videos.compact.json` (avec ses copies `.gz`
+et `.br`) contiennent l'en‑tête puis les vidéos des onglets de durée, dans
+l'ordre de `DURATION_TABS`, sans les lignes sans titre ou dont le titre vaut
+« Inconnu ». L'index de recherche `videos.search.json` (`search_index.py`)
+porte sur les mêmes lignes.
+
+Les mêmes lignes sont aussi réparties par catégorie de durée dans
+`shards/<catégorie>.json` (format compact), décrits par `shards/manifest.json`
+(nombre de lignes et empreinte SHA‑256 de chaque fragment) : l'application
+charge d'abord l'onglet affiché puis les autres. `main.py` les écrit
+directement depuis les lignes de la synchronisation ;
+`scripts/export_sheet.py` les reconstruit à partir de la feuille Google Sheets.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+from typing import Iterable, Iterator
+
+from compact_dataset import CompactEncoder, write_encoded_dataset
+from dataset_writer import AtomicWriter, file_digest, write_if_changed, write_json_rows
+from search_index import SearchIndexBuilder, write_search_index
+
+PUBLIC_DATA_DIR = os.path.join("bolt-app", "public", "data")
+
+# Fragments par catégorie de durée, relatifs au dossier publié
+SHARDS_DIR = "shards"
+SHARD_MANIFEST_FORMAT = "videos-shards"
+SHARD_MANIFEST_VERSION = 1
+
+# Onglets exportés vers l'application web (l'onglet « Inconnue » en est exclu)
+DURATION_TABS = [
+    "0-5min",
+    "5-10min",
+    "10-20min",
+    "20-30min",
+    "30-40min",
+    "40-50min",
+    "50-60min",
+    "60Plusmin",
+]
+
+
+def get_duration_category(duration: str) -> str:
+    """Classe la durée en catégories (0‑5 min, 5‑10 min, etc.)."""
+    parts = (duration or "").split(":")
+    if len(parts) != 3:
+        return "Inconnue"
+    try:
+        h = int(parts[0])
+        m = int(parts[1])
+        s = int(parts[2])
+    except ValueError:
+        return "Inconnue"
+    total_seconds = h * 3600 + m * 60 + s
+    if total_seconds <= 300:
+        return "0-5min"
+    elif total_seconds <= 600:
+        return "5-10min"
+    elif total_seconds <= 1200:
+        return "10-20min"
+    elif total_seconds <= 1800:
+        return "20-30min"
+    elif total_seconds <= 2400:
+        return "30-40min"
+    elif total_seconds <= 3000:
+        return "40-50min"
+    elif total_seconds <= 3600:
+        return "50-60min"
+    else:
+        return "60Plusmin"
+
+
+def is_published_row(row: list) -> bool:
+    """Une ligne est publiée si elle a un titre différent de « Inconnu »."""
+    return len(row) > 1 and row[1] != "Inconnu"
+
+
+def iter_merged_rows(ranges_rows: Iterable[Iterable[list]]) -> Iterator[list]:
+    """
+    Concatène plusieurs plages (en‑tête compris) en ne gardant que l'en‑tête
+    de la première, puis filtre les lignes avec `is_published_row`.
+    """
+    first = True
+    for idx, rows in enumerate(ranges_rows):
+        for row_index, row in enumerate(rows):
+            if idx > 0 and row_index == 0:
+                continue
+            if first:
+                first = False
+                yield row
+            elif is_published_row(row):
+                yield row
+
+
+def iter_public_rows(headers: list[str], videos_by_category: dict[str, list[list]]) -> Iterator[list]:
+    """Lignes publiées à partir des onglets de durée construits en mémoire."""
+    return iter_merged_rows([headers] + videos_by_category.get(tab, []) for tab in DURATION_TABS)
+
+
+def write_duration_shards(out_dir: str | os.PathLike, encoders: dict[str, CompactEncoder]) -> bool:
+    """
+    Écrit un fichier compact par catégorie de durée puis le manifeste
+    `shards/manifest.json`. Renvoie True si le manifeste a changé.
+    """
+    shards_dir = os.path.join(out_dir, SHARDS_DIR)
+    os.makedirs(shards_dir, exist_ok=True)
+    entries = []
+    for name, encoder in encoders.items():
+        path = os.path.join(shards_dir, f"{name}.json")
+        write_encoded_dataset(path, encoder.dataset())
+        entries.append(
+            {"name": name, "file": f"{SHARDS_DIR}/{name}.json", "count": encoder.count, "sha256": file_digest(path)}
+        )
+    manifest = {
+        "format": SHARD_MANIFEST_FORMAT,
+        "version": SHARD_MANIFEST_VERSION,
+        "count": sum(entry["count"] for entry in entries),
+        "shards": entries,
+    }
+    payload = json.dumps(manifest, ensure_ascii=False, indent=2)
+    return write_if_changed(os.path.join(shards_dir, "manifest.json"), [payload, "\n"])
+
+
+def write_public_data(rows: Iterable[list], out_dir: str | os.PathLike = PUBLIC_DATA_DIR, echo: bool = False) -> int:
+    """
+    Écrit en flux les exports CSV, JSON, compact et l'index de recherche à
+    partir des lignes (en‑tête compris) et renvoie le nombre de lignes.
+
+    Les fichiers sont remplacés atomiquement et laissés intacts si leur contenu
+    n'a pas changé ; une erreur pendant la lecture des lignes conserve les
+    fichiers précédents. Avec `echo=True`, chaque ligne est affichée.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    csv_path = os.path.join(out_dir, "videos.csv")
+    json_path = os.path.join(out_dir, "videos.json")
+    compact_path = os.path.join(out_dir, "videos.compact.json")
+    search_path = os.path.join(out_dir, "videos.search.json")
+    encoder: CompactEncoder | None = None
+    search_builder: SearchIndexBuilder | None = None
+    shard_encoders: dict[str, CompactEncoder] = {}
+    duration_index: int | None = None
+    count = 0
+
+    with AtomicWriter(csv_path) as csv_out:
+        csv_writer = csv.writer(csv_out)
+
+        def tap(rows: Iterable[list]) -> Iterator[list]:
+            nonlocal encoder, search_builder, duration_index, count
+            for row in rows:
+                csv_writer.writerow(row)
+                if encoder is None:
+                    encoder = CompactEncoder(row)
+                    search_builder = SearchIndexBuilder(row)
+                    duration_index = row.index("duration") if "duration" in row else None
+                    shard_encoders.update((name, CompactEncoder(row)) for name in DURATION_TABS)
+                else:
+                    encoder.add(row)
+                    search_builder.add(row)
+                    duration = row[duration_index] if duration_index is not None and duration_index < len(row) else ""
+                    shard = get_duration_category(str(duration))
+                    if shard not in shard_encoders:
+                        shard_encoders[shard] = CompactEncoder(encoder.headers)
+                    shard_encoders[shard].add(row)
+                count += 1
+                if echo:
+                    print(row)
+                yield row
+
+        if not write_json_rows(json_path, tap(rows), indent=2):
+            logging.info("%s inchangé", json_path)
+    if not csv_out.changed:
+        logging.info("%s inchangé", csv_path)
+
+    # Copie compacte par colonnes (+ .gz/.br) téléchargée par l'application web
+    if encoder is not None and not write_encoded_dataset(compact_path, encoder.dataset()):
+        logging.info("%s inchangé", compact_path)
+    # Index de recherche inversé interrogé par l'application web
+    if search_builder is not None and not write_search_index(search_path, search_builder.index()):
+        logging.info("%s inchangé", search_path)
+    if shard_encoders and not write_duration_shards(out_dir, shard_encoders):
+        logging.info("%s inchangé", os.path.join(out_dir, SHARDS_DIR, "manifest.json"))
+    return count
@@ -0,0 +1,186 @@
+"""
+Construction des lignes de la synchronisation par colonnes, en une passe.
+
+`transform_videos` reçoit les items des playlists et les détails des vidéos
+et produit directement les colonnes de `main.HEADERS`, ainsi que la
+catégorie de durée de chaque ligne. Les conversions utilisent des chemins
+rapides dont le résultat est identique aux fonctions de référence :
+
+    - durée ISO 8601 : expression régulière précompilée, secondes calculées
+      une seule fois pour la durée formatée et sa catégorie ;
+    - catégorie : recherche dichotomique dans les seuils de `DURATION_TABS` ;
+    - date de publication : horodatages `AAAA-MM-JJTHH:MM:SSZ` formatés à la
+      main, les autres formes repassant par `strptime` (`format_published_at`).
+
+Voir `benchmarks/bench_row_transform.py` pour la mesure du gain.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from datetime import datetime
+from typing import Callable, Iterable
+
+from public_data import DURATION_TABS
+
+DEFAULT_THUMBNAIL_URL = "https://via.placeholder.com/480x360?text=No+Thumbnail"
+UNKNOWN_DURATION = "Inconnue"
+
+ISO_DURATION_RE = re.compile(r"^PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?$")
+# Bornes supérieures (incluses, en secondes) des catégories de `DURATION_TABS`
+DURATION_THRESHOLDS = [300, 600, 1200, 1800, 2400, 3000, 3600]
+
+_THUMBNAIL_QUALITIES = ("high", "standard", "medium", "default")
+_TIMESTAMP_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})Z")
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def duration_parts(iso_duration: str) -> tuple[int, int, int] | None:
+    """(heures, minutes, secondes) d'une durée `PT…`, sans normalisation, ou None."""
+    match = ISO_DURATION_RE.match(iso_duration or "")
+    if not match:
+        return None
+    h, m, s = match.groups()
+    return int(h) if h else 0, int(m) if m else 0, int(s) if s else 0
+
+
+def duration_category(total_seconds: int) -> str:
+    """Catégorie de durée d'un nombre de secondes (voir `get_duration_category`)."""
+    return DURATION_TABS[bisect_left(DURATION_THRESHOLDS, total_seconds)]
+
+
+def format_published_at(iso_timestamp: str) -> str:
+    """
+    Formate l’horodatage ISO d'une vidéo YouTube en heure locale sans appliquer
+    de conversion de fuseau horaire. La valeur renvoyée est une chaîne au
+    format `dd/mm/YYYY HH:MM` précédée d'une apostrophe. Si l'horodatage n'est
+    pas conforme au format ISO attendu, la fonction renvoie une chaîne vide.
+
+    Exemple :
+
+    >>> format_published_at("2025-01-07T13:45:00Z")
+    "'07/01/2025 13:45"
+    """
+    try:
+        # La chaîne ISO fournie par l’API YouTube est toujours en UTC (suffixe 'Z').
+        dt = datetime.strptime(iso_timestamp or "", "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        return ""
+    # Aucun ajustement de fuseau horaire : on formate simplement la date/heure UTC.
+    return f"'{dt.strftime('%d/%m/%Y %H:%M') }".strip()
+
+
+def fast_published_at(iso_timestamp: str) -> str:
+    """`format_published_at` sans `strptime` pour la forme renvoyée par l'API YouTube."""
+    match = _TIMESTAMP_RE.fullmatch(iso_timestamp or "")
+    if match:
+        year, month, day, hour, minute, second = match.groups()
+        y, mo, d = int(year), int(month), int(day)
+        if 1 <= mo <= 12 and y >= 1000 and int(hour) < 24 and int(minute) < 60 and int(second) < 60:
+            leap = mo == 2 and y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+            if 1 <= d <= _DAYS_IN_MONTH[mo - 1] + leap:
+                return f"'{day}/{month}/{year} {hour}:{minute}"
+    return format_published_at(iso_timestamp)
+
+
+class VideoColumns:
+    """Colonnes des lignes construites (une liste par en‑tête) et catégorie de chaque ligne."""
+
+    def __init__(self, columns: dict[str, list], categories: list[str]):
+        self.columns = columns
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def rows(self, headers: list[str]) -> list[list]:
+        """Lignes dans l'ordre de `headers`."""
+        return [list(row) for row in zip(*(self.columns[name] for name in headers))]
+
+
+def transform_videos(
+    entries: Iterable[tuple[str, dict]],
+    videos_data: dict[str, dict],
+    channel_avatar: Callable[[str], str],
+) -> VideoColumns:
+    """
+    Construit les colonnes pour chaque couple (playlist d'origine, item de
+    playlist) dont la vidéo figure dans `videos_data`. `channel_avatar` est
+    appelé une fois par chaîne.
+    """
+    avatar, title, link, channel, published, duration = [], [], [], [], [], []
+    views, likes, comments, description, tags, category = [], [], [], [], [], []
+    thumbnail, position, playlist = [], [], []
+    categories: list[str] = []
+    avatars: dict[str, str] = {}
+    published_cache: dict[str, str] = {}
+
+    for playlist_id, item in entries:
+        video_id = item["contentDetails"]["videoId"]
+        info = videos_data.get(video_id)
+        if not info:
+            continue
+        snippet = info.get("snippet", {})
+        stats = info.get("statistics", {})
+
+        channel_id = snippet.get("channelId", "")
+        if channel_id not in avatars:
+            avatars[channel_id] = channel_avatar(channel_id)
+
+        parts = duration_parts(info.get("contentDetails", {}).get("duration", "PT0S"))
+        if parts is None:
+            duration.append(UNKNOWN_DURATION)
+            categories.append(UNKNOWN_DURATION)
+        else:
+            h, m, s = parts
+            duration.append(f"{h:02d}:{m:02d}:{s:02d}")
+            categories.append(duration_category(h * 3600 + m * 60 + s))
+
+        published_at = snippet.get("publishedAt", "")
+        formatted = published_cache.get(published_at)
+        if formatted is None:
+            formatted = published_cache[published_at] = fast_published_at(published_at)
+
+        thumbnails = snippet.get("thumbnails", {})
+        thumbnail_url = DEFAULT_THUMBNAIL_URL
+        for quality in _THUMBNAIL_QUALITIES:
+            if quality in thumbnails:
+                thumbnail_url = thumbnails[quality]["url"]
+                break
+
+        playlist_position = item.get("snippet", {}).get("position")
+        avatar.append(avatars[channel_id])
+        title.append(snippet.get("title", "Inconnu"))
+        link.append(f"https://www.youtube.com/watch?v={video_id}")
+        channel.append(snippet.get("channelTitle", "Inconnu"))
+        published.append(formatted)
+        views.append(stats.get("viewCount", "0"))
+        likes.append(stats.get("likeCount", "0"))
+        comments.append(stats.get("commentCount", "0"))
+        description.append(snippet.get("description", "")[:50])
+        tags.append(", ".join(snippet.get("tags", []) or []))
+        category.append(snippet.get("categoryId", "Inconnu"))
+        thumbnail.append(thumbnail_url)
+        position.append(str(playlist_position) if playlist_position is not None else "")
+        playlist.append(playlist_id)
+
+    columns = {
+        "channelAvatar": avatar,
+        "title": title,
+        "link": link,
+        "channel": channel,
+        "publishedAt": published,
+        "duration": duration,
+        "views": views,
+        "likes": likes,
+        "comments": comments,
+        "shortDescription": description,
+        "tags": tags,
+        "category": category,
+        "thumbnail": thumbnail,
+        "myCategory": [""] * len(categories),
+        "playlistPosition": position,
+        "playlistId": playlist,
+    }
+    return VideoColumns(columns, categories)
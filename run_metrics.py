@@ -0,0 +1,281 @@
+"""
+Mesures d'une exécution de la synchronisation : étapes, appels HTTP,
+compteurs et taux de réussite des caches.
+
+L'instance partagée `metrics` est inactive tant que `start` n'a pas été
+appelé : les fonctions d'instrumentation ne coûtent alors qu'un test. Une
+fois activée, elle enregistre :
+
+    - les étapes du pipeline (`stage` : une étape se termine quand la
+      suivante commence) et des intervalles libres (`span`) ;
+    - chaque appel HTTP (`record_http` pour les appels REST de
+      `http_client`, `http_call` pour les requêtes Google Sheets) avec sa
+      durée, son statut et le nombre d'octets reçus ;
+    - des compteurs étiquetés (`increment`) : requêtes, reprises, octets,
+      unités de quota YouTube estimées (1 par requête `list`) ;
+    - les succès et échecs des caches (`record_cache`).
+
+Les fonctions de `stage_listeners` sont appelées à chaque changement d'étape
+avec le nom de la nouvelle étape (None à la fin), par exemple par le mode
+profil (`profiling.py`).
+
+`finish` produit un rapport JSON (`write_report`) et un fichier texte au
+format Prometheus (`write_textfile`, pour le collecteur « textfile » de
+node_exporter).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from dataset_writer import AtomicWriter, write_if_changed
+
+REPORT_FORMAT = "sync-run-report"
+REPORT_VERSION = 1
+PROMETHEUS_PREFIX = "youtube_sync_"
+
+# Au-delà, les intervalles ne sont plus détaillés (seulement comptés)
+MAX_SPANS = 20_000
+
+# Aide des séries Prometheus, par nom de compteur
+COUNTER_HELP = {
+    "http_requests": "Requêtes HTTP envoyées, par API, point d'accès et statut",
+    "http_response_bytes": "Octets reçus des appels REST, par API et point d'accès",
+    "http_seconds": "Temps cumulé des appels HTTP, par API et point d'accès",
+    "retries": "Nouvelles tentatives après une erreur, par point d'accès",
+    "pagination_restarts": "Paginations reprises depuis le début après un jeton invalide",
+    "youtube_quota_units": "Unités de quota YouTube Data estimées",
+}
+
+
+def _utc(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class RunMetrics:
+    """Collecte des mesures d'une exécution (sûre entre threads)."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.stage_listeners: list[Callable[[str | None], None]] = []
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self.status = "running"
+        self._origin = time.perf_counter()
+        self._stage: tuple[str, float] | None = None
+        self.stages: list[dict] = []
+        self.spans: list[dict] = []
+        self.dropped_spans = 0
+        self.counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self.caches: dict[str, dict[str, int]] = {}
+
+    def start(self) -> None:
+        """Active la collecte pour une nouvelle exécution."""
+        with self._lock:
+            self._reset()
+            self.started_at = time.time()
+            self.enabled = True
+
+    def finish(self, status: str = "ok") -> dict:
+        """Termine l'étape en cours, désactive la collecte et renvoie le rapport."""
+        self.stage(None)
+        with self._lock:
+            self.enabled = False
+            self.finished_at = time.time()
+            self.status = status
+        return self.report()
+
+    def _add_span(self, name: str, kind: str, start: float, seconds: float, labels: dict) -> None:
+        # Appelé avec le verrou
+        if len(self.spans) >= MAX_SPANS:
+            self.dropped_spans += 1
+            return
+        span = {"name": name, "kind": kind, "start": round(start - self._origin, 6), "seconds": round(seconds, 6)}
+        if labels:
+            span["labels"] = labels
+        self.spans.append(span)
+
+    def stage(self, name: str | None) -> None:
+        """Termine l'étape en cours et commence l'étape `name` (None : aucune)."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if self._stage is not None:
+                previous, start = self._stage
+                self.stages.append({"name": previous, "seconds": round(now - start, 6)})
+                self._add_span(previous, "stage", start, now - start, {})
+            self._stage = (name, now) if name is not None else None
+        for listener in list(self.stage_listeners):
+            listener(name)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **labels):
+        """Mesure la durée du bloc `with`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self._add_span(name, "span", start, seconds, labels)
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted((label, str(label_value)) for label, label_value in labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def record_http(self, api: str, endpoint: str, status: int | str, size: int, seconds: float) -> None:
+        """Enregistre un appel HTTP terminé (`status` : code HTTP ou "error")."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            self._add_span(endpoint, "http", now - seconds, seconds, {"api": api, "status": str(status)})
+        self.increment("http_requests", api=api, endpoint=endpoint, status=status)
+        self.increment("http_seconds", seconds, api=api, endpoint=endpoint)
+        if size:
+            self.increment("http_response_bytes", size, api=api, endpoint=endpoint)
+        if api == "youtube":
+            self.increment("youtube_quota_units")
+
+    @contextlib.contextmanager
+    def http_call(self, api: str, endpoint: str):
+        """Mesure une requête exécutée dans le bloc `with` (client Google Sheets)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        status = "error"
+        try:
+            yield
+            status = 200
+        finally:
+            self.record_http(api, endpoint, status, 0, time.perf_counter() - start)
+
+    def record_cache(self, name: str, hits: int, misses: int) -> None:
+        """Ajoute des succès et des échecs au cache `name`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            cache = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+            cache["hits"] += hits
+            cache["misses"] += misses
+
+    def counter_total(self, name: str) -> float:
+        with self._lock:
+            return sum(value for (counter, _), value in self.counters.items() if counter == name)
+
+    def report(self) -> dict:
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            caches = {
+                name: {**cache, "hitRate": round(cache["hits"] / total, 4) if (total := sum(cache.values())) else None}
+                for name, cache in sorted(self.caches.items())
+            }
+            finished = self.finished_at or time.time()
+            report = {
+                "format": REPORT_FORMAT,
+                "version": REPORT_VERSION,
+                "status": self.status,
+                "startedAt": _utc(self.started_at),
+                "finishedAt": _utc(finished),
+                "durationSeconds": round(finished - self.started_at, 3),
+                "stages": list(self.stages),
+                "caches": caches,
+                "counters": counters,
+                "spans": list(self.spans),
+                "droppedSpans": self.dropped_spans,
+            }
+        totals = {
+            "requests": "http_requests",
+            "responseBytes": "http_response_bytes",
+            "retries": "retries",
+            "youtubeQuotaUnits": "youtube_quota_units",
+        }
+        report["totals"] = {key: self.counter_total(name) for key, name in totals.items()}
+        return report
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _series(name: str, labels: dict, value: float) -> str:
+    rendered = ",".join(f'{label}="{_escape(str(label_value))}"' for label, label_value in labels.items())
+    series = f"{PROMETHEUS_PREFIX}{name}{{{rendered}}}" if rendered else f"{PROMETHEUS_PREFIX}{name}"
+    return f"{series} {_number(value)}"
+
+
+def prometheus_text(report: dict) -> str:
+    """Rapport au format d'exposition texte Prometheus (jauges de la dernière exécution)."""
+    lines: list[str] = []
+
+    def block(name: str, help_text: str, samples: list[tuple[dict, float]]) -> None:
+        if not samples:
+            return
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} gauge")
+        lines.extend(_series(name, labels, value) for labels, value in samples)
+
+    finished = datetime.strptime(report["finishedAt"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    block(
+        "last_run_timestamp_seconds", "Fin de la dernière exécution (horodatage Unix)", [({}, finished.timestamp())]
+    )
+    block(
+        "last_run_success", "1 si la dernière exécution s'est terminée sans erreur", [({}, report["status"] == "ok")]
+    )
+    block("run_duration_seconds", "Durée totale de l'exécution", [({}, report["durationSeconds"])])
+    block(
+        "stage_duration_seconds",
+        "Durée de chaque étape de l'exécution",
+        [({"stage": stage["name"]}, stage["seconds"]) for stage in report["stages"]],
+    )
+    by_name: dict[str, list[tuple[dict, float]]] = {}
+    for counter in report["counters"]:
+        by_name.setdefault(counter["name"], []).append((counter["labels"], counter["value"]))
+    for name, samples in by_name.items():
+        block(name, COUNTER_HELP.get(name, name), samples)
+    for kind in ("hits", "misses"):
+        block(
+            f"cache_{kind}",
+            "Succès du cache, par cache" if kind == "hits" else "Échecs du cache, par cache",
+            [({"cache": name}, cache[kind]) for name, cache in report["caches"].items()],
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path: str, report: dict) -> None:
+    """Écrit le rapport JSON (remplacement atomique)."""
+    write_if_changed(path, [json.dumps(report, ensure_ascii=False, indent=2), "\n"])
+
+
+def write_textfile(path: str, report: dict) -> None:
+    """Écrit le fichier Prometheus (remplacement atomique, lu par node_exporter)."""
+    with AtomicWriter(path) as out:
+        out.write(prometheus_text(report))
+
+
+metrics = RunMetrics()
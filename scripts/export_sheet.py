@@ -1,20 +1,31 @@
 import argparse
+import logging
 import os
 import re
 import json
-import csv
 import pathlib
-from typing import List
+import sys
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+import http_client  # noqa: E402
+from profiling import PROFILE_DIR, profile_stages  # noqa: E402
+from public_data import PUBLIC_DATA_DIR, iter_merged_rows, write_public_data  # noqa: E402
+from run_metrics import metrics  # noqa: E402
+from sheet_chunks import iter_chunked_rows, sheet_title  # noqa: E402
+
 
 # Google Sheets can occasionally exceed the transport read timeout.  Let the
 # client retry transient network and 5xx failures with exponential backoff
 # instead of failing the whole scheduled export on the first slow response.
 GOOGLE_API_RETRIES = 5
 
+OUT_DIR = pathlib.Path(PUBLIC_DATA_DIR)
+
 
 def parse_ranges(raw: str) -> List[str]:
     """Return a list of sheet ranges from a string.
@@ -38,69 +49,235 @@ def parse_spreadsheet_id(value: str) -> str:
     raise ValueError("SPREADSHEET_ID invalide")
 
 
-SPREADSHEET_ID = parse_spreadsheet_id(os.environ["SPREADSHEET_ID"])
-
-parser = argparse.ArgumentParser(
-    description="Exporte des données d'une feuille Google Sheets."
-)
-parser.add_argument(
-    "--sheet-range",
-    default="AllVideos!A1:Z",
-    help=(
-        "Plage(s) de cellules à exporter. Peut être une liste séparée par des virgules "
-        "ou un tableau JSON."
-    ),
-)
-args = parser.parse_args()
-sheet_ranges = parse_ranges(args.sheet_range)
-
-# Read credentials from environment secret
-creds_info = json.loads(os.environ["SERVICE_ACCOUNT_JSON"])
-creds = service_account.Credentials.from_service_account_info(
-    creds_info,
-    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"],
-)
-
-service = build("sheets", "v4", credentials=creds)
-
-all_values: List[List[str]] = []
-for idx, sheet_range in enumerate(sheet_ranges):
-    if "!" not in sheet_range:
-        raise ValueError(
-            f"SHEET_RANGE '{sheet_range}' must include a sheet name (e.g., 'Sheet1!A1:Z1000')"
-        )
-    resp = service.spreadsheets().values().get(
-        spreadsheetId=SPREADSHEET_ID, range=sheet_range
-    ).execute(num_retries=GOOGLE_API_RETRIES)
-    values = resp.get("values", [])
-    if not values:
-        continue
-    if idx == 0:
-        all_values.extend(values)
-    else:
-        all_values.extend(values[1:])
+def columns_to_rows(columns: List[list]) -> List[list]:
+    """Transpose a COLUMNS-major value range into rows.
+
+    Trailing empty cells are dropped from each row, as the API does for
+    ROWS-major responses.
+    """
+    height = max((len(column) for column in columns), default=0)
+    rows = []
+    for index in range(height):
+        row = [column[index] if index < len(column) else "" for column in columns]
+        while row and row[-1] == "":
+            row.pop()
+        rows.append(row)
+    return rows
+
+
+def _check_ranges(sheet_ranges: List[str]) -> None:
+    for sheet_range in sheet_ranges:
+        if "!" not in sheet_range:
+            raise ValueError(
+                f"SHEET_RANGE '{sheet_range}' must include a sheet name (e.g., 'Sheet1!A1:Z1000')"
+            )
+
+
+def _render_params(major_dimension: str, value_render_option: str) -> dict:
+    params = {"majorDimension": major_dimension, "valueRenderOption": value_render_option}
+    if value_render_option != "FORMATTED_VALUE":
+        params["dateTimeRenderOption"] = "FORMATTED_STRING"
+    return params
+
+
+def fetch_ranges(
+    service,
+    spreadsheet_id: str,
+    sheet_ranges: List[str],
+    major_dimension: str = "ROWS",
+    value_render_option: str = "FORMATTED_VALUE",
+) -> List[List[list]]:
+    """Read every range with a single ``values.batchGet`` call.
+
+    Returns the rows of each range in request order. With
+    ``UNFORMATTED_VALUE`` numbers come back as numbers; dates and times are
+    still rendered as formatted strings.
+    """
+    _check_ranges(sheet_ranges)
+    if not sheet_ranges:
+        return []
+    params = {"spreadsheetId": spreadsheet_id, "ranges": sheet_ranges}
+    params.update(_render_params(major_dimension, value_render_option))
+    resp = service.spreadsheets().values().batchGet(**params).execute(num_retries=GOOGLE_API_RETRIES)
+    value_ranges = resp.get("valueRanges", [])
+    results = []
+    for value_range in value_ranges:
+        values = value_range.get("values", [])
+        results.append(columns_to_rows(values) if major_dimension == "COLUMNS" else values)
+    return results
+
+
+def fetch_grid_row_count(service, spreadsheet_id: str, title: str) -> Optional[int]:
+    """Return the grid row count of a tab, or None when it cannot be read."""
+    try:
+        resp = service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id, fields="sheets.properties(title,gridProperties.rowCount)"
+        ).execute(num_retries=GOOGLE_API_RETRIES)
+    except Exception as err:
+        logging.warning("Taille de l'onglet %s inconnue : %s", title, err)
+        return None
+    for sheet in resp.get("sheets", []):
+        properties = sheet.get("properties", {})
+        if properties.get("title") == title:
+            return properties.get("gridProperties", {}).get("rowCount")
+    return None
+
+
+def iter_range_rows(
+    service,
+    spreadsheet_id: str,
+    sheet_range: str,
+    chunk_rows: int,
+    max_in_flight: int = 1,
+    major_dimension: str = "ROWS",
+    value_render_option: str = "FORMATTED_VALUE",
+    http_factory: Optional[Callable[[], object]] = None,
+) -> Iterator[list]:
+    """Stream one range in windows of ``chunk_rows`` rows (see sheet_chunks).
+
+    ``http_factory`` returns the HTTP object used by the current thread; the
+    discovery client's default transport is not thread-safe, so it is
+    required when ``max_in_flight`` > 1.
+    """
+    _check_ranges([sheet_range])
+    render = _render_params(major_dimension, value_render_option)
+
+    def fetch_window(window: str) -> list:
+        request = service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=window, **render)
+        if http_factory is not None:
+            resp = request.execute(http=http_factory(), num_retries=GOOGLE_API_RETRIES)
+        else:
+            resp = request.execute(num_retries=GOOGLE_API_RETRIES)
+        values = resp.get("values", [])
+        return columns_to_rows(values) if major_dimension == "COLUMNS" else values
+
+    return iter_chunked_rows(
+        sheet_range,
+        fetch_window,
+        chunk_rows=chunk_rows,
+        max_in_flight=max_in_flight if http_factory is not None else 1,
+        total_rows=fetch_grid_row_count(service, spreadsheet_id, sheet_title(sheet_range)),
+    )
+
+
+def thread_http_factory(creds) -> Callable[[], object]:
+    """One authorized httplib2 transport per thread for concurrent window reads."""
+    import google_auth_httplib2
+    import httplib2
+
+    local = threading.local()
+
+    def get_http():
+        if not hasattr(local, "http"):
+            local.http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http())
+        return local.http
+
+    return get_http
 
-out_dir = pathlib.Path("bolt-app/public/data")
-out_dir.mkdir(parents=True, exist_ok=True)
 
-if all_values:
-    header, *rows = all_values
-    rows = [row for row in rows if len(row) > 1 and row[1] != "Inconnu"]
-    all_values = [header] + rows
+def merge_ranges(ranges_values: List[List[list]]) -> List[list]:
+    """List version of ``iter_merged_rows``."""
+    return list(iter_merged_rows(ranges_values))
 
-# Save CSV
 
+def write_outputs(rows: Iterable[list], out_dir: pathlib.Path = OUT_DIR, echo: bool = False) -> int:
+    """Stream rows into the CSV, JSON and compact exports (see public_data)."""
+    return write_public_data(rows, out_dir, echo=echo)
 
-csv_path = out_dir / "videos.csv"
-with open(csv_path, "w", newline="", encoding="utf-8") as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerows(all_values)
 
-# Save JSON
-json_path = out_dir / "videos.json"
-with open(json_path, "w", encoding="utf-8") as jsonfile:
-    json.dump(all_values, jsonfile, ensure_ascii=False, indent=2)
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    spreadsheet_id = parse_spreadsheet_id(os.environ["SPREADSHEET_ID"])
+
+    parser = argparse.ArgumentParser(
+        description="Exporte des données d'une feuille Google Sheets."
+    )
+    parser.add_argument(
+        "--sheet-range",
+        default="AllVideos!A1:Z",
+        help=(
+            "Plage(s) de cellules à exporter. Peut être une liste séparée par des virgules "
+            "ou un tableau JSON."
+        ),
+    )
+    parser.add_argument(
+        "--major-dimension",
+        choices=["ROWS", "COLUMNS"],
+        default="ROWS",
+        help="Lit les plages par lignes ou par colonnes (transposées ensuite en lignes).",
+    )
+    parser.add_argument(
+        "--unformatted",
+        action="store_true",
+        help="Demande les valeurs non formatées (nombres typés, dates formatées).",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=0,
+        help=(
+            "Lit chaque plage par fenêtres de N lignes écrites au fur et à mesure "
+            "(0 : toutes les plages en un seul appel batchGet)."
+        ),
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=1,
+        help="Nombre de fenêtres lues simultanément avec --chunk-rows.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Enregistre un profil cProfile et tracemalloc de chaque étape.",
+    )
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help="Dossier des profils.")
+    args = parser.parse_args()
+    sheet_ranges = parse_ranges(args.sheet_range)
+
+    # Read credentials from environment secret
+    creds_info = json.loads(os.environ["SERVICE_ACCOUNT_JSON"])
+    creds = service_account.Credentials.from_service_account_info(
+        creds_info,
+        scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"],
+    )
+
+    service = build("sheets", "v4", credentials=creds, client_options=http_client.sheets_client_options())
+    with profile_stages(args.profile_dir if args.profile else None):
+        export(service, spreadsheet_id, sheet_ranges, args, creds)
+
+
+def export(service, spreadsheet_id: str, sheet_ranges: List[str], args: argparse.Namespace, creds) -> None:
+    """Read the ranges and write the exports, as the ``fetch_ranges`` and ``write_outputs`` stages."""
+    metrics.stage("fetch_ranges")
+    value_render_option = "UNFORMATTED_VALUE" if args.unformatted else "FORMATTED_VALUE"
+    if args.chunk_rows > 0:
+        http_factory = thread_http_factory(creds) if args.max_in_flight > 1 else None
+        ranges_rows = (
+            iter_range_rows(
+                service,
+                spreadsheet_id,
+                sheet_range,
+                args.chunk_rows,
+                args.max_in_flight,
+                major_dimension=args.major_dimension,
+                value_render_option=value_render_option,
+                http_factory=http_factory,
+            )
+            for sheet_range in sheet_ranges
+        )
+    else:
+        ranges_rows = fetch_ranges(
+            service,
+            spreadsheet_id,
+            sheet_ranges,
+            major_dimension=args.major_dimension,
+            value_render_option=value_render_option,
+        )
+    # With --chunk-rows the windows are read lazily, inside write_outputs
+    metrics.stage("write_outputs")
+    write_outputs(iter_merged_rows(ranges_rows), echo=True)
+
 
-# Print lines for debugging
-for row in all_values:
-    print(row)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Index de recherche inversé publié avec le jeu de données de l'application web
+(`bolt-app/public/data/videos.search.json`).
+
+Le titre et la chaîne de chaque ligne (les champs proposés par la barre de
+recherche) sont normalisés (minuscules, accents retirés) puis découpés en
+mots ; une requête trouve les mots qui commencent par chacun de ses mots. L'index
+associe chaque mot aux numéros des lignes qui le contiennent (0 = première
+ligne après l'en‑tête de `videos.json`) :
+
+    - `tokens` : mots triés (dans l'ordre des chaînes JavaScript), ce qui
+      permet de retrouver tous les mots commençant par un préfixe par
+      recherche dichotomique ;
+    - `postings` : pour chaque mot, numéros de lignes croissants encodés par
+      différences (`[3, 1, 5]` désigne les lignes 3, 4 et 9) ;
+    - `masks` : pour chaque mot, parallèlement à `postings`, les champs de la
+      ligne qui le contiennent (bit `i` = `fields[i]`), pour ne chercher que
+      dans les champs choisis ;
+    - `ids` : identifiant YouTube de chaque ligne (ou le lien complet s'il
+      n'est pas au format `watch?v=`), pour retrouver les vidéos quelle que
+      soit la source des lignes côté navigateur.
+
+La même normalisation est appliquée par `bolt-app/src/utils/searchIndex.ts`.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left
+
+from compact_dataset import LINK_PREFIX, write_encoded_dataset
+
+FORMAT_NAME = "videos-search"
+FORMAT_VERSION = 2
+
+# Colonnes indexées, dans l'ordre des en‑têtes de `main.HEADERS`
+INDEXED_FIELDS = ["title", "channel"]
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _utf16_order(token: str) -> bytes:
+    # Ordre des chaînes JavaScript (unités UTF-16), utilisé par la recherche
+    # dichotomique du front-end
+    return token.encode("utf-16-be")
+
+
+def normalize_text(text: str) -> str:
+    """Minuscules sans accents (« Éléphant » → « elephant »)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    """Mots normalisés d'un texte (lettres et chiffres consécutifs)."""
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+def video_key(link: str) -> str:
+    """Identifiant d'une ligne dans l'index : l'identifiant YouTube ou le lien."""
+    return link[len(LINK_PREFIX) :] if link.startswith(LINK_PREFIX) else link
+
+
+class SearchIndexBuilder:
+    """Construit l'index ligne par ligne (lecture en flux, comme `CompactEncoder`)."""
+
+    def __init__(self, headers: list[str]):
+        self._field_indexes = [
+            (1 << bit, headers.index(name)) for bit, name in enumerate(INDEXED_FIELDS) if name in headers
+        ]
+        self._link_index = headers.index("link") if "link" in headers else None
+        self._postings: dict[str, list[int]] = {}
+        self._masks: dict[str, list[int]] = {}
+        self.ids: list[str] = []
+
+    def add(self, row: list) -> None:
+        row_id = len(self.ids)
+        link = row[self._link_index] if self._link_index is not None and self._link_index < len(row) else ""
+        self.ids.append(video_key(str(link)))
+        seen: dict[str, int] = {}
+        for mask, index in self._field_indexes:
+            if index < len(row) and row[index]:
+                for token in tokenize(str(row[index])):
+                    seen[token] = seen.get(token, 0) | mask
+        for token, mask in seen.items():
+            self._postings.setdefault(token, []).append(row_id)
+            self._masks.setdefault(token, []).append(mask)
+
+    def index(self) -> dict:
+        tokens = sorted(self._postings, key=_utf16_order)
+        postings = []
+        for token in tokens:
+            previous = 0
+            deltas = []
+            for row_id in self._postings[token]:
+                deltas.append(row_id - previous)
+                previous = row_id
+            postings.append(deltas)
+        return {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "fields": INDEXED_FIELDS,
+            "count": len(self.ids),
+            "ids": self.ids,
+            "tokens": tokens,
+            "postings": postings,
+            "masks": [self._masks[token] for token in tokens],
+        }
+
+
+def build_search_index(headers: list[str], rows) -> dict:
+    """Construit l'index des lignes (sans l'en‑tête)."""
+    builder = SearchIndexBuilder(headers)
+    for row in rows:
+        builder.add(row)
+    return builder.index()
+
+
+def field_mask(index: dict, fields: list[str] | None = None) -> int:
+    """Masque des champs `fields` de l'index (tous les champs si None)."""
+    names = index["fields"] if fields is None else fields
+    return sum(1 << bit for bit, name in enumerate(index["fields"]) if name in names)
+
+
+def search(index: dict, query: str, fields: list[str] | None = None) -> list[int]:
+    """
+    Numéros des lignes dont les champs `fields` (tous les champs indexés si
+    None) contiennent, pour chaque mot de `query`, un mot commençant par
+    celui‑ci. Référence de l'implémentation du front-end, utilisée par les
+    tests.
+    """
+    tokens = index["tokens"]
+    selected = field_mask(index, fields)
+    result: set[int] | None = None
+    for term in tokenize(query):
+        matches: set[int] = set()
+        position = bisect_left(tokens, _utf16_order(term), key=_utf16_order)
+        while position < len(tokens) and tokens[position].startswith(term):
+            row_id = 0
+            for delta, mask in zip(index["postings"][position], index["masks"][position]):
+                row_id += delta
+                if mask & selected:
+                    matches.add(row_id)
+            position += 1
+        result = matches if result is None else result & matches
+        if not result:
+            return []
+    return sorted(result or [])
+
+
+def write_search_index(path: str, index: dict) -> bool:
+    """Écrit l'index (+ `.gz`/`.br`) ; renvoie True si le fichier JSON a changé."""
+    return write_encoded_dataset(path, index)
@@ -0,0 +1,135 @@
+"""
+Lecture d'une plage Google Sheets par fenêtres de lignes.
+
+Au lieu de télécharger un onglet entier en une seule réponse, la plage
+(`AllVideos!A1:P`) est découpée en fenêtres de `chunk_rows` lignes
+(`AllVideos!A1:P5000`, `AllVideos!A5001:P10000`, …). Chaque fenêtre est
+demandée séparément (et relancée seule en cas d'échec), plusieurs peuvent
+être en vol simultanément, et les lignes sont rendues au fur et à mesure dans
+l'ordre de la feuille : la mémoire utilisée reste bornée par
+`chunk_rows × max_in_flight` lignes.
+
+La lecture s'arrête au nombre de lignes de la grille s'il est connu
+(`total_rows`), sinon à la première fenêtre vide, avec un avertissement : les
+lignes situées après une fenêtre entièrement vide ne sont alors pas lues.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+DEFAULT_CHUNK_ROWS = 5000
+DEFAULT_MAX_IN_FLIGHT = 1
+DEFAULT_CHUNK_RETRIES = 3
+
+_A1_RE = re.compile(r"^(?P<sheet>.+)!(?P<start_col>[A-Za-z]+)(?P<start_row>\d*)(?::(?P<end_col>[A-Za-z]+)(?P<end_row>\d*))?$")
+
+
+def split_a1_range(range_: str) -> tuple[str, str, int, str, int | None]:
+    """Découpe `Onglet!A1:P` en (onglet, colonne de début, ligne de début, colonne de fin, ligne de fin)."""
+    match = _A1_RE.match(range_.strip())
+    if not match:
+        raise ValueError(f"Plage A1 non reconnue : {range_!r}")
+    start_col = match.group("start_col").upper()
+    end_col = (match.group("end_col") or start_col).upper()
+    start_row = int(match.group("start_row") or 1)
+    end_row = int(match.group("end_row")) if match.group("end_row") else None
+    return match.group("sheet"), start_col, start_row, end_col, end_row
+
+
+def sheet_title(range_: str) -> str:
+    """Nom de l'onglet d'une plage A1, sans les guillemets éventuels."""
+    title = split_a1_range(range_)[0]
+    return title[1:-1].replace("''", "'") if title.startswith("'") and title.endswith("'") else title
+
+
+def _fetch_with_retries(fetch_window: Callable[[str], list], window: str, max_retries: int) -> list:
+    backoff = 1
+    for attempt in range(max_retries):
+        try:
+            return fetch_window(window)
+        except Exception as err:
+            if attempt == max_retries - 1:
+                raise RuntimeError(f"Échec de lecture de la fenêtre {window}") from err
+            logging.warning("Lecture de %s échouée (%s) ; nouvelle tentative dans %ss.", window, err, backoff)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+    return []
+
+
+def iter_chunked_rows(
+    range_: str,
+    fetch_window: Callable[[str], list],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    total_rows: int | None = None,
+    max_retries: int = DEFAULT_CHUNK_RETRIES,
+) -> Iterator[list]:
+    """
+    Rend les lignes de `range_` fenêtre par fenêtre, dans l'ordre.
+
+    `fetch_window(plage)` renvoie les lignes d'une fenêtre (sans lignes vides
+    finales, comme l'API) ; il est appelé depuis `max_in_flight` threads au
+    plus et relancé jusqu'à `max_retries` fois par fenêtre. Les lignes vides
+    situées entre deux fenêtres non vides sont conservées, comme dans une
+    lecture en une seule réponse.
+    """
+    sheet, start_col, start_row, end_col, end_row = split_a1_range(range_)
+    limit = end_row if end_row is not None else total_rows
+    if total_rows is not None and limit is not None:
+        limit = min(limit, total_rows)
+    chunk_rows = max(1, chunk_rows)
+
+    def windows() -> Iterator[tuple[int, int]]:
+        first = start_row
+        while limit is None or first <= limit:
+            last = first + chunk_rows - 1
+            if limit is not None:
+                last = min(last, limit)
+            yield first, last
+            first = last + 1
+
+    pending_blank = 0
+    window_iter = windows()
+    with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as executor:
+        in_flight: deque = deque()
+
+        def submit_next() -> None:
+            for first, last in window_iter:
+                window = f"{sheet}!{start_col}{first}:{end_col}{last}"
+                in_flight.append((first, last, executor.submit(_fetch_with_retries, fetch_window, window, max_retries)))
+                return
+
+        for _ in range(max(1, max_in_flight)):
+            submit_next()
+        while in_flight:
+            first, last, future = in_flight.popleft()
+            try:
+                rows = future.result()
+            except BaseException:
+                for _, _, pending in in_flight:
+                    pending.cancel()
+                raise
+            if not rows and limit is None:
+                for _, _, pending in in_flight:
+                    pending.cancel()
+                logging.warning(
+                    "Taille de %s inconnue : lecture arrêtée à la première fenêtre vide (lignes %s à %s) ; "
+                    "les lignes éventuelles situées au-delà sont ignorées.",
+                    sheet,
+                    first,
+                    last,
+                )
+                return
+            submit_next()
+            if rows:
+                for _ in range(pending_blank):
+                    yield []
+                pending_blank = 0
+                yield from rows
+            pending_blank += (last - first + 1) - len(rows)
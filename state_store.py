@@ -0,0 +1,280 @@
+"""
+Magasin d'état local (SQLite) de la synchronisation YouTube → Google Sheets.
+
+Il remplace la relecture complète de `data/videos.json` par des requêtes
+indexées :
+
+    - `videos` : dernier enregistrement de détails connu par videoId
+      (réponse `videos.list` compactée) et date du dernier rafraîchissement ;
+    - `playlist_items` : position de chaque vidéo dans chaque playlist
+      (index sur playlistId/position et playlistId/videoId) ;
+    - `playlist_state` : état de la dernière pagination (mode incrémental) ;
+    - `rows` : lignes du dernier export, pour régénérer le JSON du front-end.
+
+À la première ouverture, les données existantes sont migrées depuis
+`data/videos.json` (`[HEADERS] + lignes`).
+
+Usage :
+    python state_store.py --export data/videos.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+from dataset_writer import write_json_rows
+
+STATE_DB_PATH = os.path.join("data", "state.db")
+LEGACY_VIDEOS_JSON = os.path.join("data", "videos.json")
+
+_VIDEO_ID_RE = re.compile(r"(?:v=|youtu\.be/)([A-Za-z0-9_-]{11})")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    detail TEXT NOT NULL,
+    refreshed_at REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS playlist_items (
+    playlist_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    video_id TEXT NOT NULL,
+    PRIMARY KEY (playlist_id, position)
+);
+CREATE INDEX IF NOT EXISTS playlist_items_video ON playlist_items (playlist_id, video_id);
+CREATE TABLE IF NOT EXISTS playlist_state (
+    playlist_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rows (
+    row_index INTEGER PRIMARY KEY,
+    video_id TEXT,
+    playlist_id TEXT,
+    data TEXT NOT NULL
+);
+"""
+
+
+def extract_video_id(link: str) -> str | None:
+    """Extrait l'identifiant de vidéo d'un lien YouTube."""
+    match = _VIDEO_ID_RE.search(str(link or ""))
+    return match.group(1) if match else None
+
+
+class StateStore:
+    """
+    Accès thread‑safe à la base SQLite d'état. Les écritures de chaque méthode
+    sont faites dans une transaction.
+    """
+
+    def __init__(self, path: str = STATE_DB_PATH, legacy_json_path: str | None = LEGACY_VIDEOS_JSON):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+        if self._meta("migrated") is None:
+            self.migrate(legacy_json_path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # -- Migration -------------------------------------------------------
+    def migrate(self, json_path: str | None = LEGACY_VIDEOS_JSON) -> None:
+        """Importe l'export `[HEADERS] + lignes` de `data/videos.json`."""
+        rows = read_json(json_path, []) if json_path else []
+        if rows and isinstance(rows[0], list):
+            self._import_rows(rows[0], rows[1:])
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated', '1')")
+        if rows:
+            logging.info("État local migré vers %s (%s lignes).", self.path, max(len(rows) - 1, 0))
+
+    def _import_rows(self, headers: list, rows: list) -> None:
+        try:
+            link_index = headers.index("link")
+            position_index = headers.index("playlistPosition")
+            playlist_index = headers.index("playlistId")
+        except ValueError:
+            return
+        self.replace_rows(headers, [row for row in rows if isinstance(row, list)])
+        positions: dict[str, list[tuple[int, str]]] = {}
+        for row in rows:
+            if not isinstance(row, list) or len(row) <= max(link_index, position_index, playlist_index):
+                continue
+            video_id = extract_video_id(row[link_index])
+            if not video_id:
+                continue
+            items = positions.setdefault(row[playlist_index], [])
+            try:
+                position = int(row[position_index])
+            except (TypeError, ValueError):
+                position = len(items)
+            items.append((position, video_id))
+        for playlist_id, items in positions.items():
+            self.replace_playlist_items(
+                playlist_id,
+                [{"contentDetails": {"videoId": video_id}, "snippet": {"position": position}} for position, video_id in items],
+            )
+
+    # -- Playlists -------------------------------------------------------
+    def playlist_items(self, playlist_id: str) -> list[dict]:
+        """Items connus d'une playlist triés par position (format `playlistItems`)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT position, video_id FROM playlist_items WHERE playlist_id = ? ORDER BY position",
+                (playlist_id,),
+            ).fetchall()
+        return [
+            {"id": f"cached-{video_id}", "contentDetails": {"videoId": video_id}, "snippet": {"position": position}}
+            for position, video_id in rows
+        ]
+
+    def replace_playlist_items(self, playlist_id: str, items: list[dict]) -> None:
+        """Remplace les positions connues d'une playlist par celles de `items`."""
+        values = []
+        seen_positions: set[int] = set()
+        for index, item in enumerate(items):
+            video_id = item.get("contentDetails", {}).get("videoId")
+            position = item.get("snippet", {}).get("position")
+            if not isinstance(position, int):
+                position = index
+            if video_id and position not in seen_positions:
+                seen_positions.add(position)
+                values.append((playlist_id, position, video_id))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM playlist_items WHERE playlist_id = ?", (playlist_id,))
+            self._conn.executemany(
+                "INSERT INTO playlist_items (playlist_id, position, video_id) VALUES (?, ?, ?)", values
+            )
+
+    def playlist_state(self, playlist_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM playlist_state WHERE playlist_id = ?", (playlist_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_playlist_state(self, playlist_id: str, state: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO playlist_state (playlist_id, state) VALUES (?, ?)",
+                (playlist_id, json.dumps(state)),
+            )
+
+    # -- Vidéos ----------------------------------------------------------
+    def known_video_ids(self) -> set[str]:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT video_id FROM videos")}
+
+    def video_states(self, video_ids) -> dict[str, dict]:
+        """Renvoie {videoId: {"detail": ..., "refreshedAt": ...}} pour les vidéos connues."""
+        video_ids = list(video_ids)
+        states: dict[str, dict] = {}
+        with self._lock:
+            for start in range(0, len(video_ids), 500):
+                chunk = video_ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for video_id, detail, refreshed_at in self._conn.execute(
+                    f"SELECT video_id, detail, refreshed_at FROM videos WHERE video_id IN ({placeholders})", chunk
+                ):
+                    states[video_id] = {"detail": json.loads(detail), "refreshedAt": refreshed_at}
+        return states
+
+    def save_details(self, details: dict[str, dict], refreshed_at: float) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO videos (video_id, detail, refreshed_at) VALUES (?, ?, ?)",
+                [(video_id, json.dumps(detail, ensure_ascii=False), refreshed_at) for video_id, detail in details.items()],
+            )
+
+    def prune_videos(self, keep_ids) -> None:
+        """Supprime les vidéos qui ne figurent plus dans aucune playlist synchronisée."""
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (video_id TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM keep_ids")
+            self._conn.executemany("INSERT OR IGNORE INTO keep_ids VALUES (?)", [(v,) for v in keep_ids])
+            self._conn.execute("DELETE FROM videos WHERE video_id NOT IN (SELECT video_id FROM keep_ids)")
+
+    # -- Lignes exportées ------------------------------------------------
+    def replace_rows(self, headers: list, rows: list[list]) -> None:
+        """Mémorise les lignes du dernier export (et leurs en‑têtes) dans l'ordre."""
+        try:
+            link_index = headers.index("link")
+            playlist_index = headers.index("playlistId")
+        except ValueError:
+            link_index = playlist_index = None
+        values = []
+        for index, row in enumerate(rows):
+            video_id = extract_video_id(row[link_index]) if link_index is not None and len(row) > link_index else None
+            playlist_id = row[playlist_index] if playlist_index is not None and len(row) > playlist_index else None
+            values.append((index, video_id, playlist_id, json.dumps(row, ensure_ascii=False)))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM rows")
+            self._conn.executemany(
+                "INSERT INTO rows (row_index, video_id, playlist_id, data) VALUES (?, ?, ?, ?)", values
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('headers', ?)", (json.dumps(headers),)
+            )
+
+    def export_rows(self) -> list[list]:
+        """Renvoie `[HEADERS] + lignes` du dernier export (format de `data/videos.json`)."""
+        headers = self._meta("headers")
+        with self._lock:
+            rows = [json.loads(row[0]) for row in self._conn.execute("SELECT data FROM rows ORDER BY row_index")]
+        return ([json.loads(headers)] if headers else []) + rows
+
+
+def read_json(path: str, default):
+    """Lit un fichier JSON ; renvoie `default` s’il est absent, illisible ou d’un autre type."""
+    try:
+        with open(path, encoding="utf-8") as json_file:
+            data = json.load(json_file)
+    except (OSError, json.JSONDecodeError):
+        return default
+    return data if isinstance(data, type(default)) else default
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Migre ou exporte l'état local de la synchronisation")
+    parser.add_argument("--db", default=STATE_DB_PATH, help="Chemin de la base SQLite")
+    parser.add_argument("--export", metavar="JSON", help="Écrit les lignes du dernier export dans ce fichier JSON")
+    args = parser.parse_args()
+    with StateStore(args.db) as store:
+        if args.export:
+            if write_json_rows(args.export, store.export_rows()):
+                logging.info("Données écrites dans %s", args.export)
+            else:
+                logging.info("Fichier inchangé : %s", args.export)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
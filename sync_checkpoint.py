@@ -0,0 +1,206 @@
+"""
+Point de reprise (SQLite) d'une synchronisation interrompue.
+
+Le workflow annule l'exécution en cours lorsqu'une nouvelle démarre et
+l'arrête au bout de 15 minutes : sans point de reprise, tout ce qui avait été
+récupéré est perdu. Pendant `sync_videos`, ce fichier enregistre au fil de
+l'eau :
+
+    - `checkpoint_pages` : chaque page `playlistItems` d'un parcours en cours,
+      avec le jeton et la taille de la page suivante ;
+    - `checkpoint_playlists` : les playlists entièrement récupérées (items et
+      état de pagination pour le mode incrémental) ;
+    - `checkpoint_details` : les réponses `videos.list` de chaque lot terminé ;
+    - `checkpoint_tabs` : l'empreinte du contenu de chaque onglet écrit.
+
+L'exécution suivante reprend ces données si ses paramètres (playlists,
+classeur, onglet, options de récupération) ont la même empreinte
+(`checkpoint_key`) et si le point de reprise a moins de `ttl_seconds` ; sinon
+il est vidé. Le fichier est supprimé à la fin d'une synchronisation complète
+(`remove_checkpoint`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+CHECKPOINT_PATH = os.path.join("data", "checkpoint.db")
+DEFAULT_CHECKPOINT_TTL_HOURS = 6
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS checkpoint_pages (
+    playlist_id TEXT NOT NULL,
+    items TEXT NOT NULL,
+    next_token TEXT,
+    page_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS checkpoint_pages_playlist ON checkpoint_pages (playlist_id);
+CREATE TABLE IF NOT EXISTS checkpoint_playlists (
+    playlist_id TEXT PRIMARY KEY,
+    items TEXT NOT NULL,
+    state TEXT
+);
+CREATE TABLE IF NOT EXISTS checkpoint_details (
+    video_id TEXT PRIMARY KEY,
+    detail TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoint_tabs (
+    tab TEXT PRIMARY KEY,
+    digest TEXT NOT NULL
+);
+"""
+
+_TABLES = ("checkpoint_pages", "checkpoint_playlists", "checkpoint_details", "checkpoint_tabs")
+
+
+def checkpoint_key(**inputs) -> str:
+    """Empreinte des paramètres d'une exécution (ordre des arguments indifférent)."""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def rows_digest(rows: list[list]) -> str:
+    """Empreinte du contenu d'un onglet."""
+    return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def remove_checkpoint(path: str) -> None:
+    """Supprime le point de reprise (synchronisation terminée)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class SyncCheckpoint:
+    """
+    Accès thread‑safe au point de reprise. À l'ouverture, un point de reprise
+    d'une autre exécution (`key` différente) ou plus ancien que `ttl_seconds`
+    est vidé ; `resumed` indique si des données ont été conservées.
+    """
+
+    def __init__(self, path: str, key: str, ttl_seconds: float, now: float | None = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+            try:
+                created_at = float(meta.get("created_at", ""))
+            except ValueError:
+                created_at = None
+            self.resumed = meta.get("key") == key and created_at is not None and now - created_at < ttl_seconds
+            if not self.resumed:
+                if meta:
+                    logging.info("Point de reprise %s ignoré (autres paramètres ou expiré).", path)
+                for table in _TABLES:
+                    self._conn.execute(f"DELETE FROM {table}")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [("key", key), ("created_at", repr(now))],
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # -- Playlists -------------------------------------------------------
+    def completed_playlist(self, playlist_id: str) -> tuple[list[dict], dict | None] | None:
+        """(items, état de pagination) d'une playlist déjà récupérée, ou None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT items, state FROM checkpoint_playlists WHERE playlist_id = ?", (playlist_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), json.loads(row[1]) if row[1] is not None else None
+
+    def playlist_progress(self, playlist_id: str) -> dict | None:
+        """
+        Parcours interrompu d'une playlist : `{"items", "pageToken", "pageSize"}`
+        (items des pages déjà reçues, jeton et taille de la page suivante), ou None.
+        """
+        with self._lock:
+            pages = self._conn.execute(
+                "SELECT items, next_token, page_size FROM checkpoint_pages WHERE playlist_id = ? ORDER BY rowid",
+                (playlist_id,),
+            ).fetchall()
+        if not pages:
+            return None
+        items = [item for page_items, _, _ in pages for item in json.loads(page_items)]
+        _, next_token, page_size = pages[-1]
+        return {"items": items, "pageToken": next_token, "pageSize": page_size}
+
+    def save_page(self, playlist_id: str, items: list[dict], next_token: str, page_size: int) -> None:
+        """Ajoute une page reçue et le jeton de la suivante au parcours de la playlist."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO checkpoint_pages (playlist_id, items, next_token, page_size) VALUES (?, ?, ?, ?)",
+                (playlist_id, json.dumps(items, ensure_ascii=False), next_token, page_size),
+            )
+
+    def reset_playlist(self, playlist_id: str) -> None:
+        """Oublie le parcours en cours d'une playlist (pagination reprise du début)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoint_pages WHERE playlist_id = ?", (playlist_id,))
+
+    def complete_playlist(self, playlist_id: str, items: list[dict], state: dict | None) -> None:
+        """Enregistre une playlist entièrement récupérée (remplace ses pages)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoint_pages WHERE playlist_id = ?", (playlist_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_playlists (playlist_id, items, state) VALUES (?, ?, ?)",
+                (
+                    playlist_id,
+                    json.dumps(items, ensure_ascii=False),
+                    json.dumps(state) if state is not None else None,
+                ),
+            )
+
+    # -- Détails ---------------------------------------------------------
+    def details(self) -> dict[str, dict]:
+        """Réponses `videos.list` déjà reçues, par videoId."""
+        with self._lock:
+            rows = self._conn.execute("SELECT video_id, detail FROM checkpoint_details").fetchall()
+        return {video_id: json.loads(detail) for video_id, detail in rows}
+
+    def save_details(self, details: dict[str, dict]) -> None:
+        if not details:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO checkpoint_details (video_id, detail) VALUES (?, ?)",
+                [(video_id, json.dumps(detail, ensure_ascii=False)) for video_id, detail in details.items()],
+            )
+
+    # -- Onglets ---------------------------------------------------------
+    def written_tabs(self) -> dict[str, str]:
+        """Empreinte du contenu de chaque onglet déjà écrit."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT tab, digest FROM checkpoint_tabs"))
+
+    def mark_tabs_written(self, digests: dict[str, str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO checkpoint_tabs (tab, digest) VALUES (?, ?)", list(digests.items())
+            )
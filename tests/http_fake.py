@@ -0,0 +1,30 @@
+"""
+Faux client HTTP pour les tests.
+
+`use_fake_session(monkeypatch, handler)` remplace `http_client._session` par un
+`FakeSession` via `monkeypatch` (la session d'origine est rétablie à la fin du
+test) et le renvoie. Chaque appel à `get` est enregistré dans `calls` puis
+délégué à `handler(url, params=..., headers=..., timeout=...)`, qui renvoie la
+réponse (`requests.Response`) ou lève l'exception à simuler.
+"""
+
+import http_client
+
+
+class FakeSession:
+    """Session minimale dont `get` délègue à une fonction de test."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append({"url": url, "params": dict(params or {}), "headers": headers, "timeout": timeout})
+        return self.handler(url, params=params, headers=headers, timeout=timeout)
+
+
+def use_fake_session(monkeypatch, handler):
+    """Installe un `FakeSession` (délégant à `handler`) pour la durée du test et le renvoie."""
+    session = FakeSession(handler)
+    monkeypatch.setattr(http_client, "_session", session)
+    return session
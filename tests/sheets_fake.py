@@ -0,0 +1,149 @@
+"""Faux client Google Sheets (API discovery) conservant les onglets en mémoire."""
+
+
+class _Call:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self, num_retries=0):
+        return self._result() if callable(self._result) else self._result
+
+
+def _sheet_name(range_):
+    name = range_.split("!")[0]
+    return name[1:-1] if name.startswith("'") else name
+
+
+def _start_row(range_):
+    cell = range_.split("!")[1] if "!" in range_ else "A1"
+    digits = "".join(ch for ch in cell.split(":")[0] if ch.isdigit())
+    return int(digits or 1) - 1
+
+
+def _end_row(range_):
+    cell = range_.split("!")[1] if "!" in range_ else ""
+    digits = "".join(ch for ch in cell.split(":")[1] if ch.isdigit()) if ":" in cell else ""
+    return int(digits) if digits else None
+
+
+class FakeSheetsService:
+    """Simule `spreadsheets()` et `spreadsheets().values()` et journalise les appels."""
+
+    def __init__(self, tabs=None):
+        self.tabs = {name: [list(row) for row in rows] for name, rows in (tabs or {}).items()}
+        self.sheet_ids = {name: index for index, name in enumerate(self.tabs)}
+        self.calls = []
+        # Nombre d'échecs à simuler pour `values.get` par plage
+        self.fail_ranges = {}
+
+    # -- spreadsheets() -------------------------------------------------
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return _Values(self)
+
+    def get(self, spreadsheetId, **kwargs):
+        self.calls.append(("get",))
+        return _Call(
+            lambda: {
+                "sheets": [
+                    {
+                        "properties": {
+                            "title": name,
+                            "sheetId": sheet_id,
+                            "gridProperties": {"rowCount": len(self.tabs.get(name, []))},
+                        }
+                    }
+                    for name, sheet_id in self.sheet_ids.items()
+                ]
+            }
+        )
+
+    def batchUpdate(self, spreadsheetId, body):
+        self.calls.append(("batchUpdate", body))
+        replies = []
+        for request in body["requests"]:
+            if "addSheet" in request:
+                title = request["addSheet"]["properties"]["title"]
+                self.sheet_ids[title] = len(self.sheet_ids)
+                self.tabs[title] = []
+                replies.append({"addSheet": {"properties": {"title": title, "sheetId": self.sheet_ids[title]}}})
+                continue
+            replies.append({})
+            (kind, payload), = request.items()
+            name = self._name_for(payload["range"]["sheetId"])
+            rows = self.tabs[name]
+            if kind == "updateCells":
+                rows.clear()
+            elif kind == "deleteDimension":
+                del rows[payload["range"]["startIndex"] : payload["range"]["endIndex"]]
+            elif kind == "insertDimension":
+                start, end = payload["range"]["startIndex"], payload["range"]["endIndex"]
+                rows[start:start] = [[] for _ in range(end - start)]
+        return _Call({"replies": replies})
+
+    def _name_for(self, sheet_id):
+        return next(name for name, value in self.sheet_ids.items() if value == sheet_id)
+
+    def write(self, range_, values):
+        rows = self.tabs[_sheet_name(range_)]
+        start = _start_row(range_)
+        while len(rows) < start + len(values):
+            rows.append([])
+        for offset, row in enumerate(values):
+            rows[start + offset] = list(row)
+
+    def read(self, range_):
+        rows = self.tabs.get(_sheet_name(range_), [])
+        while rows and not rows[-1]:
+            rows.pop()
+        window = rows[_start_row(range_) : _end_row(range_)]
+        while window and not window[-1]:
+            window = window[:-1]
+        return [list(row) for row in window]
+
+
+class _Values:
+    def __init__(self, service):
+        self.service = service
+
+    def get(self, spreadsheetId, range, **kwargs):
+        self.service.calls.append(("values.get", range))
+        if self.service.fail_ranges.get(range):
+            self.service.fail_ranges[range] -= 1
+            raise TimeoutError(f"lecture de {range} expirée")
+        return _Call(lambda: {"values": self.service.read(range)})
+
+    def batchGet(self, spreadsheetId, ranges, majorDimension="ROWS", **kwargs):
+        self.service.calls.append(("values.batchGet", list(ranges)))
+
+        def values(range_):
+            rows = self.service.read(range_)
+            if majorDimension != "COLUMNS":
+                return rows
+            width = max((len(row) for row in rows), default=0)
+            columns = [[row[i] if i < len(row) else "" for row in rows] for i in range(width)]
+            for column in columns:
+                while column and column[-1] == "":
+                    column.pop()
+            return columns
+
+        return _Call(lambda: {"valueRanges": [{"range": r, "values": values(r)} for r in ranges]})
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        self.service.calls.append(("values.update", range))
+        self.service.write(range, body["values"])
+        return _Call({})
+
+    def batchUpdate(self, spreadsheetId, body):
+        self.service.calls.append(("values.batchUpdate", [entry["range"] for entry in body["data"]]))
+        for entry in body["data"]:
+            self.service.write(entry["range"], entry["values"])
+        return _Call({})
+
+    def batchClear(self, spreadsheetId, body):
+        self.service.calls.append(("values.batchClear", list(body["ranges"])))
+        for range_ in body["ranges"]:
+            self.service.tabs[_sheet_name(range_)] = []
+        return _Call({})
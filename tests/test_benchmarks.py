@@ -0,0 +1,65 @@
+import json
+
+import main
+from benchmarks.bench_pipeline import STAGES, main_benchmark, run_pipeline
+from benchmarks.synthetic import SyntheticSheetsService, SyntheticYouTube, video_id
+
+
+def test_synthetic_playlist_pages_and_tokens():
+    youtube = SyntheticYouTube({"PLa": 120, "PLb": 3})
+    status, first = youtube.handle("/youtube/v3/playlistItems", {"playlistId": "PLa", "maxResults": 50})
+    assert status == 200
+    assert len(first["items"]) == 50
+    assert first["nextPageToken"] == "p50"
+    _, last = youtube.handle("/youtube/v3/playlistItems", {"playlistId": "PLa", "maxResults": 50, "pageToken": "p100"})
+    assert [item["snippet"]["position"] for item in last["items"]] == list(range(100, 120))
+    assert "nextPageToken" not in last
+    _, other = youtube.handle("/youtube/v3/playlistItems", {"playlistId": "PLb", "maxResults": 50})
+    assert other["items"][0]["contentDetails"]["videoId"] == video_id(120)
+    assert youtube.handle("/youtube/v3/playlistItems", {"playlistId": "PLa", "pageToken": "bad"})[0] == 400
+    assert youtube.handle("/youtube/v3/playlistItems", {"playlistId": "PLx"})[0] == 404
+
+
+def test_synthetic_sheets_round_trip_with_diff_writes():
+    sheets = SyntheticSheetsService()
+    rows = [[f"avatar{i}", f"title{i}", f"link{i}"] for i in range(5)]
+    main.write_category(sheets, "sid", "AllVideos", rows)
+    updated = rows[:2] + [["avatar9", "title9", "link9"]] + rows[2:4]
+    main.write_category(sheets, "sid", "AllVideos", updated, diff=True)
+    assert sheets.backend.read("AllVideos!A1:P") == [main.HEADERS] + updated
+    assert sheets.calls["values.batchGet"] == 1
+
+
+def test_run_pipeline_reports_every_stage(tmp_path):
+    avatars = dict(main.channel_avatar_cache)
+    result = run_pipeline(120, str(tmp_path))
+
+    assert main.channel_avatar_cache == avatars
+    assert result["size"] == 120
+    assert result["rows"] == 120
+    stages = result["stages"]
+    assert list(stages) == STAGES
+    assert stages["fetch"]["httpCalls"] == {"playlistItems": 3}
+    assert stages["details"]["httpCalls"] == {"videos": 3}
+    assert stages["transform"]["httpCalls"] == {"channels": 3}
+    assert stages["write_category"]["httpCalls"] == {
+        "sheets.get": 1,
+        "sheets.batchUpdate": 1,
+        "sheets.values.batchUpdate": 1,
+    }
+    assert stages["json_export"]["requests"] == 0
+    assert all(stage["payloadBytes"] > 0 for name, stage in stages.items() if name != "json_export")
+    assert all(stage["seconds"] >= 0 and stage["peakBytes"] >= 0 for stage in stages.values())
+    assert len(json.loads((tmp_path / "videos.json").read_text(encoding="utf-8"))) == 121
+    assert (tmp_path / "public" / "shards" / "manifest.json").exists()
+
+
+def test_main_benchmark_saves_and_compares_results(tmp_path, capsys):
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    assert main_benchmark(["--sizes", "60", "--output", str(first)]) == 0
+    assert main_benchmark(["--sizes", "60", "--output", str(second), "--compare", str(first)]) == 0
+
+    report = json.loads(second.read_text(encoding="utf-8"))
+    assert [result["size"] for result in report["results"]] == [60]
+    assert "(durée)" in capsys.readouterr().out
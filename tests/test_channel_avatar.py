@@ -1,11 +1,12 @@
 import requests
-from main import get_channel_avatar, DEFAULT_AVATAR_URL, channel_avatar_cache
+from main import get_channel_avatar, fetch_channel_avatars, DEFAULT_AVATAR_URL, channel_avatar_cache
+from http_fake import use_fake_session
 
 
 def test_get_channel_avatar_success(monkeypatch):
     channel_avatar_cache.clear()
 
-    def fake_get(url, timeout):
+    def fake_get(url, params=None, headers=None, timeout=None):
         class Response:
             def raise_for_status(self):
                 pass
@@ -25,7 +26,7 @@ def test_get_channel_avatar_success(monkeypatch):
 
         return Response()
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    use_fake_session(monkeypatch, fake_get)
     url = get_channel_avatar("abc", api_key="key")
     assert url == "http://example.com/avatar.jpg"
 
@@ -33,9 +34,73 @@ def test_get_channel_avatar_success(monkeypatch):
 def test_get_channel_avatar_error_returns_default(monkeypatch):
     channel_avatar_cache.clear()
 
-    def fake_get(url, timeout):
+    def fake_get(url, params=None, headers=None, timeout=None):
         raise requests.RequestException("boom")
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    use_fake_session(monkeypatch, fake_get)
     url = get_channel_avatar("abc", api_key="key")
     assert url == DEFAULT_AVATAR_URL
+
+
+def test_get_channel_avatar_without_channel_id_skips_request(monkeypatch):
+    channel_avatar_cache.clear()
+    session = use_fake_session(monkeypatch, lambda url, **kwargs: None)
+
+    assert get_channel_avatar("", api_key="key") == DEFAULT_AVATAR_URL
+    assert session.calls == []
+    assert "" not in channel_avatar_cache
+
+
+def test_fetch_channel_avatars_batches_by_fifty(monkeypatch):
+    channel_avatar_cache.clear()
+    channel_avatar_cache["cached"] = "http://example.com/cached.jpg"
+    requested = []
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        ids = params["id"].split(",")
+        requested.append(ids)
+
+        class Response:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {
+                    "items": [
+                        {"id": cid, "snippet": {"thumbnails": {"default": {"url": f"http://example.com/{cid}.jpg"}}}}
+                        for cid in ids
+                        if cid != "UC7"
+                    ]
+                }
+
+        return Response()
+
+    use_fake_session(monkeypatch, fake_get)
+    channel_ids = [f"UC{i}" for i in range(120)] + ["UC1", "cached", ""]
+    avatars = fetch_channel_avatars(channel_ids, api_key="key")
+
+    assert [len(ids) for ids in requested] == [50, 50, 20]
+    assert avatars["UC1"] == "http://example.com/UC1.jpg"
+    assert avatars["UC7"] == DEFAULT_AVATAR_URL
+    assert avatars["cached"] == "http://example.com/cached.jpg"
+    assert get_channel_avatar("UC99", api_key="key") == "http://example.com/UC99.jpg"
+    assert len(requested) == 3
+
+
+def test_avatar_cache_persists_successful_entries_with_ttl_and_eviction(tmp_path):
+    import main
+
+    path = tmp_path / "avatars.json"
+    channel_avatar_cache.clear()
+    main.channel_avatar_fetched_at.clear()
+    channel_avatar_cache.update({"old": "u-old", "mid": "u-mid", "new": "u-new", "failed": DEFAULT_AVATAR_URL})
+    main.channel_avatar_fetched_at.update({"old": 1_000.0, "mid": 2_000.0, "new": 3_000.0})
+
+    main.save_avatar_cache(str(path), max_entries=2)
+    channel_avatar_cache.clear()
+    main.channel_avatar_fetched_at.clear()
+    loaded = main.load_avatar_cache(str(path), ttl_days=1, now=2_000.0 + 86_400)
+
+    assert loaded == 2
+    assert channel_avatar_cache == {"mid": "u-mid", "new": "u-new"}
+    assert main.load_avatar_cache(str(path), ttl_days=1, now=3_000.0 + 86_401) == 0
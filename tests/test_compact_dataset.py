@@ -0,0 +1,48 @@
+import gzip
+import json
+
+from compact_dataset import decode_dataset, encode_rows, write_compact_dataset
+from main import HEADERS
+
+
+def make_row(video_id, channel="COLORS", views="10", thumbnail=None):
+    row = [""] * len(HEADERS)
+    row[HEADERS.index("channelAvatar")] = f"https://yt3.ggpht.com/{channel}"
+    row[HEADERS.index("title")] = f"Vidéo {video_id}"
+    row[HEADERS.index("link")] = f"https://www.youtube.com/watch?v={video_id}"
+    row[HEADERS.index("channel")] = channel
+    row[HEADERS.index("views")] = views
+    row[HEADERS.index("thumbnail")] = thumbnail or f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
+    row[HEADERS.index("playlistId")] = "PL1"
+    return row
+
+
+def test_encode_rows_dictionary_encodes_and_round_trips():
+    rows = [
+        make_row("aaaaaaaaaaa"),
+        make_row("bbbbbbbbbbb", views="007"),
+        make_row("ccccccccccc", channel="Other", thumbnail="https://via.placeholder.com/480x360"),
+        make_row("ddddddddddd")[:3],
+    ]
+
+    dataset = encode_rows(HEADERS, rows)
+
+    assert dataset["dictionaries"]["channel"] == ["COLORS", "Other", ""]
+    assert dataset["columns"]["link"][0] == "aaaaaaaaaaa"
+    assert dataset["columns"]["views"][:2] == [10, None]
+    assert dataset["exceptions"]["views"] == {"1": "007", "3": ""}
+    assert dataset["exceptions"]["thumbnail"] == {"2": "https://via.placeholder.com/480x360", "3": ""}
+    padded = [row + [""] * (len(HEADERS) - len(row)) for row in rows]
+    assert decode_dataset(json.loads(json.dumps(dataset))) == padded
+
+
+def test_write_compact_dataset_writes_precompressed_siblings(tmp_path):
+    path = tmp_path / "videos.compact.json"
+    rows = [make_row("aaaaaaaaaaa")]
+
+    assert write_compact_dataset(str(path), HEADERS, rows) is True
+
+    payload = path.read_bytes()
+    assert gzip.decompress((tmp_path / "videos.compact.json.gz").read_bytes()) == payload
+    assert decode_dataset(json.loads(payload)) == rows
+    assert write_compact_dataset(str(path), HEADERS, rows) is False
@@ -0,0 +1,54 @@
+import csv
+import json
+import os
+
+import pytest
+
+from dataset_writer import write_csv_rows, write_json_rows
+
+ROWS = [["title", "channel"], ["Vidéo 1", "Chaîne"], ["Vidéo 2", "a,\"b\""], []]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_write_json_rows_matches_json_dump(tmp_path, indent):
+    path = tmp_path / "out" / "videos.json"
+
+    assert write_json_rows(str(path), iter(ROWS), indent=indent) is True
+
+    assert path.read_text(encoding="utf-8") == json.dumps(ROWS, ensure_ascii=False, indent=indent)
+
+
+def test_write_csv_rows_matches_csv_writer(tmp_path):
+    path = tmp_path / "videos.csv"
+
+    write_csv_rows(str(path), ROWS)
+
+    with open(path, newline="", encoding="utf-8") as csv_file:
+        assert list(csv.reader(csv_file)) == ROWS
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    path = tmp_path / "videos.json"
+    write_json_rows(str(path), ROWS)
+    os.utime(path, (0, 0))
+
+    assert write_json_rows(str(path), ROWS) is False
+    assert path.stat().st_mtime == 0
+    assert write_json_rows(str(path), ROWS[:2]) is True
+    assert json.loads(path.read_text(encoding="utf-8")) == ROWS[:2]
+    assert os.listdir(tmp_path) == ["videos.json"]
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "videos.json"
+    write_json_rows(str(path), ROWS)
+
+    def broken_rows():
+        yield ["partial"]
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        write_json_rows(str(path), broken_rows())
+
+    assert json.loads(path.read_text(encoding="utf-8")) == ROWS
+    assert os.listdir(tmp_path) == ["videos.json"]
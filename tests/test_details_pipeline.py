@@ -0,0 +1,74 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import main
+from http_fake import use_fake_session
+
+
+def item(video_id):
+    return {"id": f"item-{video_id}", "contentDetails": {"videoId": video_id}}
+
+
+def test_pipeline_sends_full_batches_while_paginating(monkeypatch):
+    batches = []
+
+    def fake_details(video_ids, api_key, **kwargs):
+        batches.append(list(video_ids))
+        return {video_id: {"id": video_id} for video_id in video_ids}
+
+    monkeypatch.setattr(main, "fetch_videos_details", fake_details)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pipeline = main.VideoDetailsPipeline("key", executor, batch_size=2)
+        pipeline.add_items([item("a"), item("b"), item("a"), item("c")])
+        executor.submit(lambda: None).result()
+        assert batches == [["a", "b"]]
+        details = pipeline.collect(["a", "b", "c", "d"])
+
+    assert batches == [["a", "b"], ["c", "d"]]
+    assert sorted(details) == ["a", "b", "c", "d"]
+
+
+def test_fetch_all_playlist_items_reports_each_page(monkeypatch):
+    responses = [
+        {"items": [item("a"), item("b")], "nextPageToken": "p2"},
+        {"items": [item("b"), item("c")]},
+    ]
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(responses.pop(0)).encode()
+        return response
+
+    use_fake_session(monkeypatch, fake_get)
+    pages = []
+    items = main.fetch_all_playlist_items("playlist", "key", on_page=pages.append)
+
+    assert [[it["contentDetails"]["videoId"] for it in page] for page in pages] == [["a", "b"], ["c"]]
+    assert [it["contentDetails"]["videoId"] for it in items] == ["a", "b", "c"]
+
+
+def test_pipeline_batches_do_not_depend_on_page_arrival_order(monkeypatch):
+    def page(playlist_id, video_ids):
+        return [{**item(video_id), "snippet": {"playlistId": playlist_id}} for video_id in video_ids]
+
+    pages = [page("PL1", ["a", "b", "c"]), page("PL2", ["x", "y", "z"]), page("PL1", ["d"])]
+
+    def batches_for(order):
+        batches = []
+
+        def fake_details(video_ids, api_key, **kwargs):
+            batches.append(list(video_ids))
+            return {}
+
+        monkeypatch.setattr(main, "fetch_videos_details", fake_details)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pipeline = main.VideoDetailsPipeline("key", executor, batch_size=2)
+            for index in order:
+                pipeline.add_items(pages[index])
+            pipeline.collect([])
+        return sorted(batches)
+
+    assert batches_for([0, 1, 2]) == batches_for([1, 0, 2]) == [["a", "b"], ["c", "d"], ["x", "y"], ["z"]]
@@ -0,0 +1,61 @@
+import csv
+import importlib.util
+import json
+import pathlib
+
+from compact_dataset import decode_dataset
+from sheets_fake import FakeSheetsService
+
+_SCRIPT = pathlib.Path(__file__).resolve().parent.parent / "scripts" / "export_sheet.py"
+_spec = importlib.util.spec_from_file_location("export_sheet", _SCRIPT)
+export_sheet = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(export_sheet)
+
+TABS = {
+    "0-5min": [["avatar", "title", "link"], ["a", "Vidéo 1", "l1"], ["a", "Inconnu", "l2"]],
+    "5-10min": [["avatar", "title", "link"], ["b", "Vidéo 2"]],
+}
+
+
+def test_fetch_ranges_reads_all_ranges_in_one_batch_get():
+    service = FakeSheetsService(TABS)
+
+    ranges_values = export_sheet.fetch_ranges(service, "sheet", ["'0-5min'!A1:Z", "'5-10min'!A1:Z"])
+
+    assert [call[0] for call in service.calls] == ["values.batchGet"]
+    assert export_sheet.merge_ranges(ranges_values) == [
+        ["avatar", "title", "link"],
+        ["a", "Vidéo 1", "l1"],
+        ["b", "Vidéo 2"],
+    ]
+
+
+def test_fetch_ranges_transposes_columns():
+    service = FakeSheetsService(TABS)
+
+    rows_major = export_sheet.fetch_ranges(service, "sheet", ["'0-5min'!A1:Z", "'5-10min'!A1:Z"])
+    columns_major = export_sheet.fetch_ranges(
+        service, "sheet", ["'0-5min'!A1:Z", "'5-10min'!A1:Z"], major_dimension="COLUMNS"
+    )
+
+    assert columns_major == rows_major
+
+
+def test_chunked_export_streams_all_outputs(tmp_path):
+    header = ["avatar", "title", "link"]
+    rows = [header] + [["a", f"Vidéo {i}" if i % 3 else "Inconnu", f"l{i}"] for i in range(1, 12)]
+    service = FakeSheetsService({"AllVideos": rows})
+    service.fail_ranges["AllVideos!A5:Z8"] = 1
+
+    ranges_rows = [export_sheet.iter_range_rows(service, "sheet", "AllVideos!A1:Z", chunk_rows=4)]
+    count = export_sheet.write_outputs(export_sheet.iter_merged_rows(ranges_rows), out_dir=tmp_path)
+
+    expected = [header] + [row for row in rows[1:] if row[1] != "Inconnu"]
+    assert count == len(expected)
+    assert json.loads((tmp_path / "videos.json").read_text(encoding="utf-8")) == expected
+    with open(tmp_path / "videos.csv", newline="", encoding="utf-8") as csv_file:
+        assert list(csv.reader(csv_file)) == expected
+    compact = json.loads((tmp_path / "videos.compact.json").read_text(encoding="utf-8"))
+    assert decode_dataset(compact) == expected[1:]
+    windows = [call[1] for call in service.calls if call[0] == "values.get"]
+    assert windows == ["AllVideos!A1:Z4", "AllVideos!A5:Z8", "AllVideos!A5:Z8", "AllVideos!A9:Z12"]
@@ -0,0 +1,129 @@
+import json
+import random
+
+import pytest
+
+import export_data
+import http_client
+import main
+from benchmarks.fake_google_api import FakeGoogleAPI, FaultPlan, parse_latency
+from benchmarks.synthetic import SheetsBackend, SyntheticYouTube
+
+PLAYLIST = "PLfake0000000000000001"
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    servers = []
+
+    def start(playlists=None, sheets=None, faults=None):
+        api = FakeGoogleAPI(SyntheticYouTube(playlists or {PLAYLIST: 120}), sheets, faults).start()
+        servers.append(api)
+        for name, value in api.environ().items():
+            monkeypatch.setattr(http_client, name, value)
+        monkeypatch.setattr(http_client, "_session", None)
+        monkeypatch.setattr(main.time, "sleep", lambda seconds: None)
+        return api
+
+    yield start
+    for api in servers:
+        api.stop()
+
+
+@pytest.mark.parametrize(
+    "spec, low, high",
+    [("0", 0, 0), ("fixed:20", 0.02, 0.02), ("uniform:10:30", 0.01, 0.03), ("normal:50:5", 0, 1), ("exp:10", 0, 1)],
+)
+def test_parse_latency(spec, low, high):
+    draw = parse_latency(spec)
+    rng = random.Random(1)
+    assert all(low <= draw(rng) <= high for _ in range(50))
+
+
+def test_parse_latency_rejects_unknown_distribution():
+    with pytest.raises(ValueError):
+        parse_latency("pareto:3")
+
+
+def test_fault_plan_quota_bursts_and_stale_tokens():
+    plan = FaultPlan(youtube_quota=2, sheets_quota=1)
+    assert plan.decide("videos", {})[1] is None
+    assert plan.decide("channels", {})[1] is None
+    status, body = plan.decide("videos", {})[1]
+    assert (status, body["error"]["errors"][0]["reason"]) == (403, "quotaExceeded")
+    assert plan.decide("sheets.get", {})[1] is None
+    assert plan.decide("sheets.get", {})[1][0] == 429
+
+    burst = FaultPlan(error_rate=1.0, error_burst=3, error_scope="sheets")
+    assert burst.decide("videos", {})[1] is None
+    assert [burst.decide("sheets.get", {})[1][0] in (500, 503) for _ in range(3)] == [True] * 3
+
+    stale = FaultPlan(stale_token_rate=1.0)
+    assert stale.decide("playlistItems", {})[1] is None
+    assert stale.decide("playlistItems", {"pageToken": "p50"})[1][0] == 400
+    assert stale.stats()["faults"] == {"invalidPageToken": 1}
+
+
+def test_youtube_fetches_survive_injected_errors(fake_api):
+    api = fake_api(faults=FaultPlan(error_rate=0.2, error_burst=2, latency="uniform:0:2", seed=7))
+
+    items = main.fetch_all_playlist_items(PLAYLIST, "key")
+    details = main.fetch_videos_details([item["contentDetails"]["videoId"] for item in items], "key")
+
+    assert [item["snippet"]["position"] for item in items] == list(range(120))
+    assert len(details) == 120
+    stats = api.faults.stats()
+    assert sum(stats["faults"].values()) > 0
+    assert stats["youtubeUnits"] == sum(stats["requests"].values())
+
+
+def test_sheets_endpoints_through_discovery_client(fake_api):
+    from google.auth.credentials import AnonymousCredentials
+    from googleapiclient.discovery import build
+
+    api = fake_api()
+    service = build(
+        "sheets", "v4", credentials=AnonymousCredentials(), client_options=http_client.sheets_client_options()
+    )
+    rows = [[f"avatar{i}", f"title{i}", f"link{i}"] for i in range(4)]
+    main.write_category(service, "sid", "AllVideos", rows)
+    main.write_category(service, "sid", "AllVideos", rows[:1] + rows[2:], diff=True)
+
+    assert api.sheets.read("AllVideos!A1:P") == [main.HEADERS] + rows[:1] + rows[2:]
+    assert api.faults.stats()["requests"]["sheets.values.batchGet"] == 1
+
+
+def test_export_data_reads_seeded_sheet(fake_api, monkeypatch, tmp_path):
+    sheets = SheetsBackend()
+    sheets.set_tab("AllVideos", [export_data.HEADERS] + [[f"a{i}", f"t{i}"] for i in range(25)])
+    api = fake_api(sheets=sheets)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SPREADSHEET_ID", "A" * 44)
+    monkeypatch.setenv("YOUTUBE_API_KEY", "key")
+    monkeypatch.setattr("sys.argv", ["export_data.py", "--chunk-rows", "10", "--max-in-flight", "2"])
+
+    assert export_data.main() == 0
+    assert json.loads((tmp_path / "data" / "videos.json").read_text(encoding="utf-8")) == sheets.read("AllVideos")
+    assert api.faults.stats()["requests"]["sheets.values.get"] >= 3
+
+
+def test_sync_videos_runs_unchanged_against_fake_server(fake_api, monkeypatch, tmp_path):
+    api = fake_api(faults=FaultPlan(error_rate=0.1, error_scope="youtube", seed=3))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("YOUTUBE_API_KEY", "key")
+    monkeypatch.setenv("SPREADSHEET_ID", "A" * 44)
+    monkeypatch.setenv("SERVICE_ACCOUNT_JSON", json.dumps(api.service_account_info()))
+    monkeypatch.setattr(main, "channel_avatar_cache", {})
+
+    main.sync_videos(
+        PLAYLIST,
+        state_db_path=None,
+        response_cache_path=None,
+        avatar_cache_path=None,
+        public_data_dir=str(tmp_path / "public"),
+    )
+
+    all_videos = api.sheets.read("AllVideos!A1:P")
+    assert all_videos[0] == main.HEADERS
+    assert [row[14] for row in all_videos[1:]] == [str(position) for position in range(120)]
+    assert json.loads((tmp_path / "data" / "videos.json").read_text(encoding="utf-8")) == all_videos
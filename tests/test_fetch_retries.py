@@ -3,16 +3,17 @@ import json
 import requests
 import pytest
 from main import fetch_all_playlist_items, fetch_videos_details, load_cached_playlist_items
+from http_fake import use_fake_session
 
 
 def test_fetch_all_playlist_items_max_retries(monkeypatch, caplog):
     calls = {"count": 0}
 
-    def fake_get(url, params=None, timeout=None):
+    def fake_get(url, params=None, headers=None, timeout=None):
         calls["count"] += 1
         raise requests.RequestException("boom")
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    use_fake_session(monkeypatch, fake_get)
     with caplog.at_level(logging.ERROR):
         with pytest.raises(RuntimeError):
             fetch_all_playlist_items("playlist", "key", max_retries=3)
@@ -29,7 +30,7 @@ def test_fetch_all_playlist_items_restarts_after_stale_page_token(monkeypatch, c
     ]
     requested_pages = []
 
-    def fake_get(url, params=None, timeout=None):
+    def fake_get(url, params=None, headers=None, timeout=None):
         requested_pages.append((params["maxResults"], params.get("pageToken")))
         payload, status = responses.pop(0)
         response = requests.Response()
@@ -38,13 +39,13 @@ def test_fetch_all_playlist_items_restarts_after_stale_page_token(monkeypatch, c
         response._content = json.dumps(payload).encode()
         return response
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    use_fake_session(monkeypatch, fake_get)
     with caplog.at_level(logging.WARNING):
         items = fetch_all_playlist_items("playlist", "key")
 
     assert [item["id"] for item in items] == ["fresh-1", "fresh-2"]
-    assert requested_pages == [(50, None), (50, "stale"), (25, None), (25, "fresh")]
-    assert "pages de 25 éléments" in caplog.text
+    assert requested_pages == [(50, None), (50, "stale"), (50, None), (50, "fresh")]
+    assert "reprise depuis le début" in caplog.text
 
 
 def test_load_cached_playlist_items(tmp_path):
@@ -71,11 +72,106 @@ def test_load_cached_playlist_items(tmp_path):
 def test_fetch_videos_details_max_retries(monkeypatch):
     calls = {"count": 0}
 
-    def fake_get(url, params=None, timeout=None):
+    def fake_get(url, params=None, headers=None, timeout=None):
         calls["count"] += 1
         raise requests.RequestException("boom")
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    use_fake_session(monkeypatch, fake_get)
     details = fetch_videos_details(["id1"], "key", max_retries=3)
     assert details == {}
     assert calls["count"] == 3
+
+
+def playlist_pages(versions, stale_tokens):
+    """
+    Faux `playlistItems` paginé par positions (jetons « pN ») ; `versions` est
+    une liste de listes de videoId, la version suivante étant servie après
+    chaque jeton de `stale_tokens` (rejeté une fois par un 400).
+    """
+    state = {"version": 0}
+    requested = []
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        token = params.get("pageToken")
+        requested.append(token)
+        response = requests.Response()
+        response.url = url
+        if token in stale_tokens:
+            stale_tokens.remove(token)
+            state["version"] += 1
+            response.status_code = 400
+            response._content = b"{}"
+            return response
+        video_ids = versions[state["version"]]
+        start = int(token[1:]) if token else 0
+        end = min(start + params["maxResults"], len(video_ids))
+        payload = {
+            "items": [
+                {
+                    "id": f"item-{video_ids[position]}",
+                    "contentDetails": {"videoId": video_ids[position]},
+                    "snippet": {"position": position},
+                }
+                for position in range(start, end)
+            ],
+            "pageInfo": {"totalResults": len(video_ids)},
+        }
+        if end < len(video_ids):
+            payload["nextPageToken"] = f"p{end}"
+        response.status_code = 200
+        response._content = json.dumps(payload).encode()
+        return response
+
+    return fake_get, requested
+
+
+def test_stale_page_token_keeps_items_already_fetched(monkeypatch):
+    video_ids = [f"v{index:03d}" for index in range(230)]
+    fake_get, requested = playlist_pages([video_ids, video_ids], ["p150"])
+    use_fake_session(monkeypatch, fake_get)
+    pages = []
+
+    items = fetch_all_playlist_items("playlist", "key", on_page=pages.append)
+
+    assert [item["contentDetails"]["videoId"] for item in items] == video_ids
+    assert [item["snippet"]["position"] for item in items] == list(range(230))
+    # Les 150 vidéos déjà reçues ne sont transmises qu'une fois
+    assert [item["contentDetails"]["videoId"] for page in pages for item in page] == video_ids
+    # Reprise au jeton de la page précédente : une seule requête de plus
+    assert requested == [None, "p50", "p100", "p150", "p100", "p150", "p200"]
+    assert len(requested) == 5 + 2
+
+
+def test_stale_previous_token_restarts_from_first_page(monkeypatch):
+    video_ids = [f"v{index:03d}" for index in range(230)]
+    stale_tokens = ["p150"]
+    fake_get, requested = playlist_pages([video_ids] * 3, stale_tokens)
+
+    def expiring_get(url, params=None, headers=None, timeout=None):
+        response = fake_get(url, params=params, headers=headers, timeout=timeout)
+        if params.get("pageToken") == "p150" and response.status_code == 400:
+            # Le jeton de la page précédente expire à son tour
+            stale_tokens.append("p100")
+        return response
+
+    use_fake_session(monkeypatch, expiring_get)
+    pages = []
+
+    items = fetch_all_playlist_items("playlist", "key", on_page=pages.append)
+
+    assert [item["contentDetails"]["videoId"] for item in items] == video_ids
+    assert [item["contentDetails"]["videoId"] for page in pages for item in page] == video_ids
+    assert requested == [None, "p50", "p100", "p150", "p100", None, "p50", "p100", "p150", "p200"]
+
+
+def test_stale_page_token_after_playlist_change_matches_full_fetch(monkeypatch):
+    before = [f"v{index:03d}" for index in range(120)]
+    after = before[:70] + ["new"] + before[70:]
+    fake_get, requested = playlist_pages([before, after], ["p100"])
+    use_fake_session(monkeypatch, fake_get)
+
+    items = fetch_all_playlist_items("playlist", "key")
+
+    assert [item["contentDetails"]["videoId"] for item in items] == after
+    assert [item["snippet"]["position"] for item in items] == list(range(121))
+    assert requested == [None, "p50", "p100", "p50", "p100"]
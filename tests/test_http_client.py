@@ -0,0 +1,37 @@
+import json
+
+import requests
+
+import http_client
+import export_data
+from http_fake import use_fake_session
+
+
+def test_create_session_bounds_connections_per_host():
+    session = http_client.create_session(pool_size=3, max_per_host=2, keep_alive=False)
+    adapter = session.get_adapter("https://www.googleapis.com/youtube/v3/videos")
+
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 2
+    assert adapter._pool_block is True
+    assert session.headers["Connection"] == "close"
+
+
+def test_get_session_is_shared(monkeypatch):
+    monkeypatch.setattr(http_client, "_session", None)
+    assert http_client.get_session() is http_client.get_session()
+
+
+def test_fetch_sheet_values_uses_shared_client(monkeypatch):
+    def fake_get(url, params=None, headers=None, timeout=None):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"values": [["title"], ["video"]]}).encode()
+        return response
+
+    session = use_fake_session(monkeypatch, fake_get)
+    values = export_data.fetch_sheet_values("sheet", "key", "AllVideos!A1:P")
+
+    assert values == [["title"], ["video"]]
+    assert session.calls[0]["timeout"] == http_client.DEFAULT_TIMEOUT
+    assert "AllVideos%21A1%3AP" in session.calls[0]["url"]
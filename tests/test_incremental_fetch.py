@@ -0,0 +1,128 @@
+import json
+
+import requests
+
+import main
+from http_fake import use_fake_session
+from state_store import StateStore
+
+
+def vid(n):
+    return f"vid{n:08d}"
+
+
+def serve_playlist(monkeypatch, video_ids, page_size=50):
+    """Sert `video_ids` comme playlistItems paginée par jetons `tok-<offset>`."""
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        offset = int(params.get("pageToken", "tok-0").split("-")[1])
+        size = params["maxResults"]
+        page = video_ids[offset : offset + size]
+        payload = {
+            "items": [
+                {"id": f"item-{video_id}", "contentDetails": {"videoId": video_id}, "snippet": {"position": offset + i}}
+                for i, video_id in enumerate(page)
+            ],
+            "pageInfo": {"totalResults": len(video_ids)},
+        }
+        if offset + size < len(video_ids):
+            payload["nextPageToken"] = f"tok-{offset + size}"
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(payload).encode()
+        return response
+
+    return use_fake_session(monkeypatch, fake_get)
+
+
+def write_snapshot(path, items, playlist_id="PL1"):
+    rows = [main.HEADERS]
+    for item in items:
+        row = [""] * len(main.HEADERS)
+        row[main.HEADERS.index("link")] = f"https://www.youtube.com/watch?v={item['contentDetails']['videoId']}"
+        row[main.HEADERS.index("playlistPosition")] = str(item["snippet"]["position"])
+        row[main.HEADERS.index("playlistId")] = playlist_id
+        rows.append(row)
+    path.write_text(json.dumps(rows))
+
+
+def first_run(monkeypatch, tmp_path, old_ids):
+    serve_playlist(monkeypatch, old_ids)
+    state = {}
+    items = main.fetch_all_playlist_items("PL1", "key", playlist_state=state)
+    cache_path = tmp_path / "videos.json"
+    write_snapshot(cache_path, items)
+    return state, str(cache_path)
+
+
+def positions(items):
+    return [(item["contentDetails"]["videoId"], item["snippet"]["position"]) for item in items]
+
+
+def test_incremental_fetch_stops_after_new_items_at_top(monkeypatch, tmp_path):
+    old_ids = [vid(i) for i in range(200)]
+    state, cache_path = first_run(monkeypatch, tmp_path, old_ids)
+    new_ids = [vid(1000 + i) for i in range(3)] + old_ids
+    session = serve_playlist(monkeypatch, new_ids)
+
+    items = main.fetch_all_playlist_items("PL1", "key", cache_path=cache_path, playlist_state=state)
+
+    # Première page, puis fin de la playlist relue pour vérification
+    assert [call["params"].get("pageToken") for call in session.calls] == [None, "tok-150", "tok-200"]
+    assert positions(items) == [(video_id, i) for i, video_id in enumerate(new_ids)]
+    assert state["PL1"]["total"] == 203
+
+
+def test_incremental_fetch_jumps_to_last_known_page_for_appends(monkeypatch, tmp_path):
+    old_ids = [vid(i) for i in range(200)]
+    state, cache_path = first_run(monkeypatch, tmp_path, old_ids)
+    assert state["PL1"]["tailToken"] == "tok-150"
+    new_ids = old_ids + [vid(1000 + i) for i in range(3)]
+    session = serve_playlist(monkeypatch, new_ids)
+
+    items = main.fetch_all_playlist_items("PL1", "key", cache_path=cache_path, playlist_state=state)
+
+    assert [call["params"].get("pageToken") for call in session.calls] == [None, "tok-150", "tok-200"]
+    assert positions(items) == [(video_id, i) for i, video_id in enumerate(new_ids)]
+    assert state["PL1"]["tailToken"] == "tok-200"
+
+
+def test_incremental_fetch_falls_back_to_full_walk_on_reorder(monkeypatch, tmp_path):
+    old_ids = [vid(i) for i in range(120)]
+    state, cache_path = first_run(monkeypatch, tmp_path, old_ids)
+    new_ids = [old_ids[1], old_ids[0]] + old_ids[2:]
+    session = serve_playlist(monkeypatch, new_ids)
+
+    items = main.fetch_all_playlist_items("PL1", "key", cache_path=cache_path, playlist_state=state)
+
+    assert positions(items) == [(video_id, i) for i, video_id in enumerate(new_ids)]
+    assert len(session.calls) == 4
+
+
+def test_incremental_fetch_detects_deletion_offset_by_tail_append(monkeypatch, tmp_path):
+    old_ids = [vid(i) for i in range(200)]
+    state, cache_path = first_run(monkeypatch, tmp_path, old_ids)
+    new_ids = [video_id for video_id in old_ids if video_id != vid(100)] + [vid(1000)]
+    serve_playlist(monkeypatch, new_ids)
+
+    items = main.fetch_all_playlist_items("PL1", "key", cache_path=cache_path, playlist_state=state)
+
+    assert positions(items) == [(video_id, i) for i, video_id in enumerate(new_ids)]
+    assert state["PL1"]["total"] == 200 and state["PL1"]["tailToken"] == "tok-150"
+
+
+def test_incremental_fetch_reads_known_items_from_state_store(monkeypatch, tmp_path):
+    old_ids = [vid(i) for i in range(200)]
+    serve_playlist(monkeypatch, old_ids)
+    state = {}
+    with StateStore(str(tmp_path / "state.db"), None) as store:
+        store.replace_playlist_items("PL1", main.fetch_all_playlist_items("PL1", "key", playlist_state=state))
+        new_ids = [vid(1000)] + old_ids
+        session = serve_playlist(monkeypatch, new_ids)
+
+        items = main.fetch_all_playlist_items(
+            "PL1", "key", cache_path=str(tmp_path / "missing.json"), playlist_state=state, store=store
+        )
+
+    assert [call["params"].get("pageToken") for call in session.calls] == [None, "tok-150", "tok-200"]
+    assert positions(items) == [(video_id, i) for i, video_id in enumerate(new_ids)]
@@ -0,0 +1,41 @@
+import threading
+import time
+
+import pytest
+
+import main
+
+
+def test_fetch_playlists_items_runs_concurrently_and_keeps_order(monkeypatch):
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_fetch(playlist_id, api_key, **kwargs):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05 if playlist_id == "PL1" else 0.01)
+        with lock:
+            active["now"] -= 1
+        return [{"id": playlist_id}]
+
+    monkeypatch.setattr(main, "fetch_all_playlist_items", fake_fetch)
+
+    results = main.fetch_playlists_items(["PL1", "PL2", "PL3", "PL4"], "key", max_workers=2)
+
+    assert [playlist_id for playlist_id, _ in results] == ["PL1", "PL2", "PL3", "PL4"]
+    assert [items[0]["id"] for _, items in results] == ["PL1", "PL2", "PL3", "PL4"]
+    assert active["max"] == 2
+
+
+def test_fetch_playlists_items_propagates_failure(monkeypatch, caplog):
+    def fake_fetch(playlist_id, api_key, **kwargs):
+        if playlist_id == "PL2":
+            raise RuntimeError("boom")
+        return [{"id": playlist_id}]
+
+    monkeypatch.setattr(main, "fetch_all_playlist_items", fake_fetch)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        main.fetch_playlists_items(["PL1", "PL2"], "key")
+    assert "Impossible de récupérer les vidéos de la playlist PL2" in caplog.text
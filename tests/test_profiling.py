@@ -0,0 +1,72 @@
+import pstats
+import threading
+
+import export_data
+import http_client
+from benchmarks.fake_google_api import FakeGoogleAPI
+from benchmarks.synthetic import SheetsBackend, SyntheticYouTube
+from profiling import profile_stages
+from run_metrics import metrics
+
+
+def allocate(size):
+    return [str(index) for index in range(size)]
+
+
+def test_profile_stages_writes_reports_per_stage(tmp_path):
+    with profile_stages(str(tmp_path)) as profiler:
+        metrics.stage("fetch")
+        allocate(20_000)
+        metrics.stage("write")
+        worker = threading.Thread(target=allocate, args=(5_000,))
+        worker.start()
+        worker.join()
+
+    assert not metrics.enabled and metrics.stage_listeners == []
+    assert [entry["stage"] for entry in profiler.summary] == ["startup", "fetch", "write"]
+    (out_dir,) = tmp_path.iterdir()
+    for name in ("01-startup", "02-fetch", "03-write"):
+        assert pstats.Stats(str(out_dir / f"{name}.prof"))
+        assert (out_dir / f"{name}.alloc.txt").read_text(encoding="utf-8").startswith("Étape : ")
+    assert profiler.summary[1]["peak"] > profiler.summary[2]["peak"]
+    threads = pstats.Stats(str(out_dir / "threads.prof"))
+    assert any(function[2] == "allocate" for function in threads.stats)
+    summary = (out_dir / "summary.txt").read_text(encoding="utf-8")
+    assert "fetch" in summary and "threads (1)" in summary
+
+
+def test_profile_stages_is_a_no_op_without_directory(tmp_path):
+    with profile_stages(None) as profiler:
+        metrics.stage("fetch")
+    assert profiler is None and not metrics.enabled
+
+
+def test_profile_stages_keeps_running_metrics_active(tmp_path):
+    metrics.start()
+    try:
+        with profile_stages(str(tmp_path)):
+            metrics.stage("fetch")
+        assert metrics.enabled
+    finally:
+        report = metrics.finish()
+    assert [stage["name"] for stage in report["stages"]] == ["fetch"]
+
+
+def test_export_data_profile_option(monkeypatch, tmp_path):
+    sheets = SheetsBackend()
+    sheets.set_tab("AllVideos", [export_data.HEADERS] + [[f"a{i}", f"t{i}"] for i in range(25)])
+    with FakeGoogleAPI(SyntheticYouTube({}), sheets) as api:
+        for name, value in api.environ().items():
+            monkeypatch.setattr(http_client, name, value)
+        monkeypatch.setattr(http_client, "_session", None)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("SPREADSHEET_ID", "A" * 44)
+        monkeypatch.setenv("YOUTUBE_API_KEY", "key")
+        monkeypatch.setattr(
+            "sys.argv", ["export_data.py", "--chunk-rows", "10", "--max-in-flight", "2", "--profile"]
+        )
+        assert export_data.main() == 0
+
+    (run_dir,) = (tmp_path / "data" / "profile").iterdir()
+    assert (run_dir / "02-export_json.prof").exists()
+    assert (run_dir / "threads.prof").exists()
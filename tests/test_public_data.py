@@ -0,0 +1,50 @@
+import hashlib
+import json
+
+from compact_dataset import decode_dataset
+from main import HEADERS
+from public_data import DURATION_TABS, iter_public_rows, write_public_data
+
+
+def make_row(video_id, duration, title=None):
+    row = [""] * len(HEADERS)
+    row[HEADERS.index("title")] = title or f"Vidéo {video_id}"
+    row[HEADERS.index("link")] = f"https://www.youtube.com/watch?v={video_id}"
+    row[HEADERS.index("duration")] = duration
+    return row
+
+
+def test_iter_public_rows_follows_duration_tabs_and_drops_unknown_titles():
+    short = make_row("aaaaaaaaaaa", "00:03:00")
+    unknown = make_row("bbbbbbbbbbb", "00:03:00", title="Inconnu")
+    long = make_row("ccccccccccc", "01:10:00")
+    tabs = {"60Plusmin": [long], "0-5min": [short, unknown], "Inconnue": [make_row("ddddddddddd", "Inconnue")]}
+
+    assert list(iter_public_rows(HEADERS, tabs)) == [HEADERS, short, long]
+
+
+def test_write_public_data_writes_duration_shards_and_manifest(tmp_path):
+    rows = [
+        make_row("aaaaaaaaaaa", "00:03:00"),
+        make_row("bbbbbbbbbbb", "00:05:00"),
+        make_row("ccccccccccc", "00:25:00"),
+        make_row("ddddddddddd", "01:10:00"),
+    ]
+
+    write_public_data(iter([HEADERS] + rows), tmp_path)
+
+    manifest = json.loads((tmp_path / "shards" / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["count"] == 4
+    assert [shard["name"] for shard in manifest["shards"]] == DURATION_TABS
+    counts = {shard["name"]: shard["count"] for shard in manifest["shards"]}
+    assert counts["0-5min"] == 2 and counts["20-30min"] == 1 and counts["60Plusmin"] == 1
+    assert counts["5-10min"] == 0
+    for shard in manifest["shards"]:
+        payload = (tmp_path / shard["file"]).read_bytes()
+        assert hashlib.sha256(payload).hexdigest() == shard["sha256"]
+    first = json.loads((tmp_path / "shards" / "0-5min.json").read_text(encoding="utf-8"))
+    assert decode_dataset(first) == rows[:2]
+
+    manifest_mtime = (tmp_path / "shards" / "manifest.json").stat().st_mtime_ns
+    write_public_data(iter([HEADERS] + rows), tmp_path)
+    assert (tmp_path / "shards" / "manifest.json").stat().st_mtime_ns == manifest_mtime
@@ -0,0 +1,62 @@
+import main
+from state_store import StateStore
+from test_sync_videos import setup_sync, video
+
+NOW = 1_750_000_000.0  # 2025-06-15T15:06:40Z
+
+
+def entry(published_at, refreshed_ago):
+    return {"detail": {"snippet": {"publishedAt": published_at}}, "refreshedAt": NOW - refreshed_ago}
+
+
+def test_refresh_interval_tiers():
+    assert main.refresh_interval("2025-06-15T10:00:00Z", NOW) == 3600
+    assert main.refresh_interval("2025-06-01T10:00:00Z", NOW) == 86400
+    assert main.refresh_interval("2020-01-01T00:00:00Z", NOW) == 7 * 86400
+    assert main.refresh_interval("", NOW) == 7 * 86400
+
+
+def test_plan_refresh_orders_by_overdue_ratio_and_respects_budget():
+    state = {
+        "fresh-day": entry("2025-06-15T10:00:00Z", 2 * 3600),  # 2x overdue
+        "fresh-day-ok": entry("2025-06-15T10:00:00Z", 600),  # not due
+        "month": entry("2025-06-01T10:00:00Z", 3 * 86400),  # 3x overdue
+        "old": entry("2020-01-01T00:00:00Z", 8 * 86400),  # ~1.14x overdue
+        "old-ok": entry("2020-01-01T00:00:00Z", 86400),
+    }
+    ids = list(state) + ["unknown"]
+
+    assert main.plan_refresh(ids, state, NOW) == ["month", "fresh-day", "old"]
+    assert main.plan_refresh(ids, state, NOW, max_refreshes=2) == ["month", "fresh-day"]
+
+
+def test_sync_videos_keeps_last_known_stats_for_skipped_videos(monkeypatch, tmp_path):
+    playlists = {"PLaaaaa": ["known", "stale", "new"]}
+    details = {
+        "known": video("known"),
+        "stale": video("stale"),
+        "new": video("new"),
+    }
+    service = setup_sync(monkeypatch, tmp_path, playlists, details)
+    requested = []
+    monkeypatch.setattr(
+        "main.fetch_videos_details",
+        lambda video_ids, api_key, **kwargs: requested.extend(video_ids) or {vid: details[vid] for vid in video_ids},
+    )
+    monkeypatch.setattr(main.time, "time", lambda: NOW)
+    old_known = dict(video("known"), statistics={"viewCount": "5"})
+    with StateStore("data/state.db") as store:
+        store.save_details({"known": old_known}, NOW - 3600)
+        store.save_details({"stale": video("stale")}, NOW - 8 * 86400)
+        store.save_details({"gone": video("gone")}, NOW)
+
+    main.sync_videos("PLaaaaa", refresh_tiers=True)
+
+    assert sorted(requested) == ["new", "stale"]
+    views = [row[main.HEADERS.index("views")] for row in service.read("AllVideos")[1:]]
+    assert views == ["5", "10", "10"]
+    with StateStore("data/state.db") as store:
+        assert store.known_video_ids() == {"known", "new", "stale"}
+        saved = store.video_states(["known", "stale"])
+    assert saved["stale"]["refreshedAt"] == NOW
+    assert saved["known"]["refreshedAt"] == NOW - 3600
@@ -0,0 +1,54 @@
+import json
+
+import requests
+
+import main
+from http_fake import use_fake_session
+
+
+def make_response(status, payload=None, etag=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(payload).encode() if payload is not None else b""
+    if etag:
+        response.headers["ETag"] = etag
+    return response
+
+
+def test_videos_details_use_conditional_requests(monkeypatch, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    payload = {"etag": "body-etag", "items": [{"id": "abc", "snippet": {"title": "t"}}]}
+    sent_headers = []
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        sent_headers.append(headers)
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return make_response(304)
+        return make_response(200, payload, etag='"v1"')
+
+    use_fake_session(monkeypatch, fake_get)
+    try:
+        main.response_cache.load(cache_path)
+        first = main.fetch_videos_details(["abc"], "key")
+        main.response_cache.save(cache_path)
+        main.response_cache.close()
+
+        main.response_cache.load(cache_path)
+        second = main.fetch_videos_details(["abc"], "key")
+        hits = main.response_cache.hits
+    finally:
+        main.response_cache.close()
+
+    assert first == second == {"abc": payload["items"][0]}
+    assert sent_headers == [None, {"If-None-Match": '"v1"'}]
+    assert hits == 1
+    assert "key=" not in next(iter(json.loads((tmp_path / "cache.json").read_text())))
+
+
+def test_response_cache_is_inactive_until_loaded(monkeypatch):
+    def fake_get(url, params=None, headers=None, timeout=None):
+        return make_response(200, {"items": []}, etag='"v1"')
+
+    use_fake_session(monkeypatch, fake_get)
+    assert main.fetch_youtube_json("https://example.com", {"id": "x"}) == {"items": []}
+    assert main.response_cache.get(main.ResponseCache.key_for("https://example.com", {"id": "x"})) is None
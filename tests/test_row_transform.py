@@ -0,0 +1,55 @@
+import pytest
+
+import main
+from benchmarks.bench_row_transform import columnar_rows, legacy_rows, synthetic_videos
+from row_transform import duration_category, fast_published_at, transform_videos
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        "2025-01-07T13:45:00Z",
+        "2024-02-29T23:59:59Z",
+        "2023-02-29T10:00:00Z",
+        "2025-1-7T3:4:5Z",
+        "2025-01-07t13:45:00z",
+        "0999-01-01T00:00:00Z",
+        "2025-01-07T13:45:60Z",
+        "2025-01-07T24:00:00Z",
+        "2025-01-07T13:45:00",
+        "",
+        None,
+    ],
+)
+def test_fast_published_at_matches_reference(timestamp):
+    assert fast_published_at(timestamp) == main.format_published_at(timestamp)
+
+
+@pytest.mark.parametrize("seconds", [0, 299, 300, 301, 600, 1200, 1800, 2400, 3000, 3600, 3601, 10**6])
+def test_duration_category_matches_reference(seconds):
+    formatted = f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    assert duration_category(seconds) == main.get_duration_category(formatted)
+
+
+def test_transform_videos_matches_row_by_row_loop():
+    entries, videos_data = synthetic_videos(500, seed=1)
+    odd = videos_data[entries[0][1]["contentDetails"]["videoId"]]
+    odd["contentDetails"]["duration"] = "P1DT2H"
+    del odd["snippet"]["title"]
+    videos_data[entries[1][1]["contentDetails"]["videoId"]]["contentDetails"]["duration"] = "PT90M"
+    del videos_data[entries[2][1]["contentDetails"]["videoId"]]
+
+    def channel_avatar(channel_id):
+        return f"avatar-{channel_id}"
+
+    assert columnar_rows(entries, videos_data, channel_avatar) == legacy_rows(entries, videos_data, channel_avatar)
+
+
+def test_transform_videos_requests_each_channel_avatar_once():
+    entries, videos_data = synthetic_videos(20)
+    calls = []
+
+    columns = transform_videos(entries, videos_data, lambda channel_id: calls.append(channel_id) or channel_id)
+
+    assert len(columns) == 20
+    assert sorted(calls) == sorted(set(calls))
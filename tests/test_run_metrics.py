@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+import http_client
+import main
+from http_fake import use_fake_session
+from run_metrics import RunMetrics, metrics, prometheus_text, write_report, write_textfile
+from test_sync_videos import setup_sync, video
+
+
+class Response:
+    def __init__(self, status_code, content=b"{}"):
+        self.status_code = status_code
+        self.content = content
+
+
+@pytest.fixture
+def active_metrics():
+    metrics.start()
+    yield metrics
+    metrics.finish()
+
+
+def test_disabled_metrics_record_nothing():
+    run = RunMetrics()
+    run.stage("fetch")
+    run.increment("retries", endpoint="videos")
+    run.record_http("youtube", "videos", 200, 10, 0.1)
+    run.record_cache("avatars", 1, 1)
+    with run.span("block"), run.http_call("sheets", "get"):
+        pass
+    assert run.stages == [] and run.spans == [] and run.counters == {} and run.caches == {}
+
+
+def test_report_collects_stages_counters_and_caches():
+    run = RunMetrics()
+    run.start()
+    run.stage("fetch")
+    run.record_http("youtube", "videos", 200, 120, 0.05)
+    run.record_http("youtube", "videos", 503, 30, 0.01)
+    run.increment("retries", endpoint="videos")
+    run.stage("write")
+    with pytest.raises(RuntimeError):
+        with run.http_call("sheets", "values.batchUpdate"):
+            raise RuntimeError("boom")
+    run.record_cache("channel_avatars", 3, 1)
+    report = run.finish("error")
+
+    assert report["status"] == "error"
+    assert [stage["name"] for stage in report["stages"]] == ["fetch", "write"]
+    assert report["caches"]["channel_avatars"] == {"hits": 3, "misses": 1, "hitRate": 0.75}
+    assert report["totals"] == {"requests": 3, "responseBytes": 150, "retries": 1, "youtubeQuotaUnits": 2}
+    statuses = {
+        (counter["labels"]["endpoint"], counter["labels"]["status"])
+        for counter in report["counters"]
+        if counter["name"] == "http_requests"
+    }
+    assert statuses == {("videos", "200"), ("videos", "503"), ("values.batchUpdate", "error")}
+    assert {span["kind"] for span in report["spans"]} == {"stage", "http"}
+
+
+def test_prometheus_textfile_lists_stages_and_counters(tmp_path):
+    run = RunMetrics()
+    run.start()
+    run.stage("fetch_playlists")
+    run.record_http("youtube", "playlistItems", 200, 10, 0.01)
+    run.record_cache("youtube_responses", 1, 0)
+    report = run.finish()
+
+    text = prometheus_text(report)
+    assert "# TYPE youtube_sync_stage_duration_seconds gauge" in text
+    assert 'youtube_sync_stage_duration_seconds{stage="fetch_playlists"}' in text
+    assert 'youtube_sync_http_requests{api="youtube",endpoint="playlistItems",status="200"} 1' in text
+    assert "youtube_sync_youtube_quota_units 1" in text
+    assert 'youtube_sync_cache_hits{cache="youtube_responses"} 1' in text
+    assert "youtube_sync_last_run_success 1" in text
+
+    write_report(str(tmp_path / "report.json"), report)
+    write_textfile(str(tmp_path / "metrics.prom"), report)
+    assert json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))["format"] == "sync-run-report"
+    assert (tmp_path / "metrics.prom").read_text(encoding="utf-8") == text
+
+
+def test_http_client_calls_are_measured(monkeypatch, active_metrics):
+    responses = iter([Response(200, b'{"items": []}'), Response(304, b"")])
+    use_fake_session(monkeypatch, lambda url, **kwargs: next(responses))
+
+    http_client.get(http_client.youtube_url("videos"))
+    http_client.get(http_client.sheets_url("v4/spreadsheets/abc/values/A1"))
+    use_fake_session(monkeypatch, lambda url, **kwargs: (_ for _ in ()).throw(ConnectionError("down")))
+    with pytest.raises(ConnectionError):
+        http_client.get(http_client.youtube_url("channels"))
+
+    report = active_metrics.report()
+    labels = [counter["labels"] for counter in report["counters"] if counter["name"] == "http_requests"]
+    assert {"api": "youtube", "endpoint": "videos", "status": "200"} in labels
+    assert {"api": "sheets", "endpoint": "values.get", "status": "304"} in labels
+    assert {"api": "youtube", "endpoint": "channels", "status": "error"} in labels
+    assert report["totals"]["youtubeQuotaUnits"] == 2
+    assert report["totals"]["responseBytes"] == len(b'{"items": []}')
+
+
+def test_sync_run_report(monkeypatch, tmp_path, active_metrics):
+    setup_sync(monkeypatch, tmp_path, {"PLaaaaa": ["v1", "v2"]}, {"v1": video("v1"), "v2": video("v2", "PT9M")})
+
+    main.sync_videos("PLaaaaa", state_db_path=None, response_cache_path=None, avatar_cache_path=None)
+    report = active_metrics.finish()
+    main.report_run(report, str(tmp_path / "run_report.json"), str(tmp_path / "run_metrics.prom"))
+
+    assert [stage["name"] for stage in report["stages"]] == [
+        "fetch_playlists",
+        "fetch_details",
+        "save_state",
+        "avatars",
+        "transform",
+        "sheets_write",
+        "local_export",
+        "public_data",
+    ]
+    sheets_calls = {
+        counter["labels"]["endpoint"]
+        for counter in report["counters"]
+        if counter["name"] == "http_requests" and counter["labels"]["api"] == "sheets"
+    }
+    assert sheets_calls == {"get", "batchUpdate", "values.batchUpdate"}
+    saved = json.loads((tmp_path / "run_report.json").read_text(encoding="utf-8"))
+    assert saved["stages"] == report["stages"]
+    assert "youtube_sync_stage_duration_seconds" in (tmp_path / "run_metrics.prom").read_text(encoding="utf-8")
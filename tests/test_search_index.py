@@ -0,0 +1,69 @@
+import json
+
+from main import HEADERS
+from public_data import write_public_data
+from search_index import build_search_index, search, tokenize
+
+
+def make_row(video_id, title, channel="COLORS", tags="", description=""):
+    row = [""] * len(HEADERS)
+    row[HEADERS.index("title")] = title
+    row[HEADERS.index("link")] = f"https://www.youtube.com/watch?v={video_id}"
+    row[HEADERS.index("channel")] = channel
+    row[HEADERS.index("tags")] = tags
+    row[HEADERS.index("shortDescription")] = description
+    return row
+
+
+def test_tokenize_folds_case_and_accents():
+    assert tokenize("Éléphant, CAFÉ-crème & co_op 2024") == ["elephant", "cafe", "creme", "co", "op", "2024"]
+
+
+def test_search_matches_prefixes_of_every_query_word():
+    rows = [
+        make_row("aaaaaaaaaaa", "Concert à l'Opéra"),
+        make_row("bbbbbbbbbbb", "Live session", channel="Opéra de Paris"),
+        make_row("ccccccccccc", "Cuisine", tags="recette, gâteau", description="Un gâteau opéra"),
+        make_row("ddddddddddd", "Concert rock", channel="Rock en Seine"),
+    ]
+
+    index = json.loads(json.dumps(build_search_index(HEADERS, rows)))
+
+    assert index["ids"] == ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc", "ddddddddddd"]
+    assert index["tokens"] == sorted(index["tokens"])
+    assert search(index, "OPE") == [0, 1]
+    assert search(index, "concert ro") == [3]
+    assert search(index, "cuis") == [2]
+    # Préfixes de mots uniquement ; tags et description ne sont pas indexés
+    assert search(index, "cert") == []
+    assert search(index, "gateau") == []
+    assert search(index, "jazz") == []
+    assert search(index, "  ") == []
+
+
+def test_search_only_looks_in_selected_fields():
+    rows = [
+        make_row("aaaaaaaaaaa", "Concert à l'Opéra"),
+        make_row("bbbbbbbbbbb", "Live session", channel="Opéra de Paris"),
+        make_row("ccccccccccc", "Cuisine", tags="opéra", description="Un gâteau opéra"),
+    ]
+
+    index = build_search_index(HEADERS, rows)
+
+    assert index["fields"] == ["title", "channel"]
+    assert index["masks"][index["tokens"].index("opera")] == [0b01, 0b10]
+    assert search(index, "ope", fields=["title"]) == [0]
+    assert search(index, "ope", fields=["title", "channel"]) == [0, 1]
+    assert search(index, "live paris", fields=["title"]) == []
+    assert search(index, "live paris", fields=["title", "channel"]) == [1]
+
+
+def test_write_public_data_ships_search_index(tmp_path):
+    rows = [HEADERS, make_row("aaaaaaaaaaa", "Première vidéo"), make_row("bbbbbbbbbbb", "Seconde")]
+
+    write_public_data(iter(rows), tmp_path)
+
+    index = json.loads((tmp_path / "videos.search.json").read_text(encoding="utf-8"))
+    assert index["count"] == 2
+    assert search(index, "premiere") == [0]
+    assert (tmp_path / "videos.search.json.gz").exists()
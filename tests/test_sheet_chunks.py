@@ -0,0 +1,88 @@
+import logging
+import threading
+
+import pytest
+
+import sheet_chunks
+from sheet_chunks import iter_chunked_rows, sheet_title, split_a1_range
+
+
+def serve(rows, calls, lock=None):
+    def fetch_window(window):
+        _, _, first, _, last = split_a1_range(window)
+        if lock:
+            with lock:
+                calls.append(window)
+        else:
+            calls.append(window)
+        page = rows[first - 1 : last]
+        while page and not page[-1]:
+            page = page[:-1]
+        return page
+
+    return fetch_window
+
+
+def test_split_a1_range_and_sheet_title():
+    assert split_a1_range("AllVideos!A1:P") == ("AllVideos", "A", 1, "P", None)
+    assert split_a1_range("'0-5min'!B2:Z10") == ("'0-5min'", "B", 2, "Z", 10)
+    assert sheet_title("'0-5min'!A1:Z") == "0-5min"
+
+
+def test_iter_chunked_rows_walks_windows_until_grid_end():
+    rows = [[f"r{i}"] for i in range(1, 11)]
+    rows[3] = rows[4] = []  # lignes vides à cheval sur deux fenêtres
+    calls = []
+
+    result = list(iter_chunked_rows("AllVideos!A1:P", serve(rows, calls), chunk_rows=4, total_rows=10))
+
+    assert result == rows
+    assert calls == ["AllVideos!A1:P4", "AllVideos!A5:P8", "AllVideos!A9:P10"]
+
+
+def test_iter_chunked_rows_stops_at_first_empty_window_without_grid_size(caplog):
+    rows = [[f"r{i}"] for i in range(1, 6)] + [[]] * 5 + [["r11"]]
+    calls = []
+
+    with caplog.at_level(logging.WARNING):
+        result = list(iter_chunked_rows("AllVideos!A1:P", serve(rows, calls), chunk_rows=5))
+
+    assert result == rows[:5]
+    assert calls == ["AllVideos!A1:P5", "AllVideos!A6:P10"]
+    # Arrêt signalé : la ligne 11 n'a pas été lue
+    assert "lecture arrêtée à la première fenêtre vide (lignes 6 à 10)" in caplog.text
+
+
+def test_iter_chunked_rows_keeps_order_with_requests_in_flight():
+    rows = [[f"r{i}"] for i in range(1, 101)]
+    calls = []
+
+    result = list(
+        iter_chunked_rows(
+            "AllVideos!A1:P", serve(rows, calls, threading.Lock()), chunk_rows=7, max_in_flight=4, total_rows=100
+        )
+    )
+
+    assert result == rows
+    assert len(calls) == 15
+
+
+def test_iter_chunked_rows_retries_only_the_failed_window(monkeypatch):
+    monkeypatch.setattr(sheet_chunks.time, "sleep", lambda seconds: None)
+    rows = [[f"r{i}"] for i in range(1, 7)]
+    calls = []
+    fetch = serve(rows, calls)
+    failures = {"AllVideos!A3:P4": 2}
+
+    def flaky(window):
+        if failures.get(window):
+            failures[window] -= 1
+            raise TimeoutError("lent")
+        return fetch(window)
+
+    assert list(iter_chunked_rows("AllVideos!A1:P", flaky, chunk_rows=2, total_rows=6)) == rows
+    assert calls == ["AllVideos!A1:P2", "AllVideos!A3:P4", "AllVideos!A5:P6"]
+
+    failures["AllVideos!A3:P4"] = 5
+    with pytest.raises(RuntimeError, match="A3:P4"):
+        list(iter_chunked_rows("AllVideos!A1:P", flaky, chunk_rows=2, total_rows=6))
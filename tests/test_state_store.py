@@ -0,0 +1,44 @@
+import json
+
+import main
+from state_store import StateStore
+
+
+def make_row(video_id, position, playlist="PL1"):
+    row = [""] * len(main.HEADERS)
+    row[main.HEADERS.index("link")] = f"https://www.youtube.com/watch?v={video_id}"
+    row[main.HEADERS.index("playlistPosition")] = str(position)
+    row[main.HEADERS.index("playlistId")] = playlist
+    return row
+
+
+def test_store_migrates_videos_json(tmp_path):
+    rows = [main.HEADERS, make_row("b" * 11, 3), make_row("a" * 11, 1), make_row("c" * 11, 0, "PL2")]
+    (tmp_path / "videos.json").write_text(json.dumps(rows))
+
+    with StateStore(str(tmp_path / "state.db"), str(tmp_path / "videos.json")) as store:
+        items = store.playlist_items("PL1")
+        assert [(item["contentDetails"]["videoId"], item["snippet"]["position"]) for item in items] == [
+            ("a" * 11, 1),
+            ("b" * 11, 3),
+        ]
+        assert items == main.load_cached_playlist_items("PL1", str(tmp_path / "videos.json"))
+        assert store.playlist_state("PL1") is None
+        assert store.video_states(["a" * 11, "zzz"]) == {}
+        assert store.export_rows() == rows
+
+    # La migration n'est faite qu'une fois : le JSON n'est plus relu ensuite
+    (tmp_path / "videos.json").write_text(json.dumps([main.HEADERS]))
+    with StateStore(str(tmp_path / "state.db"), str(tmp_path / "videos.json")) as store:
+        assert len(store.playlist_items("PL1")) == 2
+
+
+def test_store_replaces_playlist_items_and_prunes_videos(tmp_path):
+    with StateStore(str(tmp_path / "state.db"), None) as store:
+        store.replace_playlist_items("PL1", [{"contentDetails": {"videoId": "x"}, "snippet": {"position": 0}}])
+        store.replace_playlist_items("PL1", [{"contentDetails": {"videoId": "y"}, "snippet": {"position": 5}}])
+        store.save_details({"x": {"id": "x"}, "y": {"id": "y"}}, 1.0)
+        store.prune_videos(["y"])
+
+        assert [item["contentDetails"]["videoId"] for item in store.playlist_items("PL1")] == ["y"]
+        assert store.known_video_ids() == {"y"}
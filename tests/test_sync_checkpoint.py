@@ -0,0 +1,143 @@
+import sqlite3
+
+import pytest
+import requests
+
+import http_client
+import main
+from benchmarks.synthetic import SyntheticSession, SyntheticYouTube
+from sync_checkpoint import SyncCheckpoint, checkpoint_key
+from test_sync_videos import setup_sync, video
+
+PLAYLIST = "PLcheckpoint"
+
+
+class InterruptedSession(SyntheticSession):
+    """Session synthétique dont les appels `playlistItems` échouent au-delà de `limit`."""
+
+    def __init__(self, youtube, limit=None):
+        super().__init__(youtube)
+        self.limit = limit
+        self.tokens = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        if url.endswith("playlistItems"):
+            if self.limit is not None and len(self.tokens) >= self.limit:
+                raise requests.ConnectionError("annulé")
+            self.tokens.append((params or {}).get("pageToken"))
+        return super().get(url, params=params, headers=headers, timeout=timeout)
+
+
+def test_checkpoint_is_kept_only_for_same_inputs_and_age(tmp_path):
+    path = str(tmp_path / "checkpoint.db")
+    key = checkpoint_key(playlists=["PLa"], tab="AllVideos")
+    with SyncCheckpoint(path, key, 3600, now=1000) as checkpoint:
+        assert not checkpoint.resumed
+        checkpoint.save_details({"v1": {"id": "v1"}})
+    with SyncCheckpoint(path, checkpoint_key(tab="AllVideos", playlists=["PLa"]), 3600, now=2000) as checkpoint:
+        assert checkpoint.resumed and checkpoint.details() == {"v1": {"id": "v1"}}
+    with SyncCheckpoint(path, key, 3600, now=1000 + 3600) as checkpoint:
+        assert not checkpoint.resumed and checkpoint.details() == {}
+        checkpoint.save_details({"v1": {"id": "v1"}})
+    with SyncCheckpoint(path, checkpoint_key(playlists=["PLb"], tab="AllVideos"), 3600, now=5000) as checkpoint:
+        assert not checkpoint.resumed and checkpoint.details() == {}
+
+
+def test_checkpoint_pages_and_completed_playlists(tmp_path):
+    with SyncCheckpoint(str(tmp_path / "checkpoint.db"), "key", 3600) as checkpoint:
+        checkpoint.save_page("PLa", [{"id": "a"}], "p1", 50)
+        checkpoint.save_page("PLa", [{"id": "b"}], "p2", 25)
+        progress = checkpoint.playlist_progress("PLa")
+        assert progress == {"items": [{"id": "a"}, {"id": "b"}], "pageToken": "p2", "pageSize": 25}
+        checkpoint.complete_playlist("PLa", [{"id": "a"}, {"id": "b"}, {"id": "c"}], {"total": 3})
+        assert checkpoint.playlist_progress("PLa") is None
+        assert checkpoint.completed_playlist("PLa") == ([{"id": "a"}, {"id": "b"}, {"id": "c"}], {"total": 3})
+        assert checkpoint.completed_playlist("PLb") is None
+
+
+def test_interrupted_pagination_resumes_from_last_page(monkeypatch, tmp_path):
+    youtube = SyntheticYouTube({PLAYLIST: 230})
+    monkeypatch.setattr(http_client, "_session", SyntheticSession(youtube))
+    expected = main.fetch_all_playlist_items(PLAYLIST, "key")
+    path = str(tmp_path / "checkpoint.db")
+
+    monkeypatch.setattr(http_client, "_session", InterruptedSession(youtube, limit=3))
+    with SyncCheckpoint(path, "key", 3600) as checkpoint, pytest.raises(RuntimeError):
+        main.fetch_all_playlist_items(PLAYLIST, "key", max_retries=1, checkpoint=checkpoint)
+
+    session = InterruptedSession(youtube)
+    monkeypatch.setattr(http_client, "_session", session)
+    pages = []
+    with SyncCheckpoint(path, "key", 3600) as checkpoint:
+        assert checkpoint.resumed
+        items = main.fetch_all_playlist_items(PLAYLIST, "key", checkpoint=checkpoint, on_page=pages.append)
+        assert session.tokens == ["p150", "p200"]
+        assert items == expected
+        assert sum(len(page) for page in pages) == 230
+
+        again = main.fetch_all_playlist_items(PLAYLIST, "key", checkpoint=checkpoint)
+    assert again == expected and session.tokens == ["p150", "p200"]
+
+
+def test_sync_videos_resumes_after_cancellation(monkeypatch, tmp_path):
+    playlists = {"PLaaaaa": ["v1", "v2", "v3"]}
+    details = {vid: video(vid) for vid in playlists["PLaaaaa"]}
+    service = setup_sync(monkeypatch, tmp_path, playlists, details)
+
+    def cancelled(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(main, "write_json_rows", cancelled)
+    with pytest.raises(KeyboardInterrupt):
+        main.sync_videos("PLaaaaa")
+    assert (tmp_path / "data" / "checkpoint.db").exists()
+    assert len(service.read("AllVideos")) == 4
+
+    monkeypatch.undo()
+    service = setup_sync(monkeypatch, tmp_path, playlists, details)
+    requested = []
+
+    def fetch_details(video_ids, api_key, **kwargs):
+        requested.extend(video_ids)
+        return {}
+
+    monkeypatch.setattr(main, "fetch_videos_details", fetch_details)
+
+    main.sync_videos("PLaaaaa")
+
+    assert requested == []
+    assert service.calls == []
+    assert (tmp_path / "data" / "videos.json").exists()
+    assert not (tmp_path / "data" / "checkpoint.db").exists()
+
+
+def test_sync_videos_completes_when_checkpoint_write_fails(monkeypatch, tmp_path):
+    playlists = {"PLaaaaa": ["v1", "v2"]}
+    details = {vid: video(vid) for vid in playlists["PLaaaaa"]}
+    service = setup_sync(monkeypatch, tmp_path, playlists, details)
+
+    def locked(self, details):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(SyncCheckpoint, "save_details", locked)
+
+    main.sync_videos("PLaaaaa")
+
+    assert [row[2][-2:] for row in service.read("AllVideos")[1:]] == ["v1", "v2"]
+    assert (tmp_path / "data" / "videos.json").exists()
+
+
+def test_checkpoint_follows_stale_token_recovery(monkeypatch, tmp_path):
+    youtube = SyntheticYouTube({PLAYLIST: 180})
+    monkeypatch.setattr(http_client, "_session", SyntheticSession(youtube))
+    expected = main.fetch_all_playlist_items(PLAYLIST, "key")
+    path = str(tmp_path / "checkpoint.db")
+    with SyncCheckpoint(path, "key", 3600) as checkpoint:
+        checkpoint.save_page(PLAYLIST, expected[:50], "expired", 50)
+
+    session = InterruptedSession(youtube)
+    monkeypatch.setattr(http_client, "_session", session)
+    with SyncCheckpoint(path, "key", 3600) as checkpoint:
+        assert main.fetch_all_playlist_items(PLAYLIST, "key", checkpoint=checkpoint) == expected
+        assert checkpoint.completed_playlist(PLAYLIST)[0] == expected
+    assert session.tokens == ["expired", None, "p50", "p100", "p150"]
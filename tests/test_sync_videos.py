@@ -0,0 +1,98 @@
+import json
+
+import main
+from sheets_fake import FakeSheetsService
+from state_store import StateStore
+
+
+def video(video_id, duration="PT4M", channel_id="UC1"):
+    return {
+        "id": video_id,
+        "snippet": {
+            "title": f"title-{video_id}",
+            "channelTitle": "Channel",
+            "channelId": channel_id,
+            "publishedAt": "2025-01-07T13:45:00Z",
+        },
+        "contentDetails": {"duration": duration},
+        "statistics": {"viewCount": "10"},
+    }
+
+
+def setup_sync(monkeypatch, tmp_path, playlists, details):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("YOUTUBE_API_KEY", "key")
+    monkeypatch.setenv("SPREADSHEET_ID", "A" * 25)
+    monkeypatch.setenv("SERVICE_ACCOUNT_JSON", "{}")
+    service = FakeSheetsService()
+    monkeypatch.setattr(
+        "main.service_account.Credentials.from_service_account_info",
+        lambda *a, **k: object(),
+    )
+    monkeypatch.setattr("main.build", lambda *a, **k: service)
+    monkeypatch.setattr(
+        "main.fetch_all_playlist_items",
+        lambda playlist_id, api_key, **kwargs: [
+            {"id": f"{playlist_id}-{i}", "contentDetails": {"videoId": vid}, "snippet": {"position": i}}
+            for i, vid in enumerate(playlists[playlist_id])
+        ],
+    )
+    monkeypatch.setattr(
+        "main.fetch_videos_details",
+        lambda video_ids, api_key, **kwargs: {vid: details[vid] for vid in video_ids if vid in details},
+    )
+    monkeypatch.setattr("main.fetch_channel_avatars", lambda channel_ids, api_key: {})
+    monkeypatch.setattr("main.get_channel_avatar", lambda channel_id, api_key: f"avatar-{channel_id}")
+    return service
+
+
+def test_sync_videos_publishes_tabs_and_local_snapshot(monkeypatch, tmp_path):
+    playlists = {"PLaaaaa": ["v1", "v2"], "PLbbbbb": ["v3"]}
+    details = {"v1": video("v1"), "v2": video("v2", "PT1H5M"), "v3": video("v3", "PT7M")}
+    service = setup_sync(monkeypatch, tmp_path, playlists, details)
+
+    main.sync_videos("PLaaaaa,PLbbbbb", diff_writes=True, playlist_workers=2)
+
+    all_rows = service.read("AllVideos")
+    assert all_rows[0] == main.HEADERS
+    assert [row[2][-2:] for row in all_rows[1:]] == ["v1", "v2", "v3"]
+    assert [row[-1] for row in all_rows[1:]] == ["PLaaaaa", "PLaaaaa", "PLbbbbb"]
+    assert len(service.read("0-5min")) == 2
+    assert len(service.read("60Plusmin")) == 2
+    snapshot = json.loads((tmp_path / "data" / "videos.json").read_text(encoding="utf-8"))
+    assert snapshot == all_rows
+
+
+def test_sync_videos_records_state_store(monkeypatch, tmp_path):
+    playlists = {"PLaaaaa": ["v1", "v2"]}
+    details = {"v1": video("v1"), "v2": video("v2")}
+    setup_sync(monkeypatch, tmp_path, playlists, details)
+
+    main.sync_videos("PLaaaaa")
+
+    with StateStore("data/state.db") as store:
+        assert [item["contentDetails"]["videoId"] for item in store.playlist_items("PLaaaaa")] == ["v1", "v2"]
+        assert store.known_video_ids() == {"v1", "v2"}
+        snapshot = json.loads((tmp_path / "data" / "videos.json").read_text(encoding="utf-8"))
+        assert store.export_rows() == snapshot
+
+
+def test_sync_videos_publishes_frontend_data_from_memory(monkeypatch, tmp_path, caplog):
+    playlists = {"PLaaaaa": ["v1", "v2", "v3", "v4"]}
+    untitled = video("v3")
+    del untitled["snippet"]["title"]
+    details = {"v1": video("v1", "PT1H5M"), "v2": video("v2"), "v3": untitled, "v4": video("v4", "PT7M")}
+    service = setup_sync(monkeypatch, tmp_path, playlists, details)
+
+    with caplog.at_level("INFO"):
+        main.sync_videos("PLaaaaa", verify_sheets=True)
+
+    public = tmp_path / "bolt-app" / "public" / "data"
+    published = json.loads((public / "videos.json").read_text(encoding="utf-8"))
+    assert published[0] == main.HEADERS
+    # Ordre des onglets de durée, sans la vidéo « Inconnu »
+    assert [row[2][-2:] for row in published[1:]] == ["v2", "v4", "v1"]
+    assert (public / "videos.csv").exists()
+    assert (public / "videos.compact.json").exists()
+    assert "identiques aux données publiées" in caplog.text
+    assert sum(1 for call in service.calls if call[0] == "values.batchGet") == 1
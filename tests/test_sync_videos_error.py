@@ -4,6 +4,7 @@ from main import sync_videos
 
 
 def test_sync_videos_handles_fetch_error(monkeypatch, caplog, tmp_path):
+    monkeypatch.chdir(tmp_path)
     monkeypatch.setenv("YOUTUBE_API_KEY", "key")
     monkeypatch.setenv("SPREADSHEET_ID", "A" * 25)
     monkeypatch.setenv("SERVICE_ACCOUNT_JSON", "{}")
@@ -24,7 +25,8 @@ def test_sync_videos_handles_fetch_error(monkeypatch, caplog, tmp_path):
     assert "Impossible de récupérer les vidéos de la playlist" in caplog.text
 
 
-def test_sync_videos_stops_when_playlist_is_empty(monkeypatch, caplog):
+def test_sync_videos_stops_when_playlist_is_empty(monkeypatch, caplog, tmp_path):
+    monkeypatch.chdir(tmp_path)
     monkeypatch.setenv("YOUTUBE_API_KEY", "key")
     monkeypatch.setenv("SPREADSHEET_ID", "A" * 25)
     monkeypatch.setenv("SERVICE_ACCOUNT_JSON", "{}")
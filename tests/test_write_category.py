@@ -0,0 +1,73 @@
+from main import HEADERS, compute_row_diff, publish_tabs, write_category
+from sheets_fake import FakeSheetsService
+
+
+def make_row(video_id, views="1", playlist="PL1"):
+    row = [""] * len(HEADERS)
+    row[HEADERS.index("title")] = f"title-{video_id}"
+    row[HEADERS.index("link")] = f"https://www.youtube.com/watch?v={video_id}"
+    row[HEADERS.index("views")] = views
+    row[HEADERS.index("playlistId")] = playlist
+    return row
+
+
+def test_compute_row_diff_detects_inserted_removed_and_changed_rows():
+    existing = [HEADERS, make_row("a"), make_row("b"), make_row("c")]
+    rows = [make_row("a"), make_row("c", views="9"), make_row("d")]
+
+    diff = compute_row_diff(existing, rows)
+
+    assert diff == {"removed": [1], "inserted": [2], "changed": [1], "header_changed": False}
+
+
+def test_compute_row_diff_requires_full_rewrite_when_reordered():
+    existing = [HEADERS, make_row("a"), make_row("b")]
+    assert compute_row_diff(existing, [make_row("b"), make_row("a")]) is None
+
+
+def test_write_category_diff_only_sends_changed_rows():
+    existing = [HEADERS, make_row("a"), make_row("b"), make_row("c"), make_row("d")]
+    service = FakeSheetsService({"AllVideos": existing})
+    rows = [make_row("new"), make_row("a"), make_row("b", views="5"), make_row("d")]
+
+    write_category(service, "sheet", "AllVideos", rows, diff=True)
+
+    assert service.read("AllVideos") == [HEADERS] + rows
+    assert ("values.batchUpdate", ["AllVideos!A2", "AllVideos!A4"]) in service.calls
+    assert not any(call[0] == "batchUpdate" and "updateCells" in str(call[1]) for call in service.calls)
+
+
+def test_write_category_diff_falls_back_to_full_rewrite():
+    service = FakeSheetsService({"AllVideos": [HEADERS, make_row("a"), make_row("b")]})
+    rows = [make_row("b"), make_row("a")]
+
+    write_category(service, "sheet", "AllVideos", rows, diff=True)
+
+    assert service.read("AllVideos") == [HEADERS] + rows
+    # Valeurs et mise en forme effacées, comme avant le mode diff
+    assert ("batchUpdate", {"requests": [{"updateCells": {"range": {"sheetId": 0}, "fields": "*"}}]}) in service.calls
+    assert ("values.batchUpdate", ["AllVideos!A1"]) in service.calls
+
+
+def test_publish_tabs_uses_constant_number_of_calls():
+    service = FakeSheetsService({"AllVideos": [HEADERS, make_row("old")]})
+    tabs = {"0-5min": [make_row("a")], "5-10min": [], "AllVideos": [make_row("a")]}
+
+    publish_tabs(service, "sheet", tabs)
+
+    assert [call[0] for call in service.calls] == ["get", "batchUpdate", "batchUpdate", "values.batchUpdate"]
+    assert service.read("0-5min") == [HEADERS, make_row("a")]
+    assert service.read("5-10min") == [HEADERS]
+    assert service.read("AllVideos") == [HEADERS, make_row("a")]
+
+
+def test_publish_tabs_diff_batches_reads_and_writes():
+    existing = [HEADERS, make_row("a"), make_row("b")]
+    service = FakeSheetsService({"0-5min": existing, "AllVideos": existing})
+    tabs = {"0-5min": [make_row("a", views="2"), make_row("b")], "AllVideos": [make_row("b"), make_row("a")]}
+
+    publish_tabs(service, "sheet", tabs, diff=True)
+
+    assert [call[0] for call in service.calls] == ["get", "values.batchGet", "batchUpdate", "values.batchUpdate"]
+    assert service.read("0-5min") == [HEADERS] + tabs["0-5min"]
+    assert service.read("AllVideos") == [HEADERS] + tabs["AllVideos"]